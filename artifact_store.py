@@ -0,0 +1,247 @@
+# artifact_store.py
+# Bu dosya, oluşturulan PDF belgeleri için içerik adresli yerel disk deposunu içerir.
+# Her belge; belge türü, oluşturucu, fiyat listesi sürümü, şablon sürümü (PDF_TEMPLATE_VERSION)
+# ve kanonik girdilerin SHA-256 özetiyle anahtarlanır ve zlib ile sıkıştırılarak saklanır.
+# PDF'ler belirlenimci üretildiğinden (PDF_DETERMINISTIC) aynı anahtar her zaman aynı baytları
+# gösterir; yeniden istekler, yeniden gönderimler ve indirmeler belgeyi yeniden oluşturmaz.
+# Toplam boyut ARTIFACT_STORE_MAX_BYTES'ı aşınca en uzun süredir kullanılmayan belgeler, sınırın
+# EVICT_LOW_WATER oranına inene kadar arka planda silinir (dizin taraması istek yolunda yapılmaz).
+
+import os
+import json
+import zlib
+import tempfile
+import threading
+
+from config import (
+    ARTIFACT_STORE_ENABLED, ARTIFACT_STORE_DIR, ARTIFACT_STORE_MAX_BYTES, ARTIFACT_STORE_COMPRESSION_LEVEL,
+    PDF_TEMPLATE_VERSION,
+)
+from quote_cache import canonical_hash
+
+# Belge dosyalarının ve teklif→belge eşlemelerinin uzantıları
+BLOB_SUFFIX = ".pdf.z"
+MANIFEST_SUFFIX = ".json"
+# Temizlik, toplam boyut sınırın bu oranına inene kadar sürer; böylece her yazma yeni bir tarama başlatmaz.
+EVICT_LOW_WATER = 0.9
+
+
+class ArtifactStore:
+    """
+    Anahtar → sıkıştırılmış PDF deposu. Yazmalar geçici dosya ve os.replace ile atomiktir;
+    aynı dizini paylaşan birden çok süreç güvenle kullanabilir. Teklif kimlikleri, belge
+    anahtarlarına küçük JSON eşlemeleriyle bağlanır (indirme uç noktası için).
+    """
+
+    def __init__(self, directory, enabled=True, max_bytes=1024 * 1024 * 1024, compression_level=6,
+                 template_version=PDF_TEMPLATE_VERSION):
+        self.directory = directory
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self.template_version = template_version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Aynı anda tek bir tarama/temizlik iş parçacığı çalışır.
+        self._evict_lock = threading.Lock()
+        # Toplam boyut tahmini; ilk yazmadan sonra dizin arka planda taranarak hesaplanır.
+        self._total_bytes = None
+        # Tarama sürerken yazılan baytlar; tarama sonucuna eklenir (None: tarama yok).
+        self._added_since_scan = None
+        if enabled:
+            os.makedirs(os.path.join(directory, "quotes"), exist_ok=True)
+
+    @classmethod
+    def from_config(cls):
+        return cls(ARTIFACT_STORE_DIR, ARTIFACT_STORE_ENABLED, ARTIFACT_STORE_MAX_BYTES, ARTIFACT_STORE_COMPRESSION_LEVEL)
+
+    def key(self, document, builder_name, inputs, price_list_version):
+        """
+        Belgenin depo anahtarı. `inputs`, belgeyi belirleyen tüm girdileri (müşteri ve proje
+        bilgisi, logo özeti, belge tarihi) içermelidir; anahtar sırasından bağımsızdır.
+        """
+        return canonical_hash("artifact", self.template_version, price_list_version, document, builder_name, inputs)
+
+    def _blob_path(self, key):
+        # Tek dizinde çok sayıda dosya birikmemesi için ilk iki karaktere göre alt dizinlere dağıtılır.
+        return os.path.join(self.directory, key[:2], f"{key}{BLOB_SUFFIX}")
+
+    def _manifest_path(self, quote_id):
+        return os.path.join(self.directory, "quotes", f"{quote_id}{MANIFEST_SUFFIX}")
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _write_atomic(self, path, data):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            raise
+
+    def get(self, key):
+        """Saklanan PDF baytlarını döndürür; yoksa (veya dosya bozuksa) None."""
+        if not self.enabled:
+            return None
+        path = self._blob_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = zlib.decompress(f.read())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, zlib.error) as e:
+            print(f"UYARI: Bozuk belge dosyası siliniyor ({path}): {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # Son kullanım zamanını güncelle (boyut temizliği için)
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """PDF'i sıkıştırarak saklar. Depo yazılamazsa yalnızca uyarı verilir."""
+        if not self.enabled:
+            return
+        path = self._blob_path(key)
+        # Aynı anahtar aynı baytları gösterir; üzerine yazılan belge toplam boyuta yeniden eklenmez.
+        existed = os.path.exists(path)
+        compressed = zlib.compress(data, self.compression_level)
+        try:
+            self._write_atomic(path, compressed)
+        except OSError as e:
+            print(f"UYARI: Belge depoya yazılamadı: {e}")
+            return
+        if not existed:
+            self._account(len(compressed))
+
+    def _account(self, size):
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += size
+            if self._added_since_scan is not None:
+                self._added_since_scan += size
+            needs_scan = self._total_bytes is None or self._total_bytes > self.max_bytes
+        if needs_scan:
+            self._evict_in_background()
+
+    def _evict_in_background(self):
+        """Taramayı/temizliği arka planda başlatır; zaten biri sürüyorsa hemen döner."""
+        if not self._evict_lock.acquire(blocking=False):
+            return
+
+        def _run():
+            try:
+                self._evict()
+            except OSError as e:
+                print(f"UYARI: Belge deposu temizlenemedi: {e}")
+                with self._lock:
+                    self._added_since_scan = None
+            finally:
+                self._evict_lock.release()
+
+        try:
+            threading.Thread(target=_run, name="artifact-store-evict", daemon=True).start()
+        except RuntimeError:
+            self._evict_lock.release()
+            raise
+
+    def _evict(self):
+        """
+        Dizini tarayıp gerçek toplamı hesaplar; sınır aşılmışsa en eski dosyaları toplam
+        max_bytes * EVICT_LOW_WATER'a inene kadar siler. Teklif eşlemeleri de sayılır; belgesi
+        silinmiş bir eşleme yalnızca None döndürür. Tarama sırasında _lock tutulmaz; bu sırada
+        yazılan baytlar ayrıca sayılıp sonuca eklenir (taramaya da giren dosyalar iki kez sayılabilir,
+        bu yalnızca sonraki taramayı biraz erkene alır).
+        """
+        with self._lock:
+            self._added_since_scan = 0
+        entries = []
+        total = 0
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith((BLOB_SUFFIX, MANIFEST_SUFFIX)):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_LOW_WATER
+            for _, size, path in sorted(entries):
+                self._remove(path)
+                total -= size
+                if total <= target:
+                    break
+        with self._lock:
+            self._total_bytes = total + self._added_since_scan
+            self._added_since_scan = None
+
+    def render_all(self, jobs, keys, render):
+        """
+        `jobs`: {belge_adı: (oluşturucu_adı, argüman_demeti)}, `keys`: {belge_adı: anahtar}.
+        Depoda olan belgeleri okur, yalnızca eksikleri render(eksik_işler) ile oluşturup saklar;
+        {belge_adı: pdf_baytları} döndürür.
+        """
+        documents = {name: self.get(keys[name]) for name in jobs}
+        missing = {name: job for name, job in jobs.items() if documents[name] is None}
+        if missing:
+            rendered = render(missing)
+            for name, pdf_data in rendered.items():
+                self.put(keys[name], pdf_data)
+            documents.update(rendered)
+        return documents
+
+    def link(self, quote_id, keys):
+        """Teklif kimliğini belge anahtarlarına bağlar (zaten bağlıysa bir şey yapmaz)."""
+        if not self.enabled:
+            return
+        path = self._manifest_path(quote_id)
+        if os.path.exists(path):
+            return
+        data = json.dumps(keys, sort_keys=True).encode("utf-8")
+        try:
+            self._write_atomic(path, data)
+        except OSError as e:
+            print(f"UYARI: Teklif belge eşlemesi yazılamadı: {e}")
+            return
+        self._account(len(data))
+
+    def lookup(self, quote_id, document):
+        """link() ile bağlanmış teklifin belgesini döndürür; eşleme veya belge yoksa None."""
+        if not self.enabled:
+            return None
+        try:
+            with open(self._manifest_path(quote_id), "rb") as f:
+                key = json.loads(f.read()).get(document)
+        except (OSError, ValueError):
+            return None
+        return self.get(key) if key else None
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "template_version": self.template_version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": self._total_bytes,
+        }
+
+
+ARTIFACT_STORE = ArtifactStore.from_config()
@@ -0,0 +1,194 @@
+# batch_calculator.py
+# Bu dosya, çok sayıda proje yapılandırmasını tek seferde fiyatlayan vektörel hesaplama
+# motorunu içerir. Her satır bir 'project_details' sözlüğüne karşılık gelir; tüm alanlar,
+# maliyet kalemleri ve finansal özet NumPy sütun işlemleriyle hesaplanır. Kalemler tekil
+# yolla aynı kural tablosundan (pricing_rules.LINE_ITEM_RULES) değerlendirilir.
+# Sonuçlar calculator.price_project ile birebir aynıdır (kuruş yukarı yuvarlama dahil):
+# kalemler aynı sırayla toplanır, olmayan kalemler 0.0 olarak eklenir.
+
+import numpy as np
+import pandas as pd
+from price_list import PRICE_LISTS
+from pricing_rules import LINE_ITEM_RULES, evaluate_rules_batch
+
+
+def rounded_up_cost_array(values):
+    """calculate_rounded_up_cost'un vektörel karşılığı: kuruşa yukarı yuvarlar."""
+    return np.ceil(values * 100) / 100.0
+
+
+def calculate_area_batch(width, length, height, is_two_story, height_2nd_floor):
+    """utils.calculate_area'nın vektörel karşılığı."""
+    floor_area = width * length
+    story_height = np.where(is_two_story, height + height_2nd_floor, height)
+    wall_area = np.ceil(2 * (width + length) * story_height)
+    return {"floor": floor_area, "wall": wall_area, "roof": floor_area}
+
+
+class _ProjectColumns:
+    """Girdi tablosundan, scalar yoldaki project_inputs.get(...) varsayılanlarıyla sütun okur."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.size = len(frame)
+
+    def number(self, name, default=0):
+        if name not in self.frame:
+            return np.full(self.size, float(default))
+        return pd.to_numeric(self.frame[name]).fillna(default).to_numpy(dtype=float)
+
+    def flag(self, name):
+        if name not in self.frame:
+            return np.zeros(self.size, dtype=bool)
+        column = self.frame[name]
+        return column.where(column.notna(), False).to_numpy(dtype=object).astype(bool)
+
+    def text(self, name, default=''):
+        if name not in self.frame:
+            return np.full(self.size, default, dtype=object)
+        column = self.frame[name]
+        return column.where(column.notna(), default).to_numpy(dtype=object)
+
+    def objects(self, name):
+        """Eksik değerleri None olan nesne dizisi (varsayılanı None olan metin alanları için)."""
+        return np.array(self.raw(name), dtype=object)
+
+    def raw(self, name, default=None):
+        if name not in self.frame:
+            return [default] * self.size
+        return [default if _is_missing(value) else value for value in self.frame[name]]
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _to_frame(projects):
+    if isinstance(projects, pd.DataFrame):
+        return projects
+    if isinstance(projects, dict):
+        return pd.DataFrame(projects)
+    return pd.DataFrame(list(projects))
+
+
+class BatchInputs:
+    """
+    Fiyat listesinden bağımsız girdiler: okunmuş sütunlar, alanlar ve kâr oranları. Aynı
+    yapılandırmalar farklı fiyat listeleriyle (ör. senaryolar) fiyatlanırken bir kez
+    hazırlanır; sonraki hesaplamalarda girdi tablosu yeniden okunmaz.
+    """
+
+    def __init__(self, projects):
+        self.frame = _to_frame(projects)
+        self.cols = _ProjectColumns(self.frame)
+        self.size = self.cols.size
+        self.is_two_story = self.cols.flag('is_two_story')
+        self.areas = calculate_area_batch(self.cols.number('width'), self.cols.number('length'),
+                                          self.cols.number('height'), self.is_two_story,
+                                          self.cols.number('height_2nd_floor'))
+        self.profit_rate = np.array([_profit_rate_value(option) for option in self.cols.raw('profit_rate')], dtype=float)
+        # _RuleContext.column() önbelleği ve yalnızca girdilere bağlı değerler (koşullar,
+        # miktarlar, etiket maskeleri); fiyata bağlı değerler her hesaplamada yeniden hesaplanır.
+        self.columns = {}
+        self.input_derived = {}
+
+
+class _RuleContext:
+    """pricing_rules ifadelerinin sütun değerlendirmesi için bağlam (türetilmiş miktarlar bir kez hesaplanır)."""
+    np = np
+
+    def __init__(self, inputs, prices):
+        self.cols = inputs.cols
+        self.size = inputs.size
+        self.areas = inputs.areas
+        self.prices = prices
+        self.derived = dict(inputs.input_derived)
+        self._columns = inputs.columns
+
+    def column(self, kind, name, *args):
+        """cols.<kind>(name, *args) sonucunu bir kez okur (aynı alan birçok kuralda kullanılır)."""
+        key = (kind, name) + args
+        if key not in self._columns:
+            self._columns[key] = getattr(self.cols, kind)(name, *args)
+        return self._columns[key]
+
+    @staticmethod
+    def round_up(values):
+        return rounded_up_cost_array(values)
+
+
+def calculate_costs_batch(projects, price_list=None):
+    """
+    Birden çok proje yapılandırmasını vektörel olarak fiyatlar.
+    `projects`: DataFrame, sütun sözlüğü ({alan: dizi}), project_details sözlükleri listesi
+    veya önceden hazırlanmış BatchInputs.
+    Her yapılandırma için bir satır döndürür: alanlar, 'cost_*' kalem toplamları, finansal
+    özet ve teslim süresi. Tüm satırlar aynı fiyat listesi anlık görüntüsüyle hesaplanır.
+    """
+    if price_list is None:
+        price_list = PRICE_LISTS.current()
+    inputs = projects if isinstance(projects, BatchInputs) else BatchInputs(projects)
+    n = inputs.size
+    is_two_story = inputs.is_two_story
+    floor_area, wall_area, roof_area = inputs.areas["floor"], inputs.areas["wall"], inputs.areas["roof"]
+
+    zeros = np.zeros(n)
+    # --- 1-6. Maliyet Kalemleri (pricing_rules.LINE_ITEM_RULES) ---
+    # (sütun adı, toplam dizisi, ev ara toplamına giren kısım)
+    ctx = _RuleContext(inputs, price_list.prices)
+    items, separate_sales = evaluate_rules_batch(LINE_ITEM_RULES, ctx)
+    inputs.input_derived.update((key, value) for key, value in ctx.derived.items() if isinstance(key, tuple))
+    solar_cost = separate_sales['solar']
+    aether_package_cost = separate_sales['aether_package']
+
+    # --- 7. Finansal Hesaplamalar ---
+    material_subtotal = zeros
+    house_subtotal_base = zeros
+    for _, total, house_share in items:
+        material_subtotal = material_subtotal + total
+        house_subtotal_base = house_subtotal_base + house_share
+
+    waste_cost = rounded_up_cost_array(material_subtotal * price_list.fire_rate)
+    overhead_cost = price_list.monthly_accounting_expenses + price_list.monthly_office_rent
+    total_cost_before_profit = rounded_up_cost_array(house_subtotal_base + waste_cost + overhead_cost)
+
+    profit = rounded_up_cost_array(total_cost_before_profit * inputs.profit_rate)
+    price_before_vat = total_cost_before_profit + profit
+    vat_amount = rounded_up_cost_array(price_before_vat * price_list.vat_rate)
+    house_sales_price = rounded_up_cost_array(price_before_vat + vat_amount)
+    total_sales_price = rounded_up_cost_array(house_sales_price + solar_cost + aether_package_cost)
+
+    delivery = np.ceil((floor_area / 27.0) * 35) + np.where(is_two_story, np.ceil((floor_area / 27.0) * 15), 0)
+    delivery = np.maximum(delivery, 10).astype(int)
+
+    result = {
+        'floor_area': floor_area,
+        'wall_area': wall_area,
+        'roof_area': roof_area,
+    }
+    for key, total, _ in items:
+        result[f'cost_{key}'] = total
+    result.update({
+        'material_subtotal': material_subtotal,
+        'waste_cost': waste_cost,
+        'overhead_cost': np.full(n, overhead_cost),
+        'total_cost_before_profit': total_cost_before_profit,
+        'profit': profit,
+        'price_before_vat': price_before_vat,
+        'vat_amount': vat_amount,
+        'house_sales_price': house_sales_price,
+        'solar_sales_price': solar_cost,
+        'aether_package_sales_price': aether_package_cost,
+        'total_sales_price': total_sales_price,
+        'delivery_duration_business_days': delivery,
+    })
+    return pd.DataFrame(result, index=inputs.frame.index)
+
+
+def _profit_rate_value(option):
+    """profit_rate alanı [etiket, oran] listesi veya doğrudan oran olabilir."""
+    if option is None:
+        return 0.20
+    if isinstance(option, (list, tuple)):
+        return option[1]
+    return float(option)
@@ -0,0 +1,778 @@
+# bench.py
+# Bu dosya, teklif akışının (alan hesabı → fiyatlandırma → PDF → /calculate) performansını
+# ölçen bağımsız kıyaslama (benchmark) aracını içerir. Temsilî proje yükleri üretir, her
+# aşama için p50/p95 gecikme, verim, en yüksek RSS, çağrı başına en yüksek bellek ayırma
+# (tracemalloc) ve PDF boyutu raporlar; sonuçlar JSON
+# temel çizgisi olarak kaydedilip sonraki sürümlerle karşılaştırılabilir.
+#
+# Kullanım:
+#   python bench.py                          # tüm aşamalar, 50 tekrar
+#   python bench.py -n 200 --stages pricing  # yalnızca fiyatlandırma
+#   python bench.py --save bench_baseline.json
+#   python bench.py --compare bench_baseline.json --tolerance 0.15
+#   python bench.py -n 5 --stages startup     # soğuk başlangıç ve içe aktarma profili
+#   python bench.py -n 200 --stages server    # geliştirme sunucusu ile gunicorn karşılaştırması
+
+import os
+import sys
+import gc
+import json
+import time
+import socket
+import argparse
+import platform
+import tempfile
+import threading
+import tracemalloc
+import subprocess
+import urllib.error
+import urllib.request
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# --- Temsilî Yükler ---
+CUSTOMER_INFO = {
+    "name": "Bench Customer",
+    "company": "Bench Ltd",
+    "email": "bench@example.com",
+    "phone": "+357 00 000000",
+    "address": "Iasonos 1, Nicosia",
+    "id_no": "X0000000",
+}
+
+_BASE_PROJECT = {
+    "width": 6, "length": 10, "height": 2.6, "is_two_story": False, "height_2nd_floor": 0,
+    "structure_type": "Light Steel", "welding_type": "Standard Welding (160€/m²)",
+    "room_configuration": "2 Bedrooms, 1 Bathroom, Living Room + Kitchen",
+    "pdf_language": "en_gr", "installment_option": "full",
+    "profit_rate": ["20%", 0.20],
+    "aether_package_choice": "None",
+    "facade_sandwich_panel_option": False, "facade_sandwich_panel_included": False,
+    "plasterboard_interior_option": False, "plasterboard_all_option": False,
+    "plasterboard_interior": False, "plasterboard_all": False,
+    "osb_inner_wall_option": False, "insulation_wall": False, "insulation_floor": False,
+    "insulation_material_type": "Stone Wool", "floor_covering": "Laminate Parquet",
+    "floor_covering_type": "Laminate Parquet",
+    "skirting_length_val": 0, "laminate_flooring_m2_val": 0, "under_parquet_mat_m2_val": 0,
+    "osb2_18mm_count_val": 0, "galvanized_sheet_m2_val": 0,
+    "exterior_cladding_m2_option": False, "exterior_cladding_m2_val": 0,
+    "exterior_wood_cladding_m2_option": False, "exterior_wood_cladding_m2_val": 0,
+    "concrete_panel_floor_option": False, "concrete_panel_floor_m2_val": 0,
+    "terrace_laminated_wood_flooring_option": False, "terrace_laminated_wood_flooring_m2_val": 0,
+    "porcelain_tiles_option": False, "porcelain_tiles_m2_val": 0,
+    "brushed_granite_countertops_option": False, "brushed_granite_countertops_m2_val": 0,
+    "window_count": 2, "window_size_val": "100x100", "door_count": 1, "door_size_val": "90x210",
+    "sliding_door_count": 0, "sliding_door_size_val": "200x210",
+    "wc_window_count": 0, "wc_window_size_val": "60x50", "wc_sliding_door_count": 0, "wc_sliding_door_size_val": "80x210",
+    "window_door_color_val": "Anthracite",
+    "kitchen_choice": "No Kitchen", "kitchen_type_display_en_gr": "No / Όχι",
+    "shower_wc": False, "wc_ceramic": False, "wc_ceramic_area": 0,
+    "electrical": False, "plumbing": False, "transportation": False, "heating": False,
+    "solar": False, "solar_kw": 5, "wheeled_trailer": False, "wheeled_trailer_price": 0,
+    "bedroom_set_option": False, "sofa_option": False, "smart_home_systems_option": False,
+    "security_camera_option": False, "white_goods_fridge_tv_option": False, "premium_faucets_option": False,
+    "integrated_fridge_option": False, "designer_furniture_option": False, "italian_sofa_option": False,
+    "inclass_chairs_option": False, "inclass_chairs_count": 0,
+    "extra_expenses_description": "", "extra_expenses_amount": 0,
+}
+
+_ALL_OPTIONS_ON = {
+    "facade_sandwich_panel_option": True, "facade_sandwich_panel_included": True,
+    "plasterboard_all_option": True, "plasterboard_all": True, "plasterboard_interior": True,
+    "osb_inner_wall_option": True, "insulation_wall": True, "insulation_floor": True,
+    "skirting_length_val": 32.0, "laminate_flooring_m2_val": 60.0, "under_parquet_mat_m2_val": 60.0,
+    "osb2_18mm_count_val": 21, "galvanized_sheet_m2_val": 12.5,
+    "exterior_cladding_m2_option": True, "exterior_cladding_m2_val": 40.0,
+    "exterior_wood_cladding_m2_option": True, "exterior_wood_cladding_m2_val": 18.0,
+    "concrete_panel_floor_option": True, "concrete_panel_floor_m2_val": 60.0,
+    "terrace_laminated_wood_flooring_option": True, "terrace_laminated_wood_flooring_m2_val": 20.0,
+    "porcelain_tiles_option": True, "porcelain_tiles_m2_val": 8.0,
+    "brushed_granite_countertops_option": True, "brushed_granite_countertops_m2_val": 4.0,
+    "window_count": 6, "door_count": 2, "sliding_door_count": 2, "wc_window_count": 1, "wc_sliding_door_count": 1,
+    "kitchen_choice": "Special Design Kitchen", "kitchen_type_display_en_gr": "Special Design / Ειδικός Σχεδιασμός",
+    "shower_wc": True, "wc_ceramic": True, "wc_ceramic_area": 9.0,
+    "electrical": True, "plumbing": True, "transportation": True, "heating": True,
+    "wheeled_trailer": True, "wheeled_trailer_price": 2500,
+    "bedroom_set_option": True, "sofa_option": True, "smart_home_systems_option": True,
+    "security_camera_option": True, "white_goods_fridge_tv_option": True, "premium_faucets_option": True,
+    "integrated_fridge_option": True, "designer_furniture_option": True, "italian_sofa_option": True,
+    "inclass_chairs_option": True, "inclass_chairs_count": 6,
+    "extra_expenses_description": "Site preparation", "extra_expenses_amount": 750,
+    "installment_option": "3_installments",
+}
+
+PROFILES = {
+    "light_single_basic": {},
+    "heavy_single_standard": {
+        "structure_type": "Heavy Steel", "width": 8, "length": 12,
+        "insulation_wall": True, "insulation_floor": True, "electrical": True, "plumbing": True,
+        "kitchen_choice": "Standard Kitchen", "kitchen_type_display_en_gr": "Standard / Στάνταρ", "shower_wc": True,
+    },
+    "light_two_story": {
+        "is_two_story": True, "height_2nd_floor": 2.6, "width": 7.25, "length": 9,
+        "profile_100x100_count": 8, "profile_100x50_count": 4, "profile_40x60_count": 3, "profile_50x50_count": 2,
+        "electrical": True, "plumbing": True,
+    },
+    "heavy_two_story_all_options": dict(_ALL_OPTIONS_ON, **{
+        "structure_type": "Heavy Steel", "is_two_story": True, "height_2nd_floor": 2.8, "width": 10, "length": 15,
+    }),
+    "aether_elite_solar": dict(_ALL_OPTIONS_ON, **{
+        "aether_package_choice": "Aether Living | Loft Elite (LUXURY)", "solar": True, "solar_kw": 10,
+        "profit_rate": ["30%", 0.30],
+    }),
+}
+
+
+def make_payloads():
+    """Her profil için (ad, /calculate istek gövdesi) listesi döndürür."""
+    payloads = []
+    for name, overrides in PROFILES.items():
+        project_details = dict(_BASE_PROJECT, **overrides)
+        payloads.append((name, {"customer_info": dict(CUSTOMER_INFO), "project_details": project_details}))
+    return payloads
+
+
+# --- Ölçüm Yardımcıları ---
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt cinsindendir.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def summarize(name, durations, errors=0, error_message=None, output_bytes=None):
+    """Süre listesinden (saniye) aşama özetini üretir."""
+    durations = sorted(durations)
+    total = sum(durations)
+    summary = {
+        "stage": name,
+        "runs": len(durations),
+        "errors": errors,
+        "p50_ms": round(_percentile(durations, 0.50) * 1000, 3) if durations else None,
+        "p95_ms": round(_percentile(durations, 0.95) * 1000, 3) if durations else None,
+        "mean_ms": round(total / len(durations) * 1000, 3) if durations else None,
+        "throughput_per_s": round(len(durations) / total, 1) if total > 0 else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if output_bytes:
+        summary["pdf_bytes_mean"] = int(sum(output_bytes) / len(output_bytes))
+    if error_message:
+        summary["last_error"] = error_message
+    return summary
+
+
+def peak_alloc_kb(payloads, func):
+    """
+    Her payload için func(payload) çağrısının en yüksek Python bellek ayırmasını (tracemalloc,
+    çağrı öncesine göre) ölçer ve en büyüğünü KB olarak döndürür (hiçbiri başarılı değilse
+    None). Süre ölçümünden ayrı
+    yapılır; tracemalloc çağrıları yavaşlatır. Render havuzu süreçleri ölçüme girmez.
+    """
+    tracemalloc.start()
+    try:
+        peak = None
+        for payload in payloads:
+            gc.collect()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            try:
+                func(payload)
+            except Exception:
+                continue
+            peak = max(peak or 0, tracemalloc.get_traced_memory()[1] - baseline)
+        return None if peak is None else round(peak / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def time_calls(name, iterations, payloads, func):
+    """func(payload) çağrısını payload'lar üzerinde dönerek `iterations` kez ölçer."""
+    durations, sizes = [], []
+    errors, error_message = 0, None
+    try:
+        func(payloads[0])  # Isınma: içe aktarma ve ilk çağrı maliyetleri ölçüme girmesin.
+    except Exception:
+        pass
+    gc.collect()
+    for i in range(iterations):
+        payload = payloads[i % len(payloads)]
+        start = time.perf_counter()
+        try:
+            output = func(payload)
+        except Exception as e:
+            errors += 1
+            error_message = f"{type(e).__name__}: {e}"
+            continue
+        durations.append(time.perf_counter() - start)
+        if isinstance(output, (bytes, bytearray)):
+            sizes.append(len(output))
+    summary = summarize(name, durations, errors, error_message, sizes)
+    summary["peak_alloc_kb"] = peak_alloc_kb(payloads, func)
+    return summary
+
+
+# --- Aşamalar ---
+def _area(project_details):
+    from utils import calculate_area
+    return calculate_area(
+        project_details.get('width', 0),
+        project_details.get('length', 0),
+        project_details.get('height', 0),
+        project_details.get('is_two_story', False),
+        project_details.get('height_2nd_floor', 0)
+    )
+
+
+def bench_area(iterations, payloads):
+    projects = [p["project_details"] for _, p in payloads]
+    return [time_calls("calculate_area", iterations, projects, _area)]
+
+
+def bench_pricing(iterations, payloads):
+    from calculator import calculate_costs_detailed
+    prepared = [(p["project_details"], _area(p["project_details"])) for _, p in payloads]
+    return [time_calls("calculate_costs_detailed", iterations, prepared, lambda item: calculate_costs_detailed(*item))]
+
+
+PDF_BUILDERS = [
+    ("internal", "create_internal_cost_report_pdf", "tr"),
+    ("proposal", "create_customer_proposal_pdf_tr", "tr"),
+    ("proposal", "create_customer_proposal_pdf_en_gr", "en_gr"),
+    ("contract", "create_sales_contract_pdf", "tr"),
+]
+
+
+def bench_pdfs(iterations, payloads):
+    import pdf_generator
+    from calculator import calculate_costs_detailed
+    from documents import build_document_jobs
+    from logo_cache import LOGO_CACHE
+
+    pdf_generator.initialize_pdf_resources()
+    logo_data_b64 = LOGO_CACHE.get_base64()
+    results = []
+    for document, builder_name, language in PDF_BUILDERS:
+        builder = getattr(pdf_generator, builder_name, None)
+        if builder is None:
+            results.append({"stage": builder_name, "skipped": "not available in pdf_generator"})
+            continue
+        jobs = []
+        for _, payload in payloads:
+            project_details = dict(payload["project_details"], pdf_language=language)
+            quote = calculate_costs_detailed(project_details, _area(project_details))
+            _, args = build_document_jobs(quote, project_details, payload["customer_info"], logo_data_b64)[document]
+            jobs.append(args)
+        results.append(time_calls(builder_name, iterations, jobs, lambda args: builder(*args)))
+    return results
+
+
+class _StubSMTP:
+    """Ağa çıkmadan her gönderimi kabul eden SMTP yerine geçen sınıf."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def starttls(self):
+        return (220, b"ready")
+
+    def login(self, *args):
+        return (235, b"ok")
+
+    def noop(self):
+        return (250, b"ok")
+
+    def sendmail(self, sender, to_address, message):
+        return {}
+
+    def ehlo_or_helo_if_needed(self):
+        pass
+
+    def mail(self, sender):
+        return (250, b"ok")
+
+    def rcpt(self, to_address):
+        return (250, b"ok")
+
+    def rset(self):
+        return (250, b"ok")
+
+    def docmd(self, command):
+        return (354, b"go ahead")
+
+    def send(self, data):
+        pass
+
+    def getreply(self):
+        return (250, b"queued")
+
+    def quit(self):
+        return (221, b"bye")
+
+
+def _api_client():
+    """Isınması tamamlanmış bir test istemcisi döndürür (arka plan ısınması ölçümlere karışmasın)."""
+    import calculator_api
+
+    client = calculator_api.app.test_client()
+    client.get("/health")
+    calculator_api.WARM_UP.wait()
+    return client
+
+
+def bench_route(iterations, payloads, use_cache=False):
+    import calculator_api
+
+    client = _api_client()
+    calculator_api.QUOTE_CACHE.enabled = use_cache
+    patches = [
+        mock.patch("smtplib.SMTP", _StubSMTP),
+        mock.patch.object(calculator_api, "EMAIL_DELIVERY_MODE", "sync"),
+        mock.patch.object(calculator_api.SMTP_SETTINGS, "is_complete", lambda: True),
+    ]
+    statuses = {}
+
+    def post(payload):
+        response = client.post("/calculate", json=payload)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if response.status_code >= 500:
+            raise RuntimeError(response.get_json().get("message"))
+        return None
+
+    for patch in patches:
+        patch.start()
+    try:
+        summary = time_calls("POST /calculate", iterations, [p for _, p in payloads], post)
+    finally:
+        for patch in patches:
+            patch.stop()
+    summary["status_codes"] = {str(code): count for code, count in sorted(statuses.items())}
+    summary["quote_cache"] = use_cache
+    return [summary]
+
+
+# E-posta aşamasında kullanılan ekin boyutu (logolu, çok sayfalı bir teklif kadar)
+EMAIL_ATTACHMENT_BYTES = 1024 * 1024
+
+
+def bench_email(iterations, payloads):
+    """
+    PDF ekli e-postanın oluşturulup SMTP'ye yazılması: akışlı yol (iter_email_message +
+    send_streaming) ile eski as_string() yolu karşılaştırılır. Ağa çıkılmaz.
+    """
+    from email_queue import build_email_message, iter_email_message, send_streaming
+
+    attachment = os.urandom(EMAIL_ATTACHMENT_BYTES)
+    message = ("Bench", "Premium Home Teklifiniz / Your Premium Home Offer", "Sayın Müşterimiz, teklifiniz ektedir.",
+               attachment, "Customer_Proposal_Bench.pdf")
+    server = _StubSMTP()
+
+    def streaming(_):
+        send_streaming(server, "bench@example.com", "customer@example.com",
+                       iter_email_message("bench@example.com", "customer@example.com", *message[1:]))
+
+    def legacy(_):
+        msg = build_email_message("bench@example.com", "customer@example.com", *message[1:])
+        server.sendmail("bench@example.com", "customer@example.com", msg.as_string().encode("ascii"))
+
+    results = []
+    for name, func in (("email (streaming)", streaming), ("email (as_string)", legacy)):
+        summary = time_calls(name, iterations, [None], func)
+        summary["attachment_bytes"] = EMAIL_ATTACHMENT_BYTES
+        results.append(summary)
+    return results
+
+
+# Senaryo aşamasında fiyatlanan yapılandırma ve senaryo sayısı
+SCENARIO_CONFIGURATIONS = 2000
+SCENARIO_COUNT = 24
+
+
+def bench_scenarios(iterations, payloads):
+    """
+    Fiyat senaryosu taraması: SCENARIO_CONFIGURATIONS yapılandırma × SCENARIO_COUNT senaryo
+    tek süreçte vektörel olarak fiyatlanır (katalog, örnek payload'ların ölçü varyasyonlarıdır).
+    """
+    from scenarios import Scenario, run_scenarios
+
+    catalog = {}
+    for i in range(SCENARIO_CONFIGURATIONS):
+        project_details = dict(payloads[i % len(payloads)][1]["project_details"])
+        project_details["width"] = project_details.get("width", 5) + (i % 7) * 0.5
+        catalog[f"cfg-{i}"] = project_details
+    scenarios = [Scenario.from_spec(f"steel +{i}%", [f"steel_profile_*: +{i}%", "sandwich_panel_m2: -2%"])
+                 for i in range(1, SCENARIO_COUNT + 1)]
+    summary = time_calls("scenario sweep", max(1, min(iterations, 5)), [None], lambda _: run_scenarios(catalog, scenarios))
+    summary["cells"] = SCENARIO_CONFIGURATIONS * SCENARIO_COUNT
+    if summary["mean_ms"]:
+        summary["cells_per_s"] = round(summary["cells"] / (summary["mean_ms"] / 1000))
+    return [summary]
+
+
+def bench_price_route(iterations, payloads):
+    """PDF ve e-posta içermeyen /price uç noktası."""
+    client = _api_client()
+
+    def post(payload):
+        response = client.post("/price", json=payload)
+        if response.status_code != 200:
+            raise RuntimeError(response.get_json().get("message"))
+        return None
+
+    return [time_calls("POST /price", iterations, [p for _, p in payloads], post)]
+
+
+# Yeni süreçte çalışır: içe aktarma süresi, ilk /health yanıtı ve ısınma süresi JSON olarak yazılır.
+_STARTUP_SCRIPT = """
+import os, json, sys, time, resource
+start = time.perf_counter()
+import calculator_api
+imported = time.perf_counter()
+loaded = [name for name in ("pandas", "numpy", "reportlab", "PIL", "requests") if name in sys.modules]
+client = calculator_api.app.test_client()
+status = client.get("/health").status_code
+healthy = time.perf_counter()
+print("HEALTHY", flush=True)
+calculator_api.WARM_UP.wait(120)
+print(json.dumps({
+    "import_s": imported - start, "health_s": healthy - imported, "status": status,
+    "warm_up_s": calculator_api.WARM_UP.duration(), "loaded_at_import": loaded,
+    "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}), flush=True)
+os._exit(0)  # iş kuyruğu ve e-posta çalışanları süreci açık tutmasın
+"""
+
+# Tek başına sağlık kontrolü için yüklenmemesi gereken ağır modüller
+HEAVY_MODULES = ("pandas", "reportlab", "PIL")
+
+
+def _startup_env():
+    env = dict(os.environ, METRICS_LOG_REQUESTS="0")
+    # Ölçüm süreçleri gerçek iş kuyruğuna dokunmasın.
+    env["QUOTE_JOBS_DIR"] = tempfile.mkdtemp(prefix="bench-jobs-")
+    return env
+
+
+def _run_startup_process():
+    """Yeni bir Python süreci başlatır; (süreç başlangıcından ilk /health'e süre, ölçümler) döndürür."""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", _STARTUP_SCRIPT], cwd=os.path.dirname(os.path.abspath(__file__)),
+                               env=_startup_env(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    first_healthy = None
+    measurements = None
+    for line in process.stdout:
+        if line.startswith("HEALTHY") and first_healthy is None:
+            first_healthy = time.perf_counter() - start
+        elif line.startswith("{"):
+            measurements = json.loads(line)
+    stderr = process.stderr.read()
+    process.wait()
+    if measurements is None:
+        raise RuntimeError(stderr.strip().splitlines()[-1] if stderr.strip() else "startup process failed")
+    return first_healthy, measurements
+
+
+def import_profile(top=10):
+    """
+    `python -X importtime` ile calculator_api'nin içe aktarma profilini alır ve modüllerin kendi
+    sürelerini üst düzey pakete göre toplar (arka plan iş parçacıklarının içe aktarmaları iç içe
+    yapıyı bozabildiğinden kümülatif sütun yerine 'self' sütunu kullanılır).
+    """
+    command = [sys.executable, "-X", "importtime", "-c", "import os, calculator_api; os._exit(0)"]
+    completed = subprocess.run(command, cwd=os.path.dirname(os.path.abspath(__file__)), env=_startup_env(),
+                               capture_output=True, text=True, timeout=120)
+    packages = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # başlık satırı
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "total_ms": round(sum(packages.values()) / 1000.0, 1),
+        "packages": [{"package": name, "self_ms": round(us / 1000.0, 1)} for name, us in ranked[:top]],
+    }
+
+
+def bench_startup(iterations, payloads):
+    """
+    Soğuk başlangıç: her ölçüm yeni bir süreçte calculator_api'yi içe aktarır ve ilk /health
+    yanıtına kadar geçen süreyi ölçer. Ayrıca bir kez `-X importtime` profili alınır ve
+    sağlık kontrolü için gerekmeyen ağır modüller (pandas, reportlab, PIL) içe aktarmada
+    yüklenmişse raporlanır.
+    """
+    runs = max(1, min(iterations, 10))
+    import_times, health_times, warm_up_times = [], [], []
+    errors, error_message = 0, None
+    peak_rss_kb, loaded = 0, set()
+    for _ in range(runs):
+        try:
+            first_healthy, measurements = _run_startup_process()
+        except Exception as e:
+            errors += 1
+            error_message = f"{type(e).__name__}: {e}"
+            continue
+        import_times.append(measurements["import_s"])
+        health_times.append(first_healthy)
+        if measurements["warm_up_s"] is not None:
+            warm_up_times.append(measurements["warm_up_s"])
+        peak_rss_kb = max(peak_rss_kb, measurements["peak_rss_kb"])
+        loaded.update(measurements["loaded_at_import"])
+
+    summaries = [
+        summarize("startup: import calculator_api", import_times, errors, error_message),
+        summarize("startup: process -> first /health", health_times, errors, error_message),
+        summarize("startup: background warm-up", warm_up_times),
+    ]
+    for summary in summaries:
+        summary["peak_rss_mb"] = round(peak_rss_kb / 1024, 1) if peak_rss_kb else None
+    summaries[0]["heavy_modules_at_import"] = sorted(name for name in loaded if name in HEAVY_MODULES)
+    try:
+        summaries[0]["import_profile"] = import_profile()
+    except Exception as e:
+        summaries[0]["import_profile_error"] = f"{type(e).__name__}: {e}"
+    return summaries
+
+
+# --- Sunucu Karşılaştırması ---
+# Eşzamanlı istemci sayısı ve ölçülen uç noktalar (önbellekler kapalı; her istek gerçek iş yapar)
+SERVER_CONCURRENCY = 4
+SERVER_ROUTES = ("/price", "/calculate")
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _server_env(port):
+    env = _startup_env()
+    work_dir = env["QUOTE_JOBS_DIR"]
+    env.update({
+        "PORT": str(port), "SERVER_BIND": f"127.0.0.1:{port}",
+        "BULK_QUOTE_DIR": os.path.join(work_dir, "bulk"),
+        "QUOTE_ARCHIVE_ENABLED": "0", "QUOTE_CACHE_ENABLED": "0", "ARTIFACT_STORE_ENABLED": "0",
+    })
+    return env
+
+
+def _wait_until_ready(port, process, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"sunucu başlatılamadı (çıkış kodu {process.returncode})")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=2) as response:
+                if json.load(response).get("ready"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("sunucu zamanında hazır olmadı")
+
+
+def _post_json(port, path, payload):
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=json.dumps(payload).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=300) as response:
+            response.read()
+    except urllib.error.HTTPError as e:
+        message = e.read()[:200].decode("utf-8", "replace")
+        raise RuntimeError(f"HTTP {e.code}: {message}")
+
+
+def _load_test(name, port, path, iterations, payloads):
+    """`iterations` isteği SERVER_CONCURRENCY eşzamanlı istemciyle gönderir; verim duvar saatine göredir."""
+    durations, errors, error_message = [], 0, None
+    lock = threading.Lock()
+
+    def call(i):
+        nonlocal errors, error_message
+        start = time.perf_counter()
+        try:
+            _post_json(port, path, payloads[i % len(payloads)])
+        except Exception as e:
+            with lock:
+                errors += 1
+                error_message = f"{type(e).__name__}: {e}"
+            return
+        with lock:
+            durations.append(time.perf_counter() - start)
+
+    try:
+        _post_json(port, path, payloads[0])  # Isınma
+    except Exception:
+        pass
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=SERVER_CONCURRENCY) as executor:
+        list(executor.map(call, range(iterations)))
+    wall = time.perf_counter() - wall_start
+    summary = summarize(name, durations, errors, error_message)
+    summary["throughput_per_s"] = round(len(durations) / wall, 1) if wall > 0 and durations else None
+    summary["concurrency"] = SERVER_CONCURRENCY
+    summary["peak_rss_mb"] = None  # Ölçüm süreci değil sunucu süreçleri çalışır
+    return summary
+
+
+def bench_server(iterations, payloads):
+    """
+    Aynı yükü Flask geliştirme sunucusuna (python calculator_api.py) ve gunicorn'a
+    (gunicorn.conf.py: preload, çok süreç + iş parçacığı) eşzamanlı istemcilerle gönderir
+    ve uç nokta başına gecikme ile verimi karşılaştırır.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    servers = [("flask dev", [sys.executable, "calculator_api.py"])]
+    try:
+        import gunicorn  # noqa: F401
+        servers.append(("gunicorn", [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"]))
+    except ImportError:
+        servers.append(("gunicorn", None))
+
+    bodies = [p for _, p in payloads]
+    results = []
+    for server_name, command in servers:
+        if command is None:
+            results.append({"stage": f"server {server_name}", "skipped": "gunicorn kurulu değil (pip install gunicorn)"})
+            continue
+        port = _free_port()
+        process = subprocess.Popen(command, cwd=here, env=_server_env(port),
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            _wait_until_ready(port, process)
+            for path in SERVER_ROUTES:
+                results.append(_load_test(f"server {server_name}: POST {path}", port, path, iterations, bodies))
+        except Exception as e:
+            results.append({"stage": f"server {server_name}", "skipped": f"{type(e).__name__}: {e}"})
+        finally:
+            process.terminate()
+            try:
+                process.wait(30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return results
+
+
+STAGES = {
+    "area": bench_area,
+    "pricing": bench_pricing,
+    "pdf": bench_pdfs,
+    "route": bench_route,
+    "price_route": bench_price_route,
+    "email": bench_email,
+    "scenarios": bench_scenarios,
+    "startup": bench_startup,
+    "server": bench_server,
+}
+
+
+# --- Temel Çizgi Karşılaştırması ---
+def compare_with_baseline(current, baseline, tolerance):
+    """p50/p95 ve bellek ayırma değerleri temel çizgiden `tolerance` oranından fazla kötüleşen aşamaları döndürür."""
+    previous = {s["stage"]: s for s in baseline.get("stages", []) if "p50_ms" in s}
+    regressions = []
+    for stage in current["stages"]:
+        old = previous.get(stage["stage"])
+        if not old or stage.get("p50_ms") is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "peak_alloc_kb"):
+            if old.get(metric) and stage.get(metric) is not None and stage[metric] > old[metric] * (1 + tolerance):
+                regressions.append(f"{stage['stage']} {metric}: {old[metric]} -> {stage[metric]}")
+    return regressions
+
+
+def print_report(report):
+    print(f"{'stage':<40}{'runs':>6}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'ops/s':>10}{'rss MB':>9}{'alloc KB':>10}{'pdf B':>9}")
+    for s in report["stages"]:
+        if "skipped" in s:
+            print(f"{s['stage']:<40}  atlandı: {s['skipped']}")
+            continue
+        def fmt(value):
+            return "-" if value is None else value
+        print(f"{s['stage']:<40}{s['runs']:>6}{s['errors']:>5}{fmt(s['p50_ms']):>10}{fmt(s['p95_ms']):>10}"
+              f"{fmt(s['throughput_per_s']):>10}{fmt(s['peak_rss_mb']):>9}{fmt(s.get('peak_alloc_kb')):>10}"
+              f"{s.get('pdf_bytes_mean', '-'):>9}")
+        if s.get("last_error"):
+            print(f"    son hata: {s['last_error'][:120]}")
+        if s.get("heavy_modules_at_import"):
+            print(f"    UYARI: içe aktarmada yüklenen ağır modüller: {', '.join(s['heavy_modules_at_import'])}")
+        if s.get("import_profile"):
+            print(f"    içe aktarma profili (toplam {s['import_profile']['total_ms']} ms):")
+            for entry in s["import_profile"]["packages"]:
+                print(f"      {entry['package']:<34}{entry['self_ms']:>10} ms")
+
+
+def run(stages, iterations, route_cache=False):
+    payloads = make_payloads()
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": iterations,
+        "stages": [],
+    }
+    for name in stages:
+        if name == "route":
+            report["stages"].extend(bench_route(iterations, payloads, use_cache=route_cache))
+        else:
+            report["stages"].extend(STAGES[name](iterations, payloads))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teklif akışı performans ölçümü")
+    parser.add_argument("-n", "--iterations", type=int, default=50, help="aşama başına ölçüm sayısı")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"virgülle ayrılmış aşamalar ({', '.join(STAGES)})")
+    parser.add_argument("--route-cache", action="store_true", help="/calculate ölçümünde teklif önbelleğini açık bırak")
+    parser.add_argument("--save", metavar="PATH", help="sonuçları JSON temel çizgisi olarak kaydet")
+    parser.add_argument("--compare", metavar="PATH", help="sonuçları kayıtlı temel çizgiyle karşılaştır")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="izin verilen kötüleşme oranı (0.10 = %%10)")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"bilinmeyen aşama: {', '.join(unknown)}")
+
+    report = run(stages, args.iterations, route_cache=args.route_cache)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"INFO: Sonuçlar kaydedildi: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print("UYARI: Performans kötüleşmesi tespit edildi:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("INFO: Temel çizgiye göre kötüleşme yok.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,478 @@
+# bulk_quotes.py
+# Bu dosya, bayilerden gelen CSV/XLSX tablolarındaki çok sayıda teklifi tek seferde işleyen
+# toplu teklif akışını içerir. Her satır bir müşteri ('customer_' önekli sütunlar) ve bir
+# 'project_details' kaydıdır. Satırlar dosyadan akış halinde okunur, tek bir fiyat listesi
+# anlık görüntüsüyle fiyatlanır ve istenen belgeler (documents.build_document_jobs) render
+# havuzunda oluşturulur. PDF'ler bittikçe diskteki ZIP arşivine yazılır; bellekte yalnızca
+# sınırlı sayıda satırın belgeleri bekler. Satır bazındaki toplamlar özet CSV'sine yazılır ve
+# arşive de eklenir. Komut satırından da çalıştırılabilir:
+#     python bulk_quotes.py bayi.csv --out teklifler.zip --documents proposal,internal
+
+import os
+import csv
+import json
+import time
+import zipfile
+import tempfile
+import argparse
+from collections import deque
+
+from config import BULK_QUOTE_MAX_ROWS, BULK_QUOTE_RENDER_WORKERS
+from calculator import PROJECT_FIELD_TYPES, InvalidProjectError, price_project, validate_project_details
+from documents import DOCUMENT_FILENAMES, build_document_jobs, document_filename
+from metrics import METRICS
+from price_list import PRICE_LISTS
+from utils import calculate_project_areas
+
+# 'customer_name' gibi sütunlar customer_info['name'] olarak okunur.
+CUSTOMER_PREFIX = "customer_"
+DEFAULT_DOCUMENTS = ("proposal",)
+SUMMARY_FILENAME = "summary.csv"
+
+# Satır durumları
+ROW_OK = "ok"
+ROW_INVALID = "invalid"
+ROW_ERROR = "error"
+
+# Toplu iş durumları (ilerleme dosyası için)
+BULK_RUNNING = "running"
+BULK_DONE = "done"
+BULK_FAILED = "failed"
+
+TRUE_VALUES = frozenset(("1", "true", "yes", "evet", "e", "y", "x"))
+FALSE_VALUES = frozenset(("0", "false", "no", "hayır", "hayir", "h", "n"))
+# Kural tablosu dışında kalan, yalnızca belge şablonlarının okuduğu alanlar sonekten tanınır.
+FLAG_SUFFIXES = ("_option", "_included")
+NUMBER_SUFFIXES = ("_count", "_amount")
+
+SUMMARY_FIELDS = [
+    "row", "customer_name", "customer_email", "status", "errors",
+    "floor_area", "material_subtotal", "waste_cost", "overhead_cost", "total_cost_before_profit",
+    "profit", "price_before_vat", "vat_amount", "house_sales_price", "solar_sales_price",
+    "aether_package_sales_price", "total_sales_price", "delivery_duration_business_days",
+    "price_list_version", "documents", "pdf_bytes",
+]
+_RESULT_FIELDS = SUMMARY_FIELDS[6:18]
+
+METRICS.describe("bulk_quote_rows_total", "counter", "Toplu tekliflerde işlenen satırlar (duruma göre).")
+
+
+class BulkQuoteError(ValueError):
+    """Tablo okunamadığında, biçimi desteklenmediğinde veya satır sınırı aşıldığında fırlatılır."""
+
+
+# --- Tablo Okuma ---
+def _csv_dialect(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        sample = f.read(16 * 1024)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        return csv.excel
+
+
+def _iter_csv(path):
+    dialect = _csv_dialect(path)
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f, dialect=dialect):
+            yield row
+
+
+CSV_EXTENSIONS = (".csv", ".txt")
+XLSX_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+def _import_openpyxl():
+    try:
+        import openpyxl
+    except ImportError:
+        raise BulkQuoteError("XLSX tabloları için openpyxl kurulu olmalıdır (pip install openpyxl)")
+    return openpyxl
+
+
+def check_format(path):
+    """
+    Tablonun biçimi okunabilir mi, satırlar işlenmeden önce denetler (ör. yükleme anında).
+    Desteklenmeyen uzantıda veya XLSX için openpyxl kurulu değilse BulkQuoteError fırlatır.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in XLSX_EXTENSIONS:
+        _import_openpyxl()
+    elif extension not in CSV_EXTENSIONS:
+        raise BulkQuoteError(f"Desteklenmeyen tablo biçimi: {extension or path} (.csv veya .xlsx bekleniyor)")
+
+
+def _open_xlsx(path):
+    openpyxl = _import_openpyxl()
+    try:
+        return openpyxl.load_workbook(path, read_only=True, data_only=True)
+    except Exception as e:
+        raise BulkQuoteError(f"XLSX dosyası okunamadı ({path}): {e}")
+
+
+def _iter_xlsx(path):
+    workbook = _open_xlsx(path)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        names = [str(name).strip() if name is not None else "" for name in header]
+        for values in rows:
+            if all(value is None or value == "" for value in values):
+                continue
+            yield {name: value for name, value in zip(names, values) if name}
+    finally:
+        workbook.close()
+
+
+def iter_rows(path):
+    """Tablonun satırlarını {sütun: değer} sözlükleri olarak akış halinde döndürür (.csv, .xlsx)."""
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension in CSV_EXTENSIONS:
+            yield from _iter_csv(path)
+        elif extension in XLSX_EXTENSIONS:
+            yield from _iter_xlsx(path)
+        else:
+            raise BulkQuoteError(f"Desteklenmeyen tablo biçimi: {extension or path} (.csv veya .xlsx bekleniyor)")
+    except OSError as e:
+        raise BulkQuoteError(f"Tablo okunamadı ({path}): {e}")
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise BulkQuoteError(f"CSV dosyası okunamadı ({path}): {e}")
+
+
+def count_rows(path):
+    """İlerleme bildirimi ve satır sınırı için tablodaki satır sayısı."""
+    if os.path.splitext(path)[1].lower() in XLSX_EXTENSIONS:
+        workbook = _open_xlsx(path)
+        try:
+            max_row = workbook.active.max_row
+        finally:
+            workbook.close()
+        if max_row is not None:
+            return max(max_row - 1, 0)
+    return sum(1 for _ in iter_rows(path))
+
+
+# --- Satır Dönüştürme ---
+def _field_kind(name):
+    kind = PROJECT_FIELD_TYPES.get(name)
+    if kind is not None:
+        return kind
+    if name.endswith(FLAG_SUFFIXES):
+        return "flag"
+    if name.endswith(NUMBER_SUFFIXES):
+        return "number"
+    return "text"
+
+
+def _parse_number(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return int(value) if isinstance(value, float) and value.is_integer() else value
+    text = value.replace(" ", "")
+    if "," in text and "." not in text:
+        text = text.replace(",", ".")
+    try:
+        number = float(text)
+    except ValueError:
+        # Ayrıştırılamayan değer olduğu gibi bırakılır; doğrulama satırı alan adıyla reddeder.
+        return value
+    return int(number) if number.is_integer() else number
+
+
+def _parse_flag(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    text = value.strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    return value
+
+
+def _parse_profit_rate(value):
+    """'20%', '0.2' veya '20' değerini ['20%', 0.2] biçimine çevirir."""
+    rate = _parse_number(str(value).strip().rstrip("%"))
+    if not isinstance(rate, (int, float)) or isinstance(rate, bool):
+        return value
+    if rate > 1:
+        rate = rate / 100.0
+    return [f"{rate * 100:g}%", rate]
+
+
+def parse_row(row):
+    """
+    Tablo satırını (customer_info, project_details) ikilisine çevirir. Boş hücreler atlanır
+    (varsayılan değer kullanılır); sayı ve evet/hayır alanları türlerine göre dönüştürülür.
+    """
+    customer_info = {}
+    project_details = {}
+    for column, value in row.items():
+        if column is None or value is None:
+            continue
+        name = column.strip()
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                continue
+        if name.startswith(CUSTOMER_PREFIX):
+            customer_info[name[len(CUSTOMER_PREFIX):]] = str(value)
+        elif name == "profit_rate":
+            project_details[name] = _parse_profit_rate(value)
+        else:
+            kind = _field_kind(name)
+            if kind == "number":
+                value = _parse_number(value)
+            elif kind == "flag":
+                value = _parse_flag(value)
+            elif not isinstance(value, str):
+                value = str(value)
+            project_details[name] = value
+    return customer_info, project_details
+
+
+def archive_member_name(row_number, document, customer_info):
+    """Arşivdeki PDF adı; aynı müşteri adları çakışmasın diye satır numarasıyla başlar."""
+    filename = document_filename(document, customer_info)
+    filename = "".join(char if char.isalnum() or char in "._-" else "_" for char in filename)
+    return f"{row_number:04d}_{filename}"
+
+
+# --- İlerleme ---
+class BulkProgress:
+    """Toplu işin ilerlemesi; `on_update` verilirse her satır bittiğinde çağrılır."""
+
+    def __init__(self, total=0, on_update=None):
+        self.total = total
+        self.processed = 0
+        self.counts = {ROW_OK: 0, ROW_INVALID: 0, ROW_ERROR: 0}
+        self.pdfs = 0
+        self.pdf_bytes = 0
+        self.state = BULK_RUNNING
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.on_update = on_update
+
+    def row_done(self, status, pdfs=0, pdf_bytes=0):
+        self.processed += 1
+        self.counts[status] += 1
+        self.pdfs += pdfs
+        self.pdf_bytes += pdf_bytes
+        METRICS.inc("bulk_quote_rows_total", {"status": status})
+        self._notify()
+
+    def finish(self, error=None):
+        self.state = BULK_FAILED if error else BULK_DONE
+        self.error = error
+        self.finished_at = time.time()
+        self._notify()
+
+    def to_dict(self):
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "state": self.state,
+            "total_rows": self.total,
+            "processed_rows": self.processed,
+            "percent": round(100.0 * self.processed / self.total, 1) if self.total else 0.0,
+            "rows": dict(self.counts),
+            "pdfs": self.pdfs,
+            "pdf_bytes": self.pdf_bytes,
+            "elapsed_seconds": round(elapsed, 3),
+            "error": self.error,
+        }
+
+    def _notify(self):
+        if self.on_update is not None:
+            self.on_update(self)
+
+
+def write_progress_file(path, progress, min_interval=0.5):
+    """
+    İlerlemeyi JSON dosyasına atomik olarak yazar (başka süreçler de okuyabilir). Satır
+    bazındaki güncellemeler `min_interval` saniyede bir yazılır; iş bitince her zaman yazılır.
+    """
+    now = time.time()
+    last = getattr(progress, "_written_at", 0.0)
+    if progress.state == BULK_RUNNING and now - last < min_interval:
+        return
+    progress._written_at = now
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(progress.to_dict(), f)
+    os.replace(tmp_path, path)
+
+
+def read_progress_file(path):
+    """Yazılmış ilerleme bilgisini döndürür; dosya yoksa None."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# --- Toplu İşleme ---
+def _summary_row(row_number, customer_info, status, errors=(), result=None, floor_area=None):
+    summary = {
+        "row": row_number,
+        "customer_name": customer_info.get("name", ""),
+        "customer_email": customer_info.get("email", ""),
+        "status": status,
+        "errors": "; ".join(errors),
+    }
+    if result is not None:
+        summary["floor_area"] = floor_area
+        summary.update({name: getattr(result, name) for name in _RESULT_FIELDS})
+        summary["price_list_version"] = result.price_list_version
+    return summary
+
+
+class _PendingRow:
+    """Belgeleri render havuzunda oluşturulmakta olan bir satır."""
+
+    def __init__(self, row_number, customer_info, summary, futures):
+        self.row_number = row_number
+        self.customer_info = customer_info
+        self.summary = summary
+        self.futures = futures
+
+
+def _finish_row(pending, archive, writer, progress):
+    summary = pending.summary
+    errors = []
+    written = []
+    pdf_bytes = 0
+    for document, future in pending.futures.items():
+        try:
+            data, _ = future.result()
+        except Exception as e:
+            errors.append(f"{document}: {e}")
+            continue
+        archive.writestr(archive_member_name(pending.row_number, document, pending.customer_info), data)
+        written.append(document)
+        pdf_bytes += len(data)
+    if errors:
+        summary["status"] = ROW_ERROR
+        summary["errors"] = "; ".join(errors)
+    summary["documents"] = ",".join(written)
+    summary["pdf_bytes"] = pdf_bytes
+    writer.writerow(summary)
+    progress.row_done(summary["status"], len(written), pdf_bytes)
+
+
+def process_bulk_quotes(input_path, archive_path, render_pool, documents=DEFAULT_DOCUMENTS,
+                        summary_path=None, progress=None, logo_data_b64=None,
+                        max_rows=BULK_QUOTE_MAX_ROWS, window=None):
+    """
+    Tablodaki teklifleri fiyatlar, belgeleri `render_pool` ile oluşturup `archive_path` ZIP
+    arşivine yazar ve satır bazındaki toplamları özet CSV'sine yazar (arşive de eklenir).
+    Geçersiz veya hatalı satırlar işi durdurmaz; özette durumlarıyla listelenir.
+    `window`: belgeleri aynı anda beklenen en fazla satır sayısı (bellek kullanımını sınırlar).
+    İlerleme (BulkProgress) nesnesini döndürür.
+    """
+    if progress is None:
+        progress = BulkProgress()
+    if window is None:
+        window = max(render_pool.workers, 1) * 2
+    if summary_path is None:
+        summary_path = os.path.splitext(archive_path)[0] + "_summary.csv"
+
+    # Tüm satırlar aynı fiyat listesiyle fiyatlanır (iş sırasında liste değişse bile).
+    price_list = PRICE_LISTS.current()
+    pending = deque()
+    try:
+        unknown = [document for document in documents if document not in DOCUMENT_FILENAMES]
+        if unknown:
+            raise BulkQuoteError(f"Bilinmeyen belge türü: {', '.join(unknown)} ({', '.join(DOCUMENT_FILENAMES)})")
+        progress.total = count_rows(input_path)
+        if progress.total > max_rows:
+            raise BulkQuoteError(f"Tabloda {progress.total} satır var; en fazla {max_rows} satır işlenebilir")
+        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive, \
+                open(summary_path, "w", encoding="utf-8-sig", newline="") as summary_file:
+            writer = csv.DictWriter(summary_file, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            for row_number, row in enumerate(iter_rows(input_path), start=1):
+                customer_info, project_details = parse_row(row)
+                try:
+                    validate_project_details(project_details, price_list)
+                    areas = calculate_project_areas(project_details)
+                    result = price_project(project_details, areas, price_list)
+                except InvalidProjectError as e:
+                    summary = _summary_row(row_number, customer_info, ROW_INVALID, e.errors)
+                    pending.append(_PendingRow(row_number, customer_info, summary, {}))
+                except Exception as e:
+                    summary = _summary_row(row_number, customer_info, ROW_ERROR, [f"pricing: {e}"])
+                    pending.append(_PendingRow(row_number, customer_info, summary, {}))
+                else:
+                    summary = _summary_row(row_number, customer_info, ROW_OK, result=result, floor_area=areas["floor"])
+                    futures = {}
+                    if documents:
+                        jobs = build_document_jobs(result.to_dict(), project_details, customer_info, logo_data_b64)
+                        futures = {document: render_pool.submit(*jobs[document]) for document in documents}
+                    pending.append(_PendingRow(row_number, customer_info, summary, futures))
+                # Özet satırları tablo sırasıyla yazılır; en eski satırın belgeleri beklenir.
+                while len(pending) > window or (pending and not pending[0].futures):
+                    _finish_row(pending.popleft(), archive, writer, progress)
+            while pending:
+                _finish_row(pending.popleft(), archive, writer, progress)
+            summary_file.flush()
+            archive.write(summary_path, SUMMARY_FILENAME)
+    except Exception as e:
+        progress.finish(str(e))
+        raise
+    progress.finish()
+    return progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV/XLSX tablosundaki teklifleri toplu olarak fiyatlar ve PDF'lerini ZIP'e yazar.")
+    parser.add_argument("input", help="Girdi tablosu (.csv veya .xlsx)")
+    parser.add_argument("--out", help="ZIP arşivi (varsayılan: <girdi>.zip)")
+    parser.add_argument("--summary", help="Özet CSV dosyası (varsayılan: <arşiv>_summary.csv)")
+    parser.add_argument("--documents", default=",".join(DEFAULT_DOCUMENTS),
+                        help=f"Virgülle ayrılmış belgeler: {', '.join(DOCUMENT_FILENAMES)} (boş: yalnızca özet)")
+    parser.add_argument("--workers", type=int, default=BULK_QUOTE_RENDER_WORKERS,
+                        help="PDF oluşturan süreç sayısı (0: sırayla)")
+    parser.add_argument("--max-rows", type=int, default=BULK_QUOTE_MAX_ROWS)
+    args = parser.parse_args(argv)
+
+    from logo_cache import LOGO_CACHE
+    from pdf_render_pool import PDFRenderPool
+
+    archive_path = args.out or os.path.splitext(args.input)[0] + ".zip"
+    documents = tuple(document.strip() for document in args.documents.split(",") if document.strip())
+    render_pool = PDFRenderPool(args.workers)
+
+    def report(progress):
+        if progress.state == BULK_RUNNING and (progress.processed % 10 or progress.processed == progress.total):
+            return
+        state = progress.to_dict()
+        print(f"INFO: {state['processed_rows']}/{state['total_rows']} satır (%{state['percent']}), "
+              f"{state['pdfs']} PDF, {state['elapsed_seconds']:.1f} sn")
+
+    try:
+        progress = process_bulk_quotes(args.input, archive_path, render_pool, documents, summary_path=args.summary,
+                                       progress=BulkProgress(on_update=report),
+                                       # Toplu işte logo bir kez, senkron yüklenir (okumalar ağa çıkmaz).
+                                       logo_data_b64=LOGO_CACHE.warm_up() if documents else None,
+                                       max_rows=args.max_rows)
+    except BulkQuoteError as e:
+        print(f"Hata: {e}")
+        return 2
+    finally:
+        render_pool.shutdown()
+    counts = progress.counts
+    print(f"INFO: Arşiv yazıldı: {archive_path} ({counts[ROW_OK]} geçerli, {counts[ROW_INVALID]} geçersiz, "
+          f"{counts[ROW_ERROR]} hatalı satır)")
+    return 0 if counts[ROW_ERROR] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
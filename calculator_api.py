@@ -3,29 +3,50 @@
 
 import sys
 import os
+import time
 # Proje kök dizinini Python yoluna ekle
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response, send_file
 from flask_cors import CORS
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
 from datetime import datetime
-import pandas as pd
 import math
 import re
 import base64
 import io
+import hmac
+import uuid
 
 # Projenin diğer dosyalarını içe aktar
-from config import FIYATLAR, COMPANY_INFO, MATERIAL_INFO_ITEMS, TRANSLATIONS
-from pdf_generator import create_internal_cost_report_pdf, create_customer_proposal_pdf_tr, create_customer_proposal_pdf_en_gr, create_sales_contract_pdf
-from calculator import calculate_costs_detailed
-from utils import clean_invisible_chars, calculate_area, get_company_logo_base64
+from config import (
+    FIYATLAR, COMPANY_INFO, MATERIAL_INFO_ITEMS, TRANSLATIONS,
+    QUOTE_JOBS_DIR, QUOTE_JOB_WORKERS, QUOTE_JOB_MAX_PENDING, QUOTE_JOB_MAX_ATTEMPTS,
+    QUOTE_JOB_LEASE_SECONDS, QUOTE_JOB_RETENTION_SECONDS, ADMIN_TOKEN, WARM_UP_ENABLED, BACKGROUND_SERVICES_AUTOSTART,
+    BULK_QUOTE_DIR, BULK_QUOTE_RENDER_WORKERS, BULK_QUOTE_MAX_PENDING, BULK_QUOTE_RETENTION_SECONDS,
+)
+from calculator import calculate_costs_detailed, price_project, validate_project_details, InvalidProjectError
+from utils import calculate_project_areas
+from logo_cache import LOGO_CACHE
+from email_queue import EmailDeliveryQueue, SMTPSettings, SMTPSession
+from pdf_render_pool import PDFRenderPool
+from quote_cache import QuoteCache
+from price_list import PRICE_LISTS, PriceListError, price_list_from_mapping
+from metrics import METRICS
+from job_queue import QuoteJobQueue, QueueFullError, JOB_DONE
+from quote_session import QuoteSessionStore
+from quote_archive import QUOTE_ARCHIVE
+from artifact_store import ARTIFACT_STORE
+from documents import DOCUMENT_FILENAMES, build_document_jobs, document_filename, quote_document_date
+from bulk_quotes import (
+    BulkProgress, BulkQuoteError, DEFAULT_DOCUMENTS, check_format, process_bulk_quotes, read_progress_file,
+    write_progress_file,
+)
+from warm_up import WarmUp
+from fonts import FONTS
+
+# Süreç başlangıcı (/health yanıtındaki çalışma süresi için)
+STARTED_AT = time.time()
 
 # Flask uygulamasını başlat ve CORS'u etkinleştir
 app = Flask(__name__)
@@ -33,6 +54,60 @@ app = Flask(__name__)
 # daha sonra sadece WordPress URL'niz ile sınırlandırmanız önerilir)
 CORS(app)
 
+# === PDF RENDER AYARLARI ===
+# 0: belgeler istek içinde sırayla oluşturulur; >0: belgeler bu kadar süreçte paralel oluşturulur.
+PDF_RENDER_WORKERS = int(os.environ.get("PDF_RENDER_WORKERS", 0))
+RENDER_POOL = PDFRenderPool(PDF_RENDER_WORKERS)
+
+# === BAŞLANGIÇ ISINMASI ===
+# pandas, reportlab ve PIL içe aktarma sırasında yüklenmez (hızlı soğuk başlangıç). İlk istek
+# geldiğinde fontlar, stiller, bu modüller ve logo arka planda yüklenir; istekler beklemez.
+# Logo ısınma bitmeden bir teklifte gerekirse önbellek onu o anda yükler.
+def _preload_pandas():
+    import pandas  # noqa: F401 (maliyet tabloları ve belgeler için)
+
+WARM_UP = WarmUp([
+    # Font seçimi ana süreçte de yapılır; böylece Helvetica'ya düşme /metrics'te görünür.
+    ("fonts", FONTS.register),
+    ("pdf_resources", RENDER_POOL.warm_up),
+    ("pandas", _preload_pandas),
+    ("logo", LOGO_CACHE.warm_up),
+], enabled=WARM_UP_ENABLED)
+
+@app.before_request
+def _start_warm_up():
+    WARM_UP.start_async()
+
+def preload_resources():
+    """
+    Isınma adımlarını çatallanmadan (fork) önce ana süreçte senkron çalıştırır (gunicorn preload_app).
+    Fontlar, stiller, pandas ve logo bir kez yüklenir; çalışan süreçler bunları yazma anında kopyalama
+    (copy-on-write) ile paylaşır. Render havuzu çatallanmaya dayanmadığından burada başlatılmaz;
+    PDF kaynakları doğrudan bu süreçte hazırlanır.
+    """
+    import pdf_generator
+    FONTS.register()
+    pdf_generator.initialize_pdf_resources()
+    _preload_pandas()
+    LOGO_CACHE.warm_up()
+
+# === TEKLİF ÖNBELLEĞİ ===
+# Aynı form tekrar gönderildiğinde hesaplama ve PDF oluşturma atlanır (ayarlar config.py'de).
+QUOTE_CACHE = QuoteCache.from_config()
+
+# === FİYAT LİSTESİ ===
+# Fiyatlar çalışırken değişebilir (dosya izleme veya /admin/price-list/reload). Önbellek
+# anahtarları fiyat listesi sürümünü içerdiğinden eski sonuçlar yeni fiyatlarla karışmaz.
+def _on_price_list_changed(price_list):
+    QUOTE_CACHE.price_list_version = price_list.version
+
+QUOTE_CACHE.price_list_version = PRICE_LISTS.current().version
+PRICE_LISTS.add_listener(_on_price_list_changed)
+
+# === ANLIK FİYAT ÖNİZLEME ===
+# Form alanları değiştikçe /quote/preview yalnızca etkilenen kalemleri yeniden hesaplar.
+QUOTE_SESSIONS = QuoteSessionStore.from_config()
+
 # === GÜVENLİ E-POSTA AYARLARI (RENDER ORTAM DEĞİŞKENLERİ) ===
 # Bu bilgileri Render arayüzünden "Environment Variables" olarak ekleyin.
 MAIL_USERNAME = os.environ.get("MAIL_USERNAME")
@@ -40,147 +115,749 @@ MAIL_PASSWORD = os.environ.get("MAIL_PASSWORD") # Uygulama şifresi
 MAIL_SERVER = os.environ.get("MAIL_SERVER", "smtp.hostinger.com") # Varsayılan değer eklenmiştir
 MAIL_PORT = int(os.environ.get("MAIL_PORT", 587)) # Varsayılan değer eklenmiştir
 
-SENDER_EMAIL = MAIL_USERNAME
+MAIL_USE_TLS = os.environ.get("MAIL_USE_TLS", "1") not in ("0", "false", "False") # Yerel test SMTP sunucuları için kapatılabilir
+SENDER_EMAIL = os.environ.get("MAIL_SENDER") or MAIL_USERNAME
 RECIPIENT_EMAIL_COMPANY = COMPANY_INFO["email"]
 
+# E-postalar varsayılan olarak arka plan kuyruğu ile gönderilir ("sync" ile eski davranış).
+EMAIL_DELIVERY_MODE = os.environ.get("EMAIL_DELIVERY_MODE", "async")
+EMAIL_WORKERS = int(os.environ.get("EMAIL_WORKERS", 2))
+EMAIL_MAX_RETRIES = int(os.environ.get("EMAIL_MAX_RETRIES", 3))
+
+def _record_email_result(entry):
+    METRICS.inc("quote_emails_total", {"mode": "async", "result": entry["status"]})
+
+SMTP_SETTINGS = SMTPSettings(MAIL_SERVER, MAIL_PORT, MAIL_USERNAME, MAIL_PASSWORD, SENDER_EMAIL, use_tls=MAIL_USE_TLS)
+EMAIL_QUEUE = EmailDeliveryQueue(SMTP_SETTINGS, workers=EMAIL_WORKERS, max_retries=EMAIL_MAX_RETRIES,
+                                 on_finished=_record_email_result)
+
+# === ÖLÇÜMLER ===
+def _collect_runtime_gauges(registry):
+    stats = QUOTE_CACHE.stats()
+    for kind in ("pricing", "documents"):
+        registry.set("quote_cache_entries", stats[kind]["entries"], {"cache": kind})
+        registry.set("quote_cache_hits", stats[kind]["hits"], {"cache": kind})
+        registry.set("quote_cache_misses", stats[kind]["misses"], {"cache": kind})
+    registry.set("quote_email_queue_pending", EMAIL_QUEUE.pending())
+    registry.set("quote_jobs_pending", QUOTE_JOBS.pending())
+    registry.set("bulk_quote_jobs_pending", BULK_QUOTE_JOBS.pending())
+    registry.set("quote_preview_sessions", len(QUOTE_SESSIONS))
+    registry.set("quote_archive_pending", QUOTE_ARCHIVE.pending())
+    artifact_stats = ARTIFACT_STORE.stats()
+    registry.set("pdf_artifact_hits", artifact_stats["hits"])
+    registry.set("pdf_artifact_misses", artifact_stats["misses"])
+    if WARM_UP.duration() is not None:
+        registry.set("app_warm_up_seconds", WARM_UP.duration())
+
+METRICS.describe("quote_cache_entries", "gauge", "Teklif önbelleğindeki kayıt sayısı.")
+METRICS.describe("quote_cache_hits", "gauge", "Teklif önbelleği isabet sayısı (süreç başlangıcından beri).")
+METRICS.describe("quote_cache_misses", "gauge", "Teklif önbelleği ıskalama sayısı (süreç başlangıcından beri).")
+METRICS.describe("quote_email_queue_pending", "gauge", "Gönderim kuyruğunda bekleyen e-posta sayısı.")
+METRICS.describe("quote_jobs_pending", "gauge", "İşlenmeyi bekleyen asenkron teklif işi sayısı.")
+METRICS.describe("quote_jobs_rejected_total", "counter", "Kuyruk dolu olduğu için reddedilen teklif işleri.")
+METRICS.describe("bulk_quote_jobs_pending", "gauge", "İşlenmeyi bekleyen toplu teklif işi sayısı.")
+METRICS.describe("quote_preview_sessions", "gauge", "Bellekteki anlık fiyat önizleme oturumu sayısı.")
+METRICS.describe("quote_archive_pending", "gauge", "Teklif arşivine yazılmayı bekleyen kayıt sayısı.")
+METRICS.describe("pdf_artifact_hits", "gauge", "Belge deposundan sunulan PDF sayısı (süreç başlangıcından beri).")
+METRICS.describe("pdf_artifact_misses", "gauge", "Belge deposunda bulunmayıp oluşturulan PDF sayısı (süreç başlangıcından beri).")
+METRICS.describe("app_warm_up_seconds", "gauge", "Başlangıç ısınmasının (fontlar, stiller, modüller) süresi.")
+METRICS.add_collector(_collect_runtime_gauges)
+
+@app.after_request
+def _finish_quote_trace(response):
+    trace = g.pop('quote_trace', None)
+    if trace is not None:
+        trace.finish(response.status_code)
+    return response
+
 # E-posta gönderme fonksiyonu
 def send_email_with_pdf(to_address, subject, body, pdf_data, pdf_filename):
     """
-    Belirtilen adrese PDF ekiyle e-posta gönderir.
+    Belirtilen adrese PDF ekiyle e-posta gönderir (senkron).
     """
-    if not all([MAIL_USERNAME, MAIL_PASSWORD, MAIL_SERVER, MAIL_PORT]):
+    if not SMTP_SETTINGS.is_complete():
         print("UYARI: E-posta ayarları eksik. E-posta gönderimi yapılamadı.")
         return False
 
-    msg = MIMEMultipart()
-    msg['From'] = SENDER_EMAIL
-    msg['To'] = to_address
-    msg['Subject'] = subject
-    
-    msg.attach(MIMEText(body, 'html'))
-    
-    # PDF dosyasını ek olarak ekle
-    part = MIMEBase('application', 'octet-stream')
-    part.set_payload(pdf_data)
-    encoders.encode_base64(part)
-    part.add_header('Content-Disposition', f"attachment; filename= {pdf_filename}")
-    msg.attach(part)
-    
-    try:
-        server = smtplib.SMTP(MAIL_SERVER, MAIL_PORT)
-        server.starttls()
-        server.login(MAIL_USERNAME, MAIL_PASSWORD)
-        text = msg.as_string()
-        server.sendmail(SENDER_EMAIL, to_address, text)
-        server.quit()
+    # Mesaj bellekte birleştirilmez; PDF eki base64 satırları halinde SMTP'ye akıtılır.
+    session = SMTPSession(SMTP_SETTINGS)
+    try:
+        session.send(to_address, subject, body, pdf_data, pdf_filename)
         return True
     except Exception as e:
         print(f"E-posta gönderme hatası: {e}")
         return False
+    finally:
+        session.close()
+
+def queue_email_with_pdf(to_address, subject, body, pdf_data, pdf_filename):
+    """
+    E-postayı arka plan teslimat kuyruğuna ekler ve teslimat kimliğini döndürür.
+    Ayarlar eksikse None döner.
+    """
+    if not SMTP_SETTINGS.is_complete():
+        print("UYARI: E-posta ayarları eksik. E-posta gönderimi yapılamadı.")
+        return None
+    return EMAIL_QUEUE.submit(to_address, subject, body, pdf_data, pdf_filename)
+
+QUOTE_ID_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+def prepare_quote(customer_info, project_details, trace):
+    """
+    Projeyi fiyatlandırır ve PDF belgelerini oluşturur (ikisi de önbellekten dönebilir).
+    (teklif_kimliği, {belge_adı: pdf_baytları}, fiyat_listesi_sürümü) döndürür; kimlik GET ile
+    indirmede kullanılır. Fiyat listesi istek başında bir kez alınır ve tüm aşamalarda kullanılır.
+    """
+    price_list = PRICE_LISTS.current()
+    trace.annotate(price_list_version=price_list.version)
+    with trace.stage('validate'):
+        validate_project_details(project_details, price_list)
+
+    # Gelen verilerle hesaplama motorunu çalıştır (aynı proje bilgileri önbellekten döner)
+    def _price_project():
+        return calculate_costs_detailed(project_details, calculate_project_areas(project_details), price_list)
+
+    with trace.stage('pricing'):
+        results = QUOTE_CACHE.get_pricing(project_details, _price_project, price_list.version)
+    with trace.stage('logo'):
+        logo_data_b64, logo_digest = LOGO_CACHE.snapshot()
+
+    # PDF'leri oluştur (PDF_RENDER_WORKERS > 0 ise üç belge paralel oluşturulur)
+    document_date = quote_document_date()
+    document_jobs = build_document_jobs(results, project_details, customer_info, logo_data_b64, document_date)
+    # PDF'ler müşteri bilgisi içerdiğinden isteğin tamamıyla önbelleğe alınır. Belgeye basılan
+    # tarih de girdidir; ertesi gün aynı istek yeni tarihli belgeler üretir.
+    documents_payload = {
+        'customer_info': customer_info,
+        'project_details': project_details,
+        'logo': logo_digest,
+        'document_date': document_date,
+    }
+    # Bellek önbelleğinde olmayan belgeler önce belge deposunda aranır; yalnızca eksikler oluşturulur.
+    artifact_keys = {
+        name: ARTIFACT_STORE.key(name, builder_name, documents_payload, price_list.version)
+        for name, (builder_name, _) in document_jobs.items()
+    }
+    render_timings = {}
+    with trace.stage('render'):
+        documents = QUOTE_CACHE.get_documents(
+            documents_payload,
+            lambda: ARTIFACT_STORE.render_all(
+                document_jobs, artifact_keys, lambda jobs: RENDER_POOL.render_all(jobs, render_timings)
+            ),
+            price_list.version
+        )
+    # Belge bazında süreler yalnızca gerçekten oluşturulduklarında vardır (önbellekte yoksa).
+    for name, seconds in render_timings.items():
+        trace.record(f'pdf_{name}', seconds)
+    trace.annotate(documents_cached=not render_timings)
+    for name, pdf_data in documents.items():
+        trace.add_pdf_bytes(name, len(pdf_data))
+    quote_id = QUOTE_CACHE.documents_key(documents_payload, price_list.version)
+    ARTIFACT_STORE.link(quote_id, artifact_keys)
+    # Arşive yazma arka planda yapılır; burada yalnızca kuyruğa eklenir.
+    QUOTE_ARCHIVE.record(quote_id, customer_info, project_details, results, documents, source=getattr(trace, 'route', None))
+    return quote_id, documents, price_list.version
+
+def document_urls(quote_id):
+    return {document: f"/documents/{quote_id}/{document}" for document in DOCUMENT_FILENAMES}
+
+def stream_pdf(pdf_data, filename):
+    """
+    PDF'i yanıt gövdesine parça parça akıtır. BytesIO baytları kopyalamadan sarar;
+    send_file dosya benzeri nesneyi bloklar halinde okur (chunked aktarım).
+    """
+    as_attachment = request.args.get('download', '0') not in ('0', 'false', 'False')
+    return send_file(io.BytesIO(pdf_data), mimetype='application/pdf', as_attachment=as_attachment,
+                     download_name=filename, max_age=0)
+
+def build_quote_emails(customer_info, project_details, documents):
+    """Müşteriye ve şirkete gidecek e-postaları (adres, konu, gövde, pdf, dosya adı) döndürür."""
+    customer_email = (
+        customer_info.get('email', ''),
+        "Premium Home Teklifiniz / Your Premium Home Offer",
+        "Sayın Müşterimiz, talebiniz üzerine oluşturulan teklifiniz ektedir. / Dear Customer, your offer is attached.",
+        documents['proposal'],
+        document_filename('proposal', customer_info)
+    )
+
+    company_email_body = f"""
+    Yeni bir teklif talebi alındı.
+
+    Müşteri Adı: {customer_info.get('name', '')}
+    E-posta: {customer_info.get('email', '')}
+    Telefon: {customer_info.get('phone', '')}
+    Proje Alanı: {project_details.get('width', 0)}m x {project_details.get('length', 0)}m
+    """
+    company_email = (
+        RECIPIENT_EMAIL_COMPANY,
+        f"Yeni Teklif Talebi: {customer_info.get('name', 'General')}",
+        company_email_body,
+        documents['internal'],
+        document_filename('internal', customer_info)
+    )
+    return customer_email, company_email
+
+def run_quote_job(job_id, payload):
+    """
+    Asenkron teklif işini çalıştırır (iş kuyruğunun çalışan iş parçacığında).
+    (sonuç_sözlüğü, {belge_adı: pdf_baytları}) döndürür; PDF'ler iş dizinine yazılır.
+    """
+    trace = METRICS.start_request('/jobs')
+    trace.annotate(job_id=job_id)
+    status_code = 500
+    try:
+        customer_info = payload.get('customer_info', {})
+        project_details = payload.get('project_details', {})
+        quote_id, documents, price_list_version = prepare_quote(customer_info, project_details, trace)
+        result = {"quote_id": quote_id, "price_list_version": price_list_version}
+        if payload.get('send_email', True) not in (False, 0, '0', 'false', 'False'):
+            # E-postalar teslimat kuyruğuna alınır; iş, gönderimin bitmesini beklemez.
+            with trace.stage('email'):
+                customer_email, company_email = build_quote_emails(customer_info, project_details, documents)
+                result["email_deliveries"] = {
+                    "customer": queue_email_with_pdf(*customer_email),
+                    "company": queue_email_with_pdf(*company_email),
+                }
+        status_code = 200
+        return result, documents
+    finally:
+        trace.finish(status_code)
+
+QUOTE_JOBS = QuoteJobQueue(
+    QUOTE_JOBS_DIR, run_quote_job, workers=QUOTE_JOB_WORKERS, max_pending=QUOTE_JOB_MAX_PENDING,
+    max_attempts=QUOTE_JOB_MAX_ATTEMPTS, lease_seconds=QUOTE_JOB_LEASE_SECONDS,
+    retention_seconds=QUOTE_JOB_RETENTION_SECONDS,
+)
+
+# === TOPLU TEKLİFLER ===
+# Toplu işler ayrı bir kalıcı kuyrukta, tek çalışanla sırayla işlenir; PDF'leri ayrı bir
+# render havuzu oluşturur (tek tek tekliflerin render havuzunu meşgul etmez).
+BULK_RENDER_POOL = PDFRenderPool(BULK_QUOTE_RENDER_WORKERS)
+BULK_UPLOADS_DIR = os.path.join(BULK_QUOTE_DIR, "uploads")
+os.makedirs(BULK_UPLOADS_DIR, exist_ok=True)
+
+def run_bulk_quote_job(job_id, payload):
+    """
+    Yüklenen tabloyu işler (toplu iş kuyruğunun çalışan iş parçacığında). ZIP arşivi, özet
+    CSV'si ve ilerleme dosyası iş dizinine yazılır; belge baytları bellekte tutulmaz.
+    """
+    progress_path = BULK_QUOTE_JOBS.artifact_path(job_id, 'progress', '.json')
+    progress = BulkProgress(on_update=lambda p: write_progress_file(progress_path, p))
+    documents = payload.get('documents', DEFAULT_DOCUMENTS)
+    try:
+        # Logo satır döngüsünden önce bir kez, senkron yüklenir; soğuk süreçte tüm PDF'ler logosuz kalmaz.
+        process_bulk_quotes(
+            payload['input_path'], BULK_QUOTE_JOBS.artifact_path(job_id, 'archive', '.zip'), BULK_RENDER_POOL,
+            documents,
+            summary_path=BULK_QUOTE_JOBS.artifact_path(job_id, 'summary', '.csv'),
+            progress=progress, logo_data_b64=LOGO_CACHE.warm_up() if documents else None,
+        )
+    finally:
+        try:
+            os.remove(payload['input_path'])
+        except OSError:
+            pass
+    return {"filename": payload.get('filename'), "progress": progress.to_dict()}, {}
+
+BULK_QUOTE_JOBS = QuoteJobQueue(
+    BULK_QUOTE_DIR, run_bulk_quote_job, workers=1, max_pending=BULK_QUOTE_MAX_PENDING,
+    max_attempts=QUOTE_JOB_MAX_ATTEMPTS, lease_seconds=QUOTE_JOB_LEASE_SECONDS,
+    retention_seconds=BULK_QUOTE_RETENTION_SECONDS,
+)
+
+def start_background_services():
+    """
+    İş kuyruğu çalışanlarını ve fiyat listesi izleyicisini başlatır (birden çok çağrı güvenlidir).
+    Önceki çalıştırmadan kalan işler de hemen işlenir. gunicorn altında her çalışan süreçte
+    çatallanmadan sonra çağrılır (gunicorn.conf.py).
+    """
+    QUOTE_JOBS.start()
+    BULK_QUOTE_JOBS.start()
+    PRICE_LISTS.start_watching()
+
+if BACKGROUND_SERVICES_AUTOSTART:
+    start_background_services()
+
+def invalid_project_response(error):
+    return jsonify({"status": "error", "message": str(error), "errors": error.errors}), 400
+
+def submit_quote_job(data):
+    """İsteği doğrulayıp iş kuyruğuna ekler; kuyruk doluysa 429 döner."""
+    try:
+        validate_project_details(data.get('project_details', {}))
+    except InvalidProjectError as e:
+        return invalid_project_response(e)
+    try:
+        job_id = QUOTE_JOBS.submit({
+            'customer_info': data.get('customer_info', {}),
+            'project_details': data.get('project_details', {}),
+            'send_email': data.get('send_email', True),
+        })
+    except QueueFullError as e:
+        METRICS.inc("quote_jobs_rejected_total")
+        response = jsonify({"status": "error", "message": f"Sunucu meşgul, lütfen daha sonra tekrar deneyin. ({e})"})
+        response.headers['Retry-After'] = '30'
+        return response, 429
+    return jsonify({
+        "status": "accepted",
+        "message": "Teklif talebi alındı ve işleniyor.",
+        "job_id": job_id,
+        "status_url": f"/jobs/{job_id}",
+    }), 202
 
 @app.route('/calculate', methods=['POST'])
 def calculate_and_generate_pdfs():
     """
     WordPress'ten gelen proje verilerini alır, maliyetleri hesaplar,
     PDF'leri oluşturur ve e-posta ile gönderir.
+    "send_email": false gönderilirse e-posta atlanır ve yalnızca indirme bağlantıları döner.
+    "async": true gönderilirse iş kuyruğa alınır ve hemen bir iş kimliği döner (bkz. /jobs).
     """
+    trace = METRICS.start_request('/calculate')
+    g.quote_trace = trace
     try:
-        data = request.get_json()
+        with trace.stage('parse'):
+            data = request.get_json()
         if not data:
             return jsonify({"status": "error", "message": "Invalid JSON data"}), 400
 
         # Müşteri ve proje verilerini al
+        if data.get('async') in (True, 1, '1', 'true', 'True'):
+            return submit_quote_job(data)
+
         customer_info = data.get('customer_info', {})
         project_details = data.get('project_details', {})
+        send_email = data.get('send_email', True) not in (False, 0, '0', 'false', 'False')
+        trace.annotate(pdf_language=project_details.get('pdf_language', 'tr'), send_email=send_email)
 
-        # Gelen verilerle hesaplama motorunu çalıştır
-        areas = calculate_area(
-            project_details.get('width', 0),
-            project_details.get('length', 0),
-            project_details.get('height', 0),
-            project_details.get('is_two_story', False),
-            project_details.get('height_2nd_floor', 0)
-        )
-        
-        results = calculate_costs_detailed(project_details, areas)
-
-        # PDF'leri oluştur
-        internal_pdf_data = create_internal_cost_report_pdf(
-            results['costs_df'],
-            results['financial_summary'],
-            results['profile_analysis_df'],
-            project_details,
-            customer_info,
-            results.get('logo_data_b64', None)
-        )
-        
-        if project_details.get('pdf_language', 'tr') == 'tr':
-            customer_proposal_data = create_customer_proposal_pdf_tr(
-                results['house_sales_price'],
-                results['solar_sales_price'],
-                results['aether_package_sales_price'],
-                results['total_sales_price'],
-                project_details,
-                customer_info,
-                results['extra_expenses_info'],
-                results.get('logo_data_b64', None)
-            )
-        else:
-            customer_proposal_data = create_customer_proposal_pdf_en_gr(
-                results['house_sales_price'],
-                results['solar_sales_price'],
-                results['aether_package_sales_price'],
-                results['total_sales_price'],
-                project_details,
-                customer_info,
-                results['extra_expenses_info'],
-                results.get('logo_data_b64', None)
-            )
-
-        sales_contract_data = create_sales_contract_pdf(
-            customer_info,
-            results['house_sales_price'],
-            results['solar_sales_price'],
-            results['aether_package_sales_price'],
-            project_details,
-            COMPANY_INFO,
-            results['extra_expenses_info'],
-            results.get('logo_data_b64', None)
-        )
+        quote_id, documents, price_list_version = prepare_quote(customer_info, project_details, trace)
 
-        email_sent_to_customer = send_email_with_pdf(
-            customer_info.get('email', ''),
-            "Premium Home Teklifiniz / Your Premium Home Offer",
-            "Sayın Müşterimiz, talebiniz üzerine oluşturulan teklifiniz ektedir. / Dear Customer, your offer is attached.",
-            customer_proposal_data,
-            f"Customer_Proposal_{clean_invisible_chars(customer_info.get('name', 'General')).replace(' ', '_')}.pdf"
-        )
-        
-        company_email_body = f"""
-        Yeni bir teklif talebi alındı.
-
-        Müşteri Adı: {customer_info.get('name', '')}
-        E-posta: {customer_info.get('email', '')}
-        Telefon: {customer_info.get('phone', '')}
-        Proje Alanı: {project_details.get('width', 0)}m x {project_details.get('length', 0)}m
-        """
-        email_sent_to_company = send_email_with_pdf(
-            RECIPIENT_EMAIL_COMPANY,
-            f"Yeni Teklif Talebi: {customer_info.get('name', 'General')}",
-            company_email_body,
-            internal_pdf_data,
-            f"Internal_Report_{clean_invisible_chars(customer_info.get('name', 'General')).replace(' ', '_')}.pdf"
-        )
-        
-        if email_sent_to_customer and email_sent_to_company:
-            return jsonify({"status": "success", "message": "Teklifler başarıyla oluşturuldu ve e-posta ile gönderildi."}), 200
-        else:
+        if not send_email:
+            return jsonify({
+                "status": "success",
+                "message": "Teklifler başarıyla oluşturuldu.",
+                "quote_id": quote_id,
+                "price_list_version": price_list_version,
+                "documents": document_urls(quote_id),
+            }), 200
+
+        customer_email, company_email = build_quote_emails(customer_info, project_details, documents)
+
+        if EMAIL_DELIVERY_MODE == 'sync':
+            with trace.stage('email'):
+                email_sent_to_customer = send_email_with_pdf(*customer_email)
+                email_sent_to_company = send_email_with_pdf(*company_email)
+            for sent in (email_sent_to_customer, email_sent_to_company):
+                METRICS.inc("quote_emails_total", {"mode": "sync", "result": "sent" if sent else "failed"})
+
+            if email_sent_to_customer and email_sent_to_company:
+                return jsonify({"status": "success", "message": "Teklifler başarıyla oluşturuldu ve e-posta ile gönderildi.",
+                                "quote_id": quote_id, "price_list_version": price_list_version,
+                                "documents": document_urls(quote_id)}), 200
+            else:
+                return jsonify({"status": "error", "message": "Teklifler oluşturuldu ancak e-posta gönderimi başarısız oldu."}), 500
+
+        with trace.stage('email'):
+            customer_delivery_id = queue_email_with_pdf(*customer_email)
+            company_delivery_id = queue_email_with_pdf(*company_email)
+        if not (customer_delivery_id and company_delivery_id):
             return jsonify({"status": "error", "message": "Teklifler oluşturuldu ancak e-posta gönderimi başarısız oldu."}), 500
 
+        return jsonify({
+            "status": "success",
+            "message": "Teklifler başarıyla oluşturuldu, e-postalar gönderim kuyruğuna alındı.",
+            "quote_id": quote_id,
+            "price_list_version": price_list_version,
+            "documents": document_urls(quote_id),
+            "email_deliveries": {
+                "customer": {"id": customer_delivery_id, "status_url": f"/email-status/{customer_delivery_id}"},
+                "company": {"id": company_delivery_id, "status_url": f"/email-status/{company_delivery_id}"},
+            }
+        }), 202
+
+    except InvalidProjectError as e:
+        return invalid_project_response(e)
     except Exception as e:
         print(f"Genel hata: {e}")
         import traceback
-        return jsonify({"status": "error", "message": str(e), "traceback": traceback.format_exc()}), 500
+        return jsonify({"status": "error", "message": str(e), "request_id": trace.request_id,
+                        "traceback": traceback.format_exc()}), 500
+
+@app.route('/price', methods=['POST'])
+def price_preview():
+    """
+    /calculate ile aynı gövdeyi alır ve yalnızca fiyatı hesaplar: finansal özet ve maliyet
+    kalemleri JSON olarak döner. Logo, PDF ve e-posta adımları çalışmaz; doğrulama ve
+    fiyatlama /calculate ile aynı fonksiyonlardır.
+    """
+    trace = METRICS.start_request('/price')
+    g.quote_trace = trace
+    data = request.get_json()
+    if not data:
+        return jsonify({"status": "error", "message": "Invalid JSON data"}), 400
+    project_details = data.get('project_details', {})
+    price_list = PRICE_LISTS.current()
+    try:
+        with trace.stage('pricing'):
+            validate_project_details(project_details, price_list)
+            result = price_project(project_details, calculate_project_areas(project_details), price_list)
+    except InvalidProjectError as e:
+        return invalid_project_response(e)
+    return jsonify({"status": "success", **result.summary_dict()}), 200
+
+@app.route('/quote/preview', methods=['POST'])
+def quote_preview():
+    """
+    PDF oluşturmadan anlık fiyat döndürür (form alanları değiştikçe çağrılır).
+    {"project_details": {...}} yeni bir oturum açar; {"session_id": "...", "changes": {"window_count": 4}}
+    yalnızca değişen alanlara bağlı kalemleri yeniden hesaplar. "include_items": true kalemleri de döndürür.
+    """
+    trace = METRICS.start_request('/quote/preview')
+    g.quote_trace = trace
+    data = request.get_json()
+    if not data:
+        return jsonify({"status": "error", "message": "Invalid JSON data"}), 400
+    changes = data.get('changes') or {}
+    if not isinstance(changes, dict):
+        return jsonify({"status": "error", "message": "'changes' must be an object"}), 400
+
+    try:
+        with trace.stage('pricing'):
+            if data.get('session_id'):
+                session = QUOTE_SESSIONS.get(data['session_id'])
+                if session is None:
+                    return jsonify({"status": "error", "message": "Session expired or not found"}), 404
+                recalculated = session.apply(changes)
+            else:
+                session = QUOTE_SESSIONS.create(data.get('project_details') or {})
+                recalculated = None
+                if changes:
+                    recalculated = session.apply(changes)
+    except InvalidProjectError as e:
+        return invalid_project_response(e)
+    trace.annotate(recalculated_rules=len(recalculated) if recalculated is not None else 'all')
+
+    preview = session.preview(include_items=data.get('include_items') in (True, 1, '1', 'true', 'True'))
+    return jsonify({"status": "success", "recalculated": recalculated, **preview}), 200
+
+@app.route('/email-status/<delivery_id>', methods=['GET'])
+def email_delivery_status(delivery_id):
+    """Kuyruğa alınmış bir e-postanın teslimat durumunu döndürür."""
+    entry = EMAIL_QUEUE.status(delivery_id)
+    if entry is None:
+        return jsonify({"status": "error", "message": "Delivery not found"}), 404
+    return jsonify({"status": "success", "delivery": entry}), 200
+
+@app.route('/documents/<document>', methods=['POST'])
+def render_document(document):
+    """
+    /calculate ile aynı gövdeyi alır ve seçilen belgeyi (proposal, internal, contract)
+    doğrudan yanıt olarak akıtır. E-posta yalnızca "send_email": true ile gönderilir.
+    """
+    if document not in DOCUMENT_FILENAMES:
+        return jsonify({"status": "error", "message": "Unknown document"}), 404
+    trace = METRICS.start_request('/documents')
+    g.quote_trace = trace
+    try:
+        with trace.stage('parse'):
+            data = request.get_json()
+        if not data:
+            return jsonify({"status": "error", "message": "Invalid JSON data"}), 400
+
+        customer_info = data.get('customer_info', {})
+        project_details = data.get('project_details', {})
+        send_email = data.get('send_email', False) not in (False, 0, '0', 'false', 'False')
+        trace.annotate(document=document, send_email=send_email)
+
+        quote_id, documents, price_list_version = prepare_quote(customer_info, project_details, trace)
+        if send_email:
+            with trace.stage('email'):
+                customer_email, _ = build_quote_emails(customer_info, project_details, documents)
+                queue_email_with_pdf(*customer_email)
+
+        response = stream_pdf(documents[document], document_filename(document, customer_info))
+        response.headers['X-Quote-Id'] = quote_id
+        response.headers['X-Price-List-Version'] = price_list_version
+        return response
+
+    except InvalidProjectError as e:
+        return invalid_project_response(e)
+    except Exception as e:
+        print(f"Genel hata: {e}")
+        import traceback
+        return jsonify({"status": "error", "message": str(e), "request_id": trace.request_id,
+                        "traceback": traceback.format_exc()}), 500
+
+@app.route('/documents/<quote_id>/<document>', methods=['GET'])
+def download_document(quote_id, document):
+    """Daha önce oluşturulmuş bir teklifin belgesini önbellekten akıtır."""
+    if document not in DOCUMENT_FILENAMES or not QUOTE_ID_PATTERN.match(quote_id):
+        return jsonify({"status": "error", "message": "Document not found"}), 404
+    documents = QUOTE_CACHE.lookup_documents(quote_id)
+    # Önbellekten düşmüş teklifler önce belge deposundan, PDF'leri saklanmışsa arşivden sunulur.
+    if documents is not None:
+        pdf_data = documents[document]
+    else:
+        pdf_data = ARTIFACT_STORE.lookup(quote_id, document) or QUOTE_ARCHIVE.document(quote_id, document)
+    if pdf_data is None:
+        return jsonify({"status": "error", "message": "Quote expired or not found"}), 404
+    return stream_pdf(pdf_data, f"{DOCUMENT_FILENAMES[document]}_{quote_id[:12]}.pdf")
+
+@app.route('/jobs', methods=['POST'])
+def create_quote_job():
+    """/calculate ile aynı gövdeyi alır, işi kuyruğa ekler ve iş kimliğini hemen döndürür."""
+    data = request.get_json()
+    if not data:
+        return jsonify({"status": "error", "message": "Invalid JSON data"}), 400
+    return submit_quote_job(data)
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def quote_job_status(job_id):
+    """İşin durumunu ve tamamlandıysa belge bağlantılarını döndürür."""
+    job = QUOTE_JOBS.status(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+    result = job.pop('result') or {}
+    if job['status'] == JOB_DONE:
+        job['quote_id'] = result.get('quote_id')
+        job['price_list_version'] = result.get('price_list_version')
+        job['documents'] = {name: f"/jobs/{job_id}/documents/{name}" for name in result.get('documents', [])}
+        deliveries = result.get('email_deliveries') or {}
+        job['email_deliveries'] = {
+            who: {"id": delivery_id, "status_url": f"/email-status/{delivery_id}"} if delivery_id else None
+            for who, delivery_id in deliveries.items()
+        }
+    return jsonify({"status": "success", "job": job}), 200
+
+@app.route('/jobs/<job_id>/documents/<document>', methods=['GET'])
+def quote_job_document(job_id, document):
+    """Tamamlanmış bir işin PDF belgesini diskten akıtır."""
+    job = QUOTE_JOBS.status(job_id)
+    if document not in DOCUMENT_FILENAMES or job is None or job['status'] != JOB_DONE:
+        return jsonify({"status": "error", "message": "Document not found"}), 404
+    path = QUOTE_JOBS.artifact_path(job_id, document)
+    if not os.path.exists(path):
+        return jsonify({"status": "error", "message": "Document expired"}), 404
+    as_attachment = request.args.get('download', '0') not in ('0', 'false', 'False')
+    return send_file(path, mimetype='application/pdf', as_attachment=as_attachment,
+                     download_name=f"{DOCUMENT_FILENAMES[document]}_{job_id[:12]}.pdf", max_age=0)
+
+def _admin_error():
+    """Yönetim isteği yetkisizse hata yanıtı, yetkiliyse None döndürür."""
+    if not ADMIN_TOKEN:
+        return jsonify({"status": "error", "message": "Admin endpoints disabled"}), 404
+    supplied = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(supplied.encode(), ADMIN_TOKEN.encode()):
+        return jsonify({"status": "error", "message": "Unauthorized"}), 401
+    return None
+
+@app.route('/admin/bulk-quotes', methods=['POST'])
+def create_bulk_quote_job():
+    """
+    CSV/XLSX tablosunu ('file' alanı) toplu teklif işi olarak kuyruğa alır. 'documents' alanı
+    virgülle ayrılmış belge türleridir (varsayılan: proposal; boş değer yalnızca özet üretir).
+    """
+    error = _admin_error()
+    if error:
+        return error
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        return jsonify({"status": "error", "message": "'file' alanında bir CSV/XLSX dosyası gönderilmelidir"}), 400
+    extension = os.path.splitext(upload.filename)[1].lower()
+    # Biçim (ve XLSX için openpyxl) burada denetlenir; iş kabul edilip arka planda başarısız olmaz.
+    try:
+        check_format(upload.filename)
+    except BulkQuoteError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    documents = tuple(d.strip() for d in request.form.get('documents', ','.join(DEFAULT_DOCUMENTS)).split(',') if d.strip())
+    unknown = [d for d in documents if d not in DOCUMENT_FILENAMES]
+    if unknown:
+        return jsonify({"status": "error", "message": f"Bilinmeyen belge türü: {', '.join(unknown)}"}), 400
+
+    # Yükleme diske akıtılır; iş bitince (veya reddedilirse) silinir.
+    input_path = os.path.join(BULK_UPLOADS_DIR, f"{uuid.uuid4().hex}{extension}")
+    upload.save(input_path)
+    try:
+        job_id = BULK_QUOTE_JOBS.submit({
+            'input_path': input_path,
+            'filename': upload.filename,
+            'documents': list(documents),
+        })
+    except QueueFullError as e:
+        os.remove(input_path)
+        response = jsonify({"status": "error", "message": f"Sunucu meşgul, lütfen daha sonra tekrar deneyin. ({e})"})
+        response.headers['Retry-After'] = '60'
+        return response, 429
+    return jsonify({
+        "status": "accepted",
+        "job_id": job_id,
+        "status_url": f"/admin/bulk-quotes/{job_id}",
+    }), 202
+
+@app.route('/admin/bulk-quotes/<job_id>', methods=['GET'])
+def bulk_quote_job_status(job_id):
+    """Toplu işin durumu ve ilerlemesi (işlenen satırlar, oluşturulan PDF'ler)."""
+    error = _admin_error()
+    if error:
+        return error
+    job = BULK_QUOTE_JOBS.status(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+    response = {
+        "status": job['status'],
+        "job_id": job_id,
+        "created_at": job['created_at'],
+        "finished_at": job['finished_at'],
+        "progress": read_progress_file(BULK_QUOTE_JOBS.artifact_path(job_id, 'progress', '.json')),
+    }
+    if job['status'] == JOB_DONE:
+        response["archive_url"] = f"/admin/bulk-quotes/{job_id}/archive"
+        response["summary_url"] = f"/admin/bulk-quotes/{job_id}/summary"
+    elif job['error']:
+        response["error"] = job['error']
+    return jsonify(response), 200
+
+@app.route('/admin/bulk-quotes/<job_id>/<artifact>', methods=['GET'])
+def bulk_quote_job_artifact(job_id, artifact):
+    """Biten toplu işin ZIP arşivini ('archive') veya özet CSV'sini ('summary') diskten akıtır."""
+    error = _admin_error()
+    if error:
+        return error
+    artifacts = {'archive': ('.zip', 'application/zip'), 'summary': ('.csv', 'text/csv')}
+    job = BULK_QUOTE_JOBS.status(job_id)
+    if artifact not in artifacts or job is None or job['status'] != JOB_DONE:
+        return jsonify({"status": "error", "message": "Not found"}), 404
+    suffix, mimetype = artifacts[artifact]
+    path = BULK_QUOTE_JOBS.artifact_path(job_id, artifact, suffix)
+    if not os.path.exists(path):
+        return jsonify({"status": "error", "message": "Archive expired"}), 404
+    return send_file(path, mimetype=mimetype, as_attachment=True,
+                     download_name=f"bulk_quotes_{job_id[:12]}_{artifact}{suffix}", max_age=0)
+
+def _archive_time(value, name):
+    """Tarih filtresi: Unix zaman damgası veya ISO tarih/saat (2026-10-01, 2026-10-01T12:00)."""
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"{name}: geçersiz tarih ({value})")
+
+def _archive_number(value, name):
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name}: geçersiz sayı ({value})")
+
+@app.route('/admin/quotes', methods=['GET'])
+def archived_quotes():
+    """
+    Arşivlenmiş teklifleri en yeniden eskiye listeler. Filtreler: email, name (ad başlangıcı),
+    from/to (tarih), min_total/max_total, config (yapılandırma özeti), structure_type.
+    Sayfalama: limit ve önceki yanıttaki next_cursor değeri (cursor).
+    """
+    error = _admin_error()
+    if error:
+        return error
+    args = request.args
+    try:
+        page = QUOTE_ARCHIVE.search(
+            email=args.get('email'), name=args.get('name'),
+            created_from=_archive_time(args.get('from'), 'from'), created_to=_archive_time(args.get('to'), 'to'),
+            min_total=_archive_number(args.get('min_total'), 'min_total'),
+            max_total=_archive_number(args.get('max_total'), 'max_total'),
+            config_hash=args.get('config'), structure_type=args.get('structure_type'),
+            limit=int(args.get('limit', 50)), cursor=int(args['cursor']) if args.get('cursor') else None,
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"status": "success", **page}), 200
+
+@app.route('/admin/quotes/<int:archive_id>', methods=['GET'])
+def archived_quote(archive_id):
+    """Arşiv kaydının tamamı: girdiler, kalemler, finansal özet ve belgeler."""
+    error = _admin_error()
+    if error:
+        return error
+    record = QUOTE_ARCHIVE.get(archive_id)
+    if record is None:
+        return jsonify({"status": "error", "message": "Quote not found"}), 404
+    record["document_urls"] = {name: f"/admin/quotes/{archive_id}/documents/{name}"
+                               for name, info in record["documents"].items() if info["stored"]}
+    return jsonify({"status": "success", "quote": record}), 200
+
+@app.route('/admin/quotes/<int:archive_id>/documents/<document>', methods=['GET'])
+def archived_quote_document(archive_id, document):
+    """Arşivlenmiş bir teklifin PDF'ini akıtır (QUOTE_ARCHIVE_STORE_PDFS açıksa saklanır)."""
+    error = _admin_error()
+    if error:
+        return error
+    record = QUOTE_ARCHIVE.get(archive_id)
+    pdf_data = QUOTE_ARCHIVE.document(record["quote_id"], document) if record is not None else None
+    if pdf_data is None or document not in DOCUMENT_FILENAMES:
+        return jsonify({"status": "error", "message": "Document not found"}), 404
+    return stream_pdf(pdf_data, document_filename(document, record["customer_info"]))
+
+@app.route('/admin/price-list', methods=['GET'])
+def price_list_info():
+    """Geçerli fiyat listesinin sürümünü ve kaynağını döndürür."""
+    error = _admin_error()
+    if error:
+        return error
+    return jsonify({"status": "success", "price_list": PRICE_LISTS.current().describe()}), 200
+
+@app.route('/admin/price-list/reload', methods=['POST'])
+def reload_price_list():
+    """
+    Fiyat listesini yeniden yükler. Gövde boşsa PRICE_LIST_PATH dosyası okunur; gövdede
+    {"prices": {...}, "rates": {...}} varsa bu liste doğrulanıp devreye alınır.
+    """
+    error = _admin_error()
+    if error:
+        return error
+    data = request.get_json(silent=True)
+    try:
+        if data:
+            price_list = price_list_from_mapping(data)
+            previous = PRICE_LISTS.swap(price_list)
+        else:
+            previous = PRICE_LISTS.current()
+            price_list = PRICE_LISTS.reload()
+    except PriceListError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({
+        "status": "success",
+        "previous_version": previous.version,
+        "price_list": price_list.describe(),
+    }), 200
+
+@app.route('/health', methods=['GET'])
+def health():
+    """
+    Sağlık kontrolü: ağır kaynaklara dokunmadan hemen yanıt verir. 'ready' başlangıç
+    ısınmasının bitip bitmediğini gösterir; süreç ısınma sırasında da istek kabul eder.
+    """
+    return jsonify({
+        "status": "ok",
+        "ready": WARM_UP.is_ready(),
+        "uptime_seconds": round(time.time() - STARTED_AT, 3),
+        "price_list_version": PRICE_LISTS.current().version,
+        "warm_up": WARM_UP.describe(),
+    }), 200
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Ölçümleri Prometheus metin biçiminde döndürür (METRICS_ENABLED=0 ise 404)."""
+    if not METRICS.enabled:
+        return jsonify({"status": "error", "message": "Metrics disabled"}), 404
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=os.environ.get("PORT", 5000))
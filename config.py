@@ -1,7 +1,10 @@
 # config.py
 # Bu dosya, uygulamanın tüm sabitlerini ve yapılandırma sözlüklerini içerir.
 
+import os
 import re
+import json
+import hashlib
 
 # --- Görünmez Karakter Temizleme Fonksiyonu ---
 def clean_invisible_chars(text):
@@ -20,6 +23,43 @@ def clean_invisible_chars(text):
 # LOGO_URL'nin genel erişime açık bir URL olduğundan emin olun.
 LOGO_URL = "https://drive.google.com/uc?export=download&id=1RD27Gas035iUqe4Ucl3phFwxZPWfzlzn"
 
+# --- Logo Önbelleği Ayarları ---
+# LOGO_LOCAL_PATH ayarlanırsa logo ağdan değil bu dosyadan yüklenir.
+LOGO_LOCAL_PATH = os.environ.get("LOGO_LOCAL_PATH")
+# Önbellekteki logonun yeniden doğrulanmadan kullanılacağı süre (saniye).
+LOGO_CACHE_TTL_SECONDS = int(os.environ.get("LOGO_CACHE_TTL_SECONDS", 24 * 60 * 60))
+# Ağ erişimi olmadığında kullanılacak, yeniden boyutlandırılmış logonun disk kopyası.
+LOGO_CACHE_DISK_PATH = os.environ.get(
+    "LOGO_CACHE_DISK_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "logo.png")
+)
+LOGO_WIDTH_PX = 180
+
+# --- PDF Font Ayarları ---
+# TTF font dosyalarının aranacağı klasörler (os.pathsep ile ayrılmış). Önce projedeki 'fonts'
+# klasörü, sonra yaygın sistem font klasörleri denenir; Yunanca ve Türkçe karakterleri
+# kapsayan ilk font ailesi kullanılır, hiçbiri yoksa Helvetica'ya düşülür.
+PDF_FONT_DIRS = [d for d in os.environ.get("PDF_FONT_DIRS", os.pathsep.join([
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts"),
+    "/usr/share/fonts/truetype/freefont",
+    "/usr/share/fonts/truetype/dejavu",
+])).split(os.pathsep) if d]
+# Belgeler arasında tekrar kullanılan font alt kümelerinin (subset) en fazla sayısı.
+PDF_FONT_SUBSET_CACHE_SIZE = int(os.environ.get("PDF_FONT_SUBSET_CACHE_SIZE", 128))
+
+# --- Geçici Tampon (Spool) Ayarları ---
+# PDF çıktıları ve gönderimi bekleyen e-posta ekleri bu boyuta (bayt) kadar bellekte,
+# üzerindeyse PDF_SPOOL_DIR (boşsa sistemin geçici klasörü) altında geçici dosyada tutulur.
+PDF_SPOOL_MAX_BYTES = int(os.environ.get("PDF_SPOOL_MAX_BYTES", 256 * 1024))
+PDF_SPOOL_DIR = os.environ.get("PDF_SPOOL_DIR") or None
+
+# --- Belirlenimci PDF ve Şablon Sürümü ---
+# Açıkken PDF'ler sabit oluşturma tarihi ve içerikten türetilen belge kimliğiyle üretilir;
+# aynı girdiler bayt bayt aynı PDF'i verir (reportlab "invariant" kipi).
+PDF_DETERMINISTIC = os.environ.get("PDF_DETERMINISTIC", "1") not in ("0", "false", "False")
+# PDF şablonları (düzen, metinler, stiller) değiştiğinde artırılmalıdır; saklanan belgeler geçersiz olur.
+PDF_TEMPLATE_VERSION = os.environ.get("PDF_TEMPLATE_VERSION", "1")
+
 COMPANY_INFO = {
     "name": clean_invisible_chars("PREMIUM HOME LTD"),
     "address": clean_invisible_chars("Iasonos 1, 1082, Nicosia Cyprus"),
@@ -210,6 +250,143 @@ OSB_PANEL_AREA_M2 = 1.22 * 2.44
 GYPSUM_BOARD_UNIT_AREA_M2 = 2.88
 GLASS_WOOL_M2_PER_PACKET = 10.0
 
+# --- Fiyat Listesi Sürümü ---
+def default_price_rates():
+    """Fiyatı etkileyen oranların varsayılan değerleri (fiyat listesi dosyasında geçersiz kılınabilir)."""
+    return {
+        "fire_rate": FIRE_RATE,
+        "vat_rate": VAT_RATE,
+        "monthly_accounting_expenses": MONTHLY_ACCOUNTING_EXPENSES,
+        "monthly_office_rent": MONTHLY_OFFICE_RENT,
+    }
+
+def compute_price_list_version(prices=None, rates=None):
+    """
+    Fiyat listesinin ve fiyatı etkileyen oranların kısa bir özetini döndürür.
+    Önbelleğe alınan fiyat sonuçları bu sürüme bağlanır; fiyatlar değişince eski
+    sonuçlar kendiliğinden geçersiz olur.
+    """
+    payload = {"prices": FIYATLAR if prices is None else dict(prices)}
+    payload.update(default_price_rates() if rates is None else rates)
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+PRICE_LIST_VERSION = compute_price_list_version()
+
+# --- Fiyat Listesi Dosyası Ayarları ---
+# Ayarlanırsa fiyatlar FIYATLAR yerine bu dosyadan (JSON, CSV veya YAML) okunur.
+PRICE_LIST_PATH = os.environ.get("PRICE_LIST_PATH")
+# Dosya değişiklikleri bu aralıkla (saniye) kontrol edilir ve yeni fiyatlar çalışırken yüklenir; 0 ise kapalı.
+PRICE_LIST_WATCH_SECONDS = float(os.environ.get("PRICE_LIST_WATCH_SECONDS", 30))
+# Yönetim uç noktaları (/admin/...) için gizli anahtar; boşsa bu uç noktalar kapalıdır.
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+# --- Teklif Önbelleği Ayarları ---
+# Aynı proje bilgileriyle tekrar gönderilen formlar için fiyat sonuçları ve PDF'ler önbellekten döner.
+QUOTE_CACHE_ENABLED = os.environ.get("QUOTE_CACHE_ENABLED", "1") not in ("0", "false", "False")
+QUOTE_CACHE_MAX_ENTRIES = int(os.environ.get("QUOTE_CACHE_MAX_ENTRIES", 1024))
+QUOTE_CACHE_MAX_BYTES = int(os.environ.get("QUOTE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+# Ayarlanırsa önbellek ayrıca bu dizine yazılır (yeniden başlatmalar arasında korunur).
+QUOTE_CACHE_DIR = os.environ.get("QUOTE_CACHE_DIR")
+QUOTE_CACHE_DISK_MAX_BYTES = int(os.environ.get("QUOTE_CACHE_DISK_MAX_BYTES", 512 * 1024 * 1024))
+
+# --- Asenkron Teklif İşleri Ayarları ---
+# İşler ve oluşturulan PDF'ler bu dizinde saklanır (SQLite); yeniden başlatmada kaldığı yerden sürer.
+QUOTE_JOBS_DIR = os.environ.get(
+    "QUOTE_JOBS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "jobs")
+)
+QUOTE_JOB_WORKERS = int(os.environ.get("QUOTE_JOB_WORKERS", 2))
+# Bu kadar iş beklerken gelen yeni işler HTTP 429 ile reddedilir.
+QUOTE_JOB_MAX_PENDING = int(os.environ.get("QUOTE_JOB_MAX_PENDING", 50))
+# Çalışırken süreci çöken bir iş en fazla bu kadar denenir.
+QUOTE_JOB_MAX_ATTEMPTS = int(os.environ.get("QUOTE_JOB_MAX_ATTEMPTS", 3))
+# Bu süreden uzun 'running' kalan işler terk edilmiş sayılır ve yeniden sıraya alınır (saniye).
+QUOTE_JOB_LEASE_SECONDS = int(os.environ.get("QUOTE_JOB_LEASE_SECONDS", 300))
+# Biten işler ve PDF'leri bu süre sonunda silinir (saniye).
+QUOTE_JOB_RETENTION_SECONDS = int(os.environ.get("QUOTE_JOB_RETENTION_SECONDS", 7 * 24 * 60 * 60))
+
+# --- Toplu Teklif (CSV/XLSX) Ayarları ---
+# Yüklenen tablolar, ZIP arşivleri ve özet CSV'leri bu dizinde saklanır.
+BULK_QUOTE_DIR = os.environ.get(
+    "BULK_QUOTE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "bulk")
+)
+# Bir tabloda en fazla bu kadar satır işlenir; fazlası reddedilir.
+BULK_QUOTE_MAX_ROWS = int(os.environ.get("BULK_QUOTE_MAX_ROWS", 1000))
+# Toplu işlerde PDF'leri oluşturan süreç sayısı (0: süreç havuzu kullanılmaz).
+BULK_QUOTE_RENDER_WORKERS = int(os.environ.get("BULK_QUOTE_RENDER_WORKERS", 2))
+# Bu kadar toplu iş beklerken gelen yeni yüklemeler HTTP 429 ile reddedilir.
+BULK_QUOTE_MAX_PENDING = int(os.environ.get("BULK_QUOTE_MAX_PENDING", 5))
+# Biten toplu işlerin arşivleri bu süre sonunda silinir (saniye).
+BULK_QUOTE_RETENTION_SECONDS = int(os.environ.get("BULK_QUOTE_RETENTION_SECONDS", 2 * 24 * 60 * 60))
+
+# --- Teklif Arşivi Ayarları ---
+# Oluşturulan her teklif (girdiler, kalemler, finansal özet) yerel bir SQLite arşivine yazılır; 0 ile kapatılır.
+QUOTE_ARCHIVE_ENABLED = os.environ.get("QUOTE_ARCHIVE_ENABLED", "1") not in ("0", "false", "False")
+QUOTE_ARCHIVE_PATH = os.environ.get(
+    "QUOTE_ARCHIVE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "archive", "quotes.sqlite3")
+)
+# PDF'ler de (sıkıştırılmış olarak) arşivlensin mi? Kapalıyken yalnızca boyut ve özetleri yazılır.
+QUOTE_ARCHIVE_STORE_PDFS = os.environ.get("QUOTE_ARCHIVE_STORE_PDFS", "0") not in ("0", "false", "False")
+# Kayıtlar arka planda toplu yazılır: en fazla bu kadar kayıt veya bu kadar saniyede bir işlem (transaction).
+QUOTE_ARCHIVE_BATCH_SIZE = int(os.environ.get("QUOTE_ARCHIVE_BATCH_SIZE", 100))
+QUOTE_ARCHIVE_FLUSH_SECONDS = float(os.environ.get("QUOTE_ARCHIVE_FLUSH_SECONDS", 1.0))
+# Yazılmayı bekleyen kayıt sınırı; aşılırsa yeni kayıtlar atılır (istekler hiçbir zaman beklemez).
+QUOTE_ARCHIVE_MAX_QUEUE = int(os.environ.get("QUOTE_ARCHIVE_MAX_QUEUE", 10000))
+
+# --- PDF Belge Deposu Ayarları ---
+# Oluşturulan PDF'ler (belge türü, girdiler, fiyat listesi ve şablon sürümünün özetiyle anahtarlanarak)
+# sıkıştırılmış olarak bu dizinde saklanır; aynı belge yeniden istendiğinde oluşturulmaz. 0 ile kapatılır.
+ARTIFACT_STORE_ENABLED = os.environ.get("ARTIFACT_STORE_ENABLED", "1") not in ("0", "false", "False")
+ARTIFACT_STORE_DIR = os.environ.get(
+    "ARTIFACT_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "artifacts")
+)
+# Toplam boyut (bayt) aşılınca en uzun süredir kullanılmayan belgeler silinir.
+ARTIFACT_STORE_MAX_BYTES = int(os.environ.get("ARTIFACT_STORE_MAX_BYTES", 1024 * 1024 * 1024))
+# zlib sıkıştırma düzeyi (1: hızlı, 9: en küçük).
+ARTIFACT_STORE_COMPRESSION_LEVEL = int(os.environ.get("ARTIFACT_STORE_COMPRESSION_LEVEL", 6))
+
+# --- Anlık Fiyat Önizleme (/quote/preview) Ayarları ---
+# Form oturumları bellekte tutulur; en fazla bu kadar oturum saklanır (en eski kullanılan atılır).
+QUOTE_SESSION_MAX_SESSIONS = int(os.environ.get("QUOTE_SESSION_MAX_SESSIONS", 1000))
+# Bu süre (saniye) boyunca güncellenmeyen oturumlar silinir.
+QUOTE_SESSION_TTL_SECONDS = int(os.environ.get("QUOTE_SESSION_TTL_SECONDS", 30 * 60))
+
+# --- Başlangıç Isınması ---
+# Ağır modüller (pandas, reportlab, PIL) ilk kullanımda yüklenir. Sunucu trafik almaya başladıktan
+# sonra (ilk istekte) fontlar, stiller ve bu modüller arka planda önceden yüklenir; 0 ile kapatılır.
+WARM_UP_ENABLED = os.environ.get("WARM_UP_ENABLED", "1") not in ("0", "false", "False")
+# İş kuyruğu çalışanları ve fiyat listesi izleyicisi içe aktarmada başlatılsın mı? gunicorn (preload_app)
+# bunu kapatır ve iş parçacıklarını her çalışan süreçte çatallanmadan (fork) sonra başlatır.
+BACKGROUND_SERVICES_AUTOSTART = os.environ.get("BACKGROUND_SERVICES_AUTOSTART", "1") not in ("0", "false", "False")
+
+# --- Üretim Sunucusu (gunicorn) Ayarları ---
+# gunicorn.conf.py bu değerleri kullanır. Varsayılan tek çalışan süreç + iş parçacıklarıdır: anlık
+# önizleme oturumları (QUOTE_SESSIONS), e-posta teslimat durumları (EMAIL_QUEUE) ve gövdeyle
+# yüklenen fiyat listeleri süreç belleğindedir ve süreçler arasında paylaşılmaz. PDF'leri çekirdekler
+# arasında paralel oluşturmak için PDF_RENDER_WORKERS kullanılır. WEB_CONCURRENCY > 1 yalnızca
+# /quote/preview ve /email-status kullanılmıyorsa ve fiyat listesi dosyadan yönetiliyorsa güvenlidir.
+SERVER_BIND = os.environ.get("SERVER_BIND", f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+SERVER_WORKERS = int(os.environ.get("WEB_CONCURRENCY", 1))
+SERVER_THREADS = int(os.environ.get("SERVER_THREADS", 4))
+# Bu süre (saniye) boyunca yanıt vermeyen çalışan yeniden başlatılır; uzun PDF'ler için yüksek tutulur.
+SERVER_TIMEOUT = int(os.environ.get("SERVER_TIMEOUT", 120))
+# Yeniden başlatmada (HUP, kod güncellemesi) süren isteklerin bitmesi için beklenen süre (saniye).
+SERVER_GRACEFUL_TIMEOUT = int(os.environ.get("SERVER_GRACEFUL_TIMEOUT", 60))
+SERVER_KEEPALIVE = int(os.environ.get("SERVER_KEEPALIVE", 5))
+# Bellek parçalanmasına karşı her çalışan bu kadar istekten sonra (rastgele sapmayla) yenilenir; 0: kapalı.
+SERVER_MAX_REQUESTS = int(os.environ.get("SERVER_MAX_REQUESTS", 1000))
+SERVER_MAX_REQUESTS_JITTER = int(os.environ.get("SERVER_MAX_REQUESTS_JITTER", 100))
+
+# --- Ölçüm (Metrics) Ayarları ---
+# Aşama süreleri ve sayaçlar /metrics üzerinden sunulur; METRICS_ENABLED=0 ile kapatılır.
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") not in ("0", "false", "False")
+# Her istek için tek satırlık JSON günlük kaydı yazılsın mı?
+METRICS_LOG_REQUESTS = os.environ.get("METRICS_LOG_REQUESTS", "1") not in ("0", "false", "False")
+
 # --- PDF Metinleri için Çeviri Sözlüğü ---
 # Bu sözlük, PDF metinlerinin tek bir yerden yönetilmesini sağlar.
 # Anahtar: İngilizce metin
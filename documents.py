@@ -0,0 +1,79 @@
+# documents.py
+# Bu dosya, bir teklifin PDF belgelerini (müşteri teklifi, iç maliyet raporu, satış sözleşmesi)
+# oluşturmak için gereken render işlerini ve belge dosya adlarını içerir. API, asenkron işler
+# ve toplu teklifler (bulk_quotes) aynı tanımları kullanır.
+
+from datetime import date
+
+from config import COMPANY_INFO
+from utils import clean_invisible_chars, calculate_project_areas
+
+# İndirilebilir belgeler ve dosya adı önekleri
+DOCUMENT_FILENAMES = {
+    'proposal': 'Customer_Proposal',
+    'internal': 'Internal_Report',
+    'contract': 'Sales_Contract',
+}
+
+
+def document_filename(document, customer_info):
+    """Belgenin müşteri adını içeren indirme/ek dosya adı."""
+    return f"{DOCUMENT_FILENAMES[document]}_{clean_invisible_chars(customer_info.get('name', 'General')).replace(' ', '_')}.pdf"
+
+
+def quote_document_date():
+    """Belgelere basılan teklif tarihi (bugün, gg/aa/yyyy)."""
+    return date.today().strftime('%d/%m/%Y')
+
+
+def build_document_jobs(results, project_details, customer_info, logo_data_b64, document_date=None):
+    """
+    Bir teklifin üç PDF belgesi için render işlerini döndürür:
+    {belge_adı: (oluşturucu_adı, argüman_demeti)}.
+    Belgeye basılan tarih `document_date` ile verilir (varsayılan: bugün); böylece aynı girdiler
+    aynı gün içinde aynı PDF'i üretir.
+    """
+    # Teklif şablonları hesaplanan bazı değerleri proje bilgilerinden okur. Fiyatlar ve teslim
+    # süresi her zaman hesaplama sonuçlarından alınır (istemcinin gönderdiği değerler PDF'e
+    # basılmaz); alan yalnızca istemci göndermediyse hesaplanır.
+    document_details = dict(project_details)
+    document_details['document_date'] = document_date or quote_document_date()
+    document_details.setdefault('area', calculate_project_areas(project_details)['floor'])
+    document_details['solar_price'] = results['solar_sales_price']
+    document_details['aether_package_sales_price'] = results['aether_package_sales_price']
+    document_details['delivery_duration_business_days'] = results['delivery_duration_business_days']
+
+    proposal_args = (
+        results['house_sales_price'],
+        results['solar_sales_price'],
+        results['aether_package_sales_price'],
+        results['total_sales_price'],
+        document_details,
+        customer_info,
+        results['extra_expenses_info'],
+        logo_data_b64
+    )
+    return {
+        'internal': ('create_internal_cost_report_pdf', (
+            results['costs_df'],
+            results['financial_summary'],
+            results['profile_analysis_df'],
+            document_details,
+            customer_info,
+            logo_data_b64
+        )),
+        'proposal': (
+            'create_customer_proposal_pdf_tr' if project_details.get('pdf_language', 'tr') == 'tr' else 'create_customer_proposal_pdf_en_gr',
+            proposal_args
+        ),
+        'contract': ('create_sales_contract_pdf', (
+            customer_info,
+            results['house_sales_price'],
+            results['solar_sales_price'],
+            results['aether_package_sales_price'],
+            document_details,
+            COMPANY_INFO,
+            results['extra_expenses_info'],
+            logo_data_b64
+        )),
+    }
@@ -0,0 +1,334 @@
+# email_queue.py
+# Bu dosya, teklif e-postalarını HTTP isteğinden bağımsız olarak arka planda gönderen
+# teslimat kuyruğunu içerir. Her çalışan iş parçacığı kalıcı bir SMTP bağlantısı tutar
+# (STARTTLS ve oturum açma yalnızca bağlantı kurulurken yapılır), geçici hatalarda
+# üstel bekleme ile yeniden dener ve her gönderimin durumunu sorgulanabilir şekilde saklar.
+# Mesajlar bellekte tek parça metin olarak (as_string) oluşturulmaz: MIME iskeleti küçük bir
+# bayt dizisi olarak üretilir, PDF eki base64 satırları halinde parça parça SMTP'ye akıtılır.
+# Gönderimi bekleyen ekler eşik üzerinde diske taşan tamponlarda (spool) tutulur.
+
+import io
+import re
+import time
+import uuid
+import queue
+import base64
+import smtplib
+import threading
+from collections import OrderedDict
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.mime.base import MIMEBase
+from email.generator import BytesGenerator
+from email.policy import compat32
+from email import encoders
+
+from spool import iter_chunks, spool_bytes
+
+# Teslimat durumları
+STATUS_QUEUED = "queued"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+
+def build_email_message(sender, to_address, subject, body, pdf_data, pdf_filename):
+    """
+    PDF ekli bir MIME e-posta mesajı oluşturur. Mesajın tamamı bellekte tutulur; gönderim
+    için iter_email_message/send_streaming kullanılır.
+    """
+    msg = MIMEMultipart()
+    msg['From'] = sender
+    msg['To'] = to_address
+    msg['Subject'] = subject
+
+    msg.attach(MIMEText(body, 'html'))
+
+    # PDF dosyasını ek olarak ekle
+    part = MIMEBase('application', 'octet-stream')
+    part.set_payload(pdf_data)
+    encoders.encode_base64(part)
+    part.add_header('Content-Disposition', f"attachment; filename= {pdf_filename}")
+    msg.attach(part)
+    return msg
+
+
+# SMTP satır sonu (CRLF) ile üretim; başlıklar ve gövde build_email_message ile aynıdır.
+_SMTP_POLICY = compat32.clone(linesep="\r\n")
+# base64 satırı 76 karakterdir (57 bayt); parçalar satır sınırına denk gelsin diye 57'nin katıdır.
+_BASE64_CHUNK_SIZE = 57 * 1024
+_DOT_AT_LINE_START = re.compile(rb"(?m)^\.")
+
+
+def iter_email_message(sender, to_address, subject, body, attachment, attachment_filename):
+    """
+    build_email_message ile aynı MIME mesajını SMTP'ye hazır (CRLF) bayt parçaları halinde üretir.
+    `attachment` bayt dizisi veya ikili dosya nesnesi olabilir; eki base64'e parça parça çevirir,
+    böylece mesajın tamamı (ve ekin base64 kopyası) hiçbir zaman bellekte tutulmaz.
+    Her parça satır başında başlar ve CRLF ile biter.
+    """
+    placeholder = f"ATTACHMENT-{uuid.uuid4().hex}"
+    msg = MIMEMultipart()
+    msg['From'] = sender
+    msg['To'] = to_address
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'html'))
+    part = MIMEBase('application', 'octet-stream')
+    part.set_payload(placeholder)
+    part['Content-Transfer-Encoding'] = 'base64'
+    part.add_header('Content-Disposition', f"attachment; filename= {attachment_filename}")
+    msg.attach(part)
+
+    skeleton = io.BytesIO()
+    BytesGenerator(skeleton, mangle_from_=False, policy=_SMTP_POLICY).flatten(msg)
+    head, tail = skeleton.getvalue().split(placeholder.encode("ascii"), 1)
+    yield head
+    for chunk in iter_chunks(attachment, _BASE64_CHUNK_SIZE):
+        yield base64.encodebytes(chunk).replace(b"\n", b"\r\n")
+    yield tail if tail.endswith(b"\r\n") else tail + b"\r\n"
+
+
+def send_streaming(server, sender, to_address, chunks):
+    """
+    SMTP DATA komutunu mesajı parça parça göndererek uygular (smtplib.sendmail'in akışlı
+    karşılığı). `chunks` satır başında başlayan CRLF'li bayt parçalarıdır; satır başındaki
+    noktalar SMTP kuralına göre ikilenir.
+    """
+    server.ehlo_or_helo_if_needed()
+    code, response = server.mail(sender)
+    if code != 250:
+        server.rset()
+        raise smtplib.SMTPSenderRefused(code, response, sender)
+    code, response = server.rcpt(to_address)
+    if code not in (250, 251):
+        server.rset()
+        raise smtplib.SMTPRecipientsRefused({to_address: (code, response)})
+    code, response = server.docmd("data")
+    if code != 354:
+        server.rset()
+        raise smtplib.SMTPDataError(code, response)
+    for chunk in chunks:
+        server.send(_DOT_AT_LINE_START.sub(b"..", chunk))
+    server.send(b".\r\n")
+    code, response = server.getreply()
+    if code != 250:
+        if code != 421:
+            server.rset()
+        raise smtplib.SMTPDataError(code, response)
+
+
+class SMTPSettings:
+    """SMTP bağlantı ayarları. Kullanıcı adı boşsa oturum açılmaz (yerel test sunucuları için)."""
+
+    def __init__(self, server, port, username=None, password=None, sender=None, use_tls=True, timeout=30):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender or username
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    def is_complete(self):
+        if not (self.server and self.port and self.sender):
+            return False
+        return not self.username or bool(self.password)
+
+
+class SMTPSession:
+    """Tek bir kalıcı SMTP bağlantısı; kopmuşsa bir sonraki gönderimde yeniden kurulur."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._server = None
+
+    def _connect(self):
+        server = smtplib.SMTP(self.settings.server, self.settings.port, timeout=self.settings.timeout)
+        if self.settings.use_tls:
+            server.starttls()
+        if self.settings.username:
+            server.login(self.settings.username, self.settings.password)
+        self._server = server
+
+    def _is_alive(self):
+        try:
+            return self._server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    def send(self, to_address, subject, body, attachment, attachment_filename):
+        """PDF ekli e-postayı mesajı bellekte birleştirmeden gönderir."""
+        if self._server is None or not self._is_alive():
+            self.close()
+            self._connect()
+        chunks = iter_email_message(self.settings.sender, to_address, subject, body, attachment, attachment_filename)
+        send_streaming(self._server, self.settings.sender, to_address, chunks)
+
+    def close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._server = None
+
+
+def _is_permanent_error(error):
+    """Yeniden denemenin anlamsız olduğu (5xx, reddedilen alıcı) hataları ayırt eder."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+class EmailDeliveryQueue:
+    """
+    Arka plan e-posta teslimat kuyruğu.
+    submit() bir teslimat kimliği döndürür; status() ile sonuç sorgulanır.
+    """
+
+    def __init__(self, settings, workers=1, max_retries=3, backoff_base=1.0, max_backoff=30.0,
+                 idle_timeout=60.0, max_tracked=10000, on_finished=None):
+        self.settings = settings
+        # Teslimat sonuçlandığında (sent/failed) durum kaydının kopyasıyla çağrılır.
+        self.on_finished = on_finished
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.idle_timeout = idle_timeout
+        self.max_tracked = max_tracked
+        self._queue = queue.Queue()
+        self._statuses = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Çalışan iş parçacıklarını başlatır (birden çok çağrı güvenlidir)."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"email-delivery-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, to_address, subject, body, pdf_data, pdf_filename):
+        """
+        E-postayı kuyruğa ekler ve teslimat kimliğini döndürür. PDF, gönderilene kadar
+        eşik üzerinde diske taşan bir tamponda tutulur (SMTP yavaşken kuyruk belleği doldurmaz).
+        """
+        self.start()
+        delivery_id = uuid.uuid4().hex
+        with self._lock:
+            self._statuses[delivery_id] = {
+                "id": delivery_id,
+                "to": to_address,
+                "subject": subject,
+                "status": STATUS_QUEUED,
+                "attempts": 0,
+                "error": None,
+                "queued_at": time.time(),
+                "finished_at": None,
+            }
+            self._trim_statuses()
+        self._queue.put((delivery_id, to_address, subject, body, spool_bytes(pdf_data), pdf_filename))
+        return delivery_id
+
+    def status(self, delivery_id):
+        """Teslimat durumunun bir kopyasını döndürür; bilinmeyen kimlik için None."""
+        with self._lock:
+            entry = self._statuses.get(delivery_id)
+            return dict(entry) if entry else None
+
+    def pending(self):
+        """Kuyrukta gönderilmeyi bekleyen e-posta sayısı (yaklaşık)."""
+        return self._queue.qsize()
+
+    def wait(self, delivery_ids, timeout=None):
+        """Verilen teslimatlar tamamlanana kadar bekler (testler ve toplu işler için)."""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            statuses = [self.status(d) for d in delivery_ids]
+            if all(s and s["status"] in (STATUS_SENT, STATUS_FAILED) for s in statuses):
+                return statuses
+            if deadline is not None and time.time() >= deadline:
+                return statuses
+            time.sleep(0.02)
+
+    def shutdown(self, wait=True):
+        """Kuyruktaki işleri bitirip çalışanları durdurur."""
+        if wait:
+            self._queue.join()
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    # --- İç Yardımcılar ---
+    def _update(self, delivery_id, **fields):
+        with self._lock:
+            entry = self._statuses.get(delivery_id)
+            if entry:
+                entry.update(fields)
+                entry = dict(entry)
+        if entry and self.on_finished is not None and fields.get("status") in (STATUS_SENT, STATUS_FAILED):
+            try:
+                self.on_finished(entry)
+            except Exception as e:
+                print(f"UYARI: E-posta teslimat bildirimi başarısız: {e}")
+
+    def _trim_statuses(self):
+        # En eski tamamlanmış kayıtları at; bekleyenlere dokunma.
+        while len(self._statuses) > self.max_tracked:
+            for key, entry in self._statuses.items():
+                if entry["status"] in (STATUS_SENT, STATUS_FAILED):
+                    del self._statuses[key]
+                    break
+            else:
+                return
+
+    def _worker(self):
+        session = SMTPSession(self.settings)
+        try:
+            while not self._stop.is_set():
+                try:
+                    job = self._queue.get(timeout=self.idle_timeout)
+                except queue.Empty:
+                    # Boşta kalan bağlantıyı sunucu kapatmadan önce biz kapatalım.
+                    session.close()
+                    continue
+                try:
+                    self._deliver(session, *job)
+                finally:
+                    job[4].close()  # ek tamponu (ve varsa geçici dosyası)
+                    self._queue.task_done()
+        finally:
+            session.close()
+
+    def _deliver(self, session, delivery_id, to_address, subject, body, attachment, attachment_filename):
+        attempt = 0
+        while True:
+            attempt += 1
+            self._update(delivery_id, status=STATUS_SENDING, attempts=attempt)
+            try:
+                session.send(to_address, subject, body, attachment, attachment_filename)
+                self._update(delivery_id, status=STATUS_SENT, error=None, finished_at=time.time())
+                return
+            except Exception as e:
+                session.close()
+                if _is_permanent_error(e) or attempt > self.max_retries:
+                    print(f"E-posta gönderme hatası: {e}")
+                    self._update(delivery_id, status=STATUS_FAILED, error=str(e), finished_at=time.time())
+                    return
+                delay = min(self.backoff_base * (2 ** (attempt - 1)), self.max_backoff)
+                self._update(delivery_id, status=STATUS_QUEUED, error=str(e))
+                if self._stop.wait(delay):
+                    self._update(delivery_id, status=STATUS_FAILED, error="Kuyruk durduruldu", finished_at=time.time())
+                    return
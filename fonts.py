@@ -0,0 +1,165 @@
+# fonts.py
+# Bu dosya, PDF belgelerinde kullanılan TrueType font ailesini süreç başına bir kez kaydeden
+# font yöneticisini içerir. Aday aileler sırayla aranır; Yunanca ve Türkçe karakterleri (ve
+# €, ² gibi simgeleri) kapsamayan fontlar atlanır. Ayrıştırılmış TTFont nesneleri ve
+# belgelere gömülen font alt kümeleri (subset) önbellekte tutulur; böylece her PDF'te font
+# dosyaları yeniden okunmaz. Uygun font yoksa Helvetica'ya açıkça düşülür ve bu durum
+# ölçümlere (pdf_font_fallback_total) yazılır. reportlab yalnızca kayıt sırasında yüklenir.
+
+import os
+import threading
+from collections import OrderedDict
+
+from config import PDF_FONT_DIRS, PDF_FONT_SUBSET_CACHE_SIZE
+from metrics import METRICS
+
+FALLBACK_FONT = "Helvetica"
+
+# (aile adı, normal dosya, kalın dosya); sırayla denenir. Kalın yüz "<aile>-Bold" adıyla kaydedilir.
+FONT_FAMILIES = (
+    ("FreeSans", "FreeSans.ttf", "FreeSansBold.ttf"),
+    ("DejaVuSans", "DejaVuSans.ttf", "DejaVuSans-Bold.ttf"),
+)
+
+# Teklif metinlerinde geçen ve fontta bulunması gereken karakterler
+REQUIRED_GLYPHS = {
+    "turkish": "çğıöşüÇĞİÖŞÜ",
+    "greek": "ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩαβγδεζηθικλμνξοπρσςτυφχψωάέήίόύώΆΈΉΊΌΎΏ",
+    "symbols": "€²",
+}
+
+METRICS.describe("pdf_font_family", "gauge", "PDF'lerde kullanılan font ailesi (1 = etkin).")
+METRICS.describe("pdf_font_fallback_total", "counter", "Uygun TTF font bulunamadığı için Helvetica'ya düşme sayısı.")
+
+
+def missing_glyphs(font, required=REQUIRED_GLYPHS):
+    """Fontta karşılığı olmayan karakterleri {yazı sistemi: karakterler} olarak döndürür."""
+    char_to_glyph = font.face.charToGlyph
+    missing = {}
+    for script, chars in required.items():
+        absent = "".join(char for char in chars if ord(char) not in char_to_glyph)
+        if absent:
+            missing[script] = absent
+    return missing
+
+
+class FontManager:
+    """
+    PDF font ailesini bir kez seçip kaydeder. register() süreç (veya render havuzu çalışanı)
+    başına bir kez font dosyalarını okur; sonraki çağrılar kayıtlı aile adını döndürür.
+    """
+
+    def __init__(self, search_dirs, families=FONT_FAMILIES, subset_cache_size=128):
+        self.search_dirs = list(search_dirs)
+        self.families = families
+        self.subset_cache_size = subset_cache_size
+        self.family = None
+        self.fallback_reason = None
+        self.skipped = {}
+        self.subset_hits = 0
+        self.subset_misses = 0
+        self._fonts = {}
+        self._subsets = OrderedDict()
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_config(cls):
+        return cls(PDF_FONT_DIRS, subset_cache_size=PDF_FONT_SUBSET_CACHE_SIZE)
+
+    @property
+    def bold(self):
+        """Kalın yüzün kayıtlı adı (ör. "FreeSans-Bold" veya "Helvetica-Bold")."""
+        return f"{self.register()}-Bold"
+
+    def register(self):
+        """Font ailesini kaydeder (ilk çağrıda) ve PDF'lerde kullanılacak aile adını döndürür."""
+        if self.family is None:
+            with self._lock:
+                if self.family is None:
+                    self.family = self._register_first_available()
+        return self.family
+
+    def load(self, name, path):
+        """Font dosyasını ayrıştırır; aynı dosya için önbellekteki TTFont nesnesini döndürür."""
+        from reportlab.pdfbase.ttfonts import TTFont
+        key = (name, path)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is None:
+                font = TTFont(name, path)
+                make_subset = font.face.makeSubset
+                font.face.makeSubset = lambda subset: self._subset(path, make_subset, subset)
+                self._fonts[key] = font
+            return font
+
+    def describe(self):
+        return {
+            "family": self.family,
+            "fallback_reason": self.fallback_reason,
+            "skipped": dict(self.skipped),
+            "subset_cache": {"entries": len(self._subsets), "hits": self.subset_hits, "misses": self.subset_misses},
+        }
+
+    def _find(self, filename):
+        for directory in self.search_dirs:
+            path = os.path.join(directory, filename)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _register_first_available(self):
+        from reportlab.pdfbase import pdfmetrics
+        for family, regular_file, bold_file in self.families:
+            regular_path, bold_path = self._find(regular_file), self._find(bold_file)
+            if regular_path is None or bold_path is None:
+                self.skipped[family] = "not_found"
+                continue
+            try:
+                fonts = [self.load(family, regular_path), self.load(f"{family}-Bold", bold_path)]
+            except Exception as e:
+                print(f"UYARI: {family} font dosyası okunamadı: {e}")
+                self.skipped[family] = "error"
+                continue
+            missing = {}
+            for font in fonts:
+                for script, chars in missing_glyphs(font).items():
+                    missing[script] = "".join(sorted(set(missing.get(script, "") + chars)))
+            if missing:
+                print(f"UYARI: {family} fontunda eksik karakterler var, atlanıyor: {missing}")
+                self.skipped[family] = "missing_glyphs"
+                continue
+            for font in fonts:
+                pdfmetrics.registerFont(font)
+            pdfmetrics.registerFontFamily(family, normal=family, bold=f"{family}-Bold")
+            METRICS.set("pdf_font_family", 1, {"family": family})
+            print(f"INFO: PDF fontu yüklendi: {family} ({os.path.dirname(regular_path)})")
+            return family
+
+        reasons = set(self.skipped.values())
+        self.fallback_reason = next((r for r in ("missing_glyphs", "error") if r in reasons), "not_found")
+        METRICS.inc("pdf_font_fallback_total", {"reason": self.fallback_reason})
+        METRICS.set("pdf_font_family", 1, {"family": FALLBACK_FONT})
+        print(f"UYARI: Yunanca/Türkçe karakterleri kapsayan TTF font bulunamadı ({self.fallback_reason}). "
+              f"{FALLBACK_FONT} kullanılacak; bu karakterler PDF'lerde görünmeyebilir.")
+        return FALLBACK_FONT
+
+    def _subset(self, path, make_subset, subset):
+        # reportlab her belge için kullanılan karakterlerin alt kümesini fonttan yeniden üretir;
+        # aynı karakter kümesi (statik metinler, aynı dildeki teklifler) tekrar kullanılır.
+        key = (path, tuple(subset))
+        with self._lock:
+            data = self._subsets.get(key)
+            if data is not None:
+                self._subsets.move_to_end(key)
+                self.subset_hits += 1
+                return data
+        data = make_subset(subset)
+        with self._lock:
+            self.subset_misses += 1
+            self._subsets[key] = data
+            while len(self._subsets) > self.subset_cache_size:
+                self._subsets.popitem(last=False)
+        return data
+
+
+FONTS = FontManager.from_config()
@@ -0,0 +1,68 @@
+# gunicorn.conf.py
+# Bu dosya, API'nin üretim sunucusu (gunicorn) ayarlarını ve süreç kancalarını içerir.
+#
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Uygulama ana süreçte bir kez yüklenir (preload_app); fontlar, stiller, pandas, fiyat listesi ve
+# logo çatallanmadan (fork) önce hazırlanır ve çalışan süreçler bunları yazma anında kopyalama
+# (copy-on-write) ile paylaşır. İş parçacıkları (iş kuyruğu, fiyat listesi izleyicisi) çatallanmaya
+# dayanmadığından ana süreçte değil, her çalışanda çatallanmadan sonra başlatılır.
+#
+# Varsayılan olarak tek çalışan süreç (çok iş parçacıklı) çalışır: önizleme oturumları, e-posta
+# teslimat durumları ve /admin/price-list/reload ile gövdeden yüklenen fiyat listesi süreç
+# belleğindedir. Birden çok çalışanda (WEB_CONCURRENCY > 1) bu istekler başka bir sürece düşerse
+# 404 alınır veya süreçler farklı fiyat verir (bkz. config.py, SERVER_WORKERS).
+#
+# Fiyat listesi değişiklikleri: her çalışan PRICE_LIST_PATH dosyasını izler ve yeni listeyi
+# istekleri kesmeden devreye alır. Ana süreç her yeni çalışanı oluşturmadan önce dosyayı yeniden
+# okur; böylece yenilenen (max_requests) veya `kill -HUP <ana süreç>` ile kademeli olarak yeniden
+# başlatılan çalışanlar her zaman güncel listeyle başlar.
+
+import os
+import gc
+
+# Ayarlar içe aktarılmadan önce: arka plan iş parçacıkları içe aktarmada başlatılmasın (post_fork başlatır).
+os.environ["BACKGROUND_SERVICES_AUTOSTART"] = "0"
+
+from config import (
+    SERVER_BIND, SERVER_WORKERS, SERVER_THREADS, SERVER_TIMEOUT, SERVER_GRACEFUL_TIMEOUT, SERVER_KEEPALIVE,
+    SERVER_MAX_REQUESTS, SERVER_MAX_REQUESTS_JITTER,
+)
+
+bind = SERVER_BIND
+workers = SERVER_WORKERS
+worker_class = "gthread"
+threads = SERVER_THREADS
+timeout = SERVER_TIMEOUT
+graceful_timeout = SERVER_GRACEFUL_TIMEOUT
+keepalive = SERVER_KEEPALIVE
+max_requests = SERVER_MAX_REQUESTS
+max_requests_jitter = SERVER_MAX_REQUESTS_JITTER
+preload_app = True
+
+
+def when_ready(server):
+    """Ana süreç: çalışanlar oluşturulmadan önce ağır kaynakları bir kez yükler."""
+    if not server.cfg.preload_app:
+        return
+    import calculator_api
+    calculator_api.preload_resources()
+    # Yüklenen nesneler çöp toplayıcının izlemesinden çıkarılır; aksi halde her toplama
+    # paylaşılan sayfalara yazıp kopyalanmalarına yol açar.
+    gc.freeze()
+    server.log.info("Uygulama kaynakları ana süreçte yüklendi (preload)")
+
+
+def pre_fork(server, worker):
+    """Ana süreç: fiyat listesi dosyası değiştiyse yeni çalışan güncel listeyle başlasın."""
+    from price_list import PRICE_LISTS
+    if PRICE_LISTS.reload_if_changed():
+        server.log.info("Fiyat listesi ana süreçte yeniden yüklendi: %s", PRICE_LISTS.current().version)
+
+
+def post_fork(server, worker):
+    """Çalışan süreç: iş kuyruğu çalışanlarını, fiyat listesi izleyicisini ve ısınmayı başlatır."""
+    import calculator_api
+    calculator_api.start_background_services()
+    # Kaynaklar ana süreçte yüklendiğinden ısınma adımları hızla tamamlanır (/health 'ready').
+    calculator_api.WARM_UP.start_async()
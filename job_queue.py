@@ -0,0 +1,302 @@
+# job_queue.py
+# Bu dosya, teklif hesaplamalarını HTTP isteğinden ayıran kalıcı iş kuyruğunu içerir.
+# İşler yerel bir SQLite veritabanında saklanır; böylece süreç yeniden başlasa da kaybolmaz.
+# Çalışan iş parçacıkları işleri veritabanından atomik olarak sahiplenir (aynı veritabanını
+# paylaşan birden çok süreç güvenle çalışabilir), oluşan PDF'ler iş dizinine yazılır.
+# Bekleyen iş sayısı sınırlıdır; sınır aşılınca submit() QueueFullError fırlatır.
+# Sahiplenme bir kiralamadır (lease) ve yenilenmez (heartbeat yoktur): lease_seconds'tan uzun
+# süren bir iş terk edilmiş sayılır ve başka bir çalışana verilir. Bu yüzden lease_seconds en uzun
+# işten büyük tutulmalıdır; kiralaması düşmüş çalışanın sonucu yok sayılır.
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+# İş durumları
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+
+class QueueFullError(Exception):
+    """Bekleyen iş sayısı sınıra ulaştığında fırlatılır (HTTP 429)."""
+
+
+class JobStore:
+    """SQLite tabanlı iş deposu. Her iş parçacığı kendi bağlantısını kullanır."""
+
+    def __init__(self, path, busy_timeout=30.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        # SQLite bağlantıları çatallanan (fork) süreçte kullanılamaz; alt süreç kendi bağlantılarını açar.
+        os.register_at_fork(after_in_child=self._reset_connections)
+
+    def _reset_connections(self):
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def create(self, job_id, payload):
+        self._conn().execute(
+            "INSERT INTO jobs (id, status, payload, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, JOB_QUEUED, json.dumps(payload, ensure_ascii=False), time.time()),
+        )
+
+    def create_if_below(self, job_id, payload, limit):
+        """
+        Bekleyen iş sayısı `limit`'in altındaysa işi ekler; değilse QueueFullError fırlatır.
+        Sayım ve ekleme tek bir yazma işleminde (BEGIN IMMEDIATE) yapılır; eşzamanlı
+        gönderimler (farklı süreçlerden de) sınırı aşamaz.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            pending = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (JOB_QUEUED,)).fetchone()[0]
+            if pending >= limit:
+                raise QueueFullError(f"En fazla {limit} iş bekleyebilir")
+            self.create(job_id, payload)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, job_id, with_payload=False):
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        payload = job.pop("payload")
+        if with_payload:
+            job["payload"] = json.loads(payload)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def count(self, status):
+        return self._conn().execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def claim(self, lease_seconds, max_attempts):
+        """
+        Sıradaki işi 'running' olarak işaretleyip (iş_kimliği, payload, deneme_no) döndürür; yoksa None.
+        Kiralama süresini aşmış 'running' işler (çöken süreçten kalanlar) yeniden sahiplenilir;
+        deneme hakkı bitenler 'failed' olarak kapatılır. deneme_no, finish()'te sahipliği doğrular.
+        """
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                "WHERE status = ? AND started_at < ? AND attempts >= ?",
+                (JOB_FAILED, "Çalışan süreç iş bitmeden durdu", now, JOB_RUNNING, now - lease_seconds, max_attempts),
+            )
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM jobs "
+                "WHERE status = ? OR (status = ? AND started_at < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (JOB_QUEUED, JOB_RUNNING, now - lease_seconds),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            attempt = row["attempts"] + 1
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, started_at = ? WHERE id = ?",
+                (JOB_RUNNING, attempt, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row["id"], json.loads(row["payload"]), attempt
+
+    def finish(self, job_id, attempt, status, result=None, error=None):
+        """
+        İşi kapatır; yalnızca iş hâlâ bu denemeyle (claim()'in döndürdüğü deneme_no) çalışıyorsa.
+        Kiralaması düşüp başka çalışana verilmiş işin eski sonucu yazılmaz; bu durumda False döner.
+        """
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? "
+            "WHERE id = ? AND status = ? AND attempts = ?",
+            (status, json.dumps(result, ensure_ascii=False) if result is not None else None, error, time.time(),
+             job_id, JOB_RUNNING, attempt),
+        )
+        return cursor.rowcount == 1
+
+    def purge(self, older_than):
+        """Verilen zamandan önce biten işleri siler ve kimliklerini döndürür."""
+        conn = self._conn()
+        rows = conn.execute(
+            "SELECT id FROM jobs WHERE status IN (?, ?) AND finished_at < ?", (JOB_DONE, JOB_FAILED, older_than)
+        ).fetchall()
+        ids = [row["id"] for row in rows]
+        conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in ids])
+        return ids
+
+
+class QuoteJobQueue:
+    """
+    Kalıcı, sınırlı teklif iş kuyruğu.
+    `handler(job_id, payload)` -> (sonuç_sözlüğü, {belge_adı: pdf_baytları}) çalışan iş
+    parçacıklarında çağrılır; belgeler iş dizinine yazılır ve artifact_path() ile okunur.
+    """
+
+    def __init__(self, directory, handler, workers=2, max_pending=50, max_attempts=3,
+                 lease_seconds=300.0, retention_seconds=7 * 24 * 60 * 60, poll_interval=1.0):
+        self.directory = directory
+        self.handler = handler
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = retention_seconds
+        self.poll_interval = poll_interval
+        self.store = JobStore(os.path.join(directory, "jobs.sqlite3"))
+        self.artifacts_dir = os.path.join(directory, "artifacts")
+        os.makedirs(self.artifacts_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._threads = []
+        self._last_purge = 0.0
+
+    def start(self):
+        """Çalışan iş parçacıklarını başlatır; önceki çalıştırmadan kalan işler de işlenir."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"quote-job-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, payload):
+        """İşi kaydeder ve kimliğini döndürür; kuyruk doluysa QueueFullError fırlatır."""
+        self.start()
+        job_id = uuid.uuid4().hex
+        self.store.create_if_below(job_id, payload, self.max_pending)
+        with self._wake:
+            self._wake.notify()
+        return job_id
+
+    def status(self, job_id):
+        """İşin durumunu döndürür (istek gövdesi hariç); bilinmeyen kimlik için None."""
+        return self.store.get(job_id)
+
+    def pending(self):
+        return self.store.count(JOB_QUEUED)
+
+    def artifact_path(self, job_id, name, suffix=".pdf"):
+        return os.path.join(self.artifacts_dir, f"{job_id}_{name}{suffix}")
+
+    def shutdown(self, wait=True):
+        self._stop.set()
+        with self._wake:
+            self._wake.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join(timeout=30)
+        self._threads = []
+
+    # --- İç Yardımcılar ---
+    def _stage_artifacts(self, job_id, attempt, documents, staged):
+        """
+        Belgeleri denemeye özgü geçici dosyalara yazar ({belge_adı: yol} `staged`'e eklenir).
+        Asıl artifact_path() yalnızca finish() başarılı olunca _publish_artifacts() ile oluşur;
+        kiralaması düşmüş bir deneme yeni denemenin belgelerinin üzerine yazamaz.
+        """
+        for name, data in documents.items():
+            path = self.artifact_path(job_id, f"{name}.{attempt}", ".staged")
+            staged[name] = path
+            with open(path, "wb") as f:
+                f.write(data)
+
+    def _publish_artifacts(self, job_id, staged, keep):
+        """Geçici belgeleri asıl adlarına taşır (keep) veya siler."""
+        for name, path in staged.items():
+            try:
+                if keep:
+                    os.replace(path, self.artifact_path(job_id, name))
+                else:
+                    os.remove(path)
+            except OSError as e:
+                print(f"UYARI: Teklif işi belgesi taşınamadı/silinemedi ({path}): {e}")
+
+    def _purge_expired(self):
+        now = time.time()
+        if now - self._last_purge < 60 * 60:
+            return
+        self._last_purge = now
+        purged = set(self.store.purge(now - self.retention_seconds))
+        if not purged:
+            return
+        # Dizin bir kez taranır; dosya adları "<iş_kimliği>_<ad><uzantı>" biçimindedir.
+        for entry in os.scandir(self.artifacts_dir):
+            if entry.name.split("_", 1)[0] in purged:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def _worker(self):
+        while not self._stop.is_set():
+            # Süresi dolan işler boşta beklerken de temizlenir (saatte en fazla bir kez).
+            try:
+                self._purge_expired()
+            except (OSError, sqlite3.Error) as e:
+                print(f"UYARI: Eski işler temizlenemedi: {e}")
+            try:
+                claimed = self.store.claim(self.lease_seconds, self.max_attempts)
+            except sqlite3.Error as e:
+                print(f"UYARI: İş deposu okunamadı: {e}")
+                claimed = None
+            if claimed is None:
+                # Başka süreçlerin eklediği işler için ara ara veritabanına bakılır.
+                with self._wake:
+                    self._wake.wait(self.poll_interval)
+                continue
+            job_id, payload, attempt = claimed
+            staged = {}
+            done = False
+            try:
+                result, documents = self.handler(job_id, payload)
+                self._stage_artifacts(job_id, attempt, documents, staged)
+                result["documents"] = sorted(documents)
+                finished = done = self.store.finish(job_id, attempt, JOB_DONE, result=result)
+            except Exception as e:
+                print(f"Teklif işi hatası ({job_id}): {e}")
+                finished = self.store.finish(job_id, attempt, JOB_FAILED, error=str(e))
+            self._publish_artifacts(job_id, staged, keep=done)
+            if not finished:
+                print(f"UYARI: Teklif işinin kiralaması süresi dolduğu için sonucu yok sayıldı ({job_id}, deneme {attempt})")
@@ -0,0 +1,248 @@
+# logo_cache.py
+# Bu dosya, şirket logosunu süreç genelinde bir kez yükleyip bellekte tutan önbelleği içerir.
+# Teklif akışı logoyu her istekte indirmek yerine buradan okur; ağ erişimi yalnızca
+# başlangıçta ve TTL dolduğunda (arka planda, ETag/Last-Modified ile) yapılır. İstek yolundaki
+# okumalar hiçbir zaman ağa çıkmaz ve ağ isteği sürerken kilit tutulmaz.
+
+import io
+import os
+import json
+import time
+import base64
+import hashlib
+import threading
+
+from config import LOGO_URL, LOGO_LOCAL_PATH, LOGO_CACHE_TTL_SECONDS, LOGO_CACHE_DISK_PATH, LOGO_WIDTH_PX
+from utils import resize_logo_to_png
+
+# Logo hiç yüklenemediğinde yeni deneme yapılmadan önce beklenecek süre (saniye).
+LOGO_RETRY_INTERVAL_SECONDS = 60
+
+
+class LogoCache:
+    """
+    Yeniden boyutlandırılmış logo PNG baytlarını, base64 halini ve reportlab
+    ImageReader nesnesini bellekte tutar.
+
+    Kaynak önceliği: yerel dosya (local_path) > URL. URL'den yüklenen logo diske de
+    yazılır; ağ hatasında disk kopyası kullanılır. TTL dolduğunda mevcut logo
+    sunulmaya devam eder ve yenileme arka planda koşullu istek ile yapılır.
+    """
+
+    def __init__(self, url=LOGO_URL, local_path=LOGO_LOCAL_PATH, width=LOGO_WIDTH_PX,
+                 ttl_seconds=LOGO_CACHE_TTL_SECONDS, disk_path=LOGO_CACHE_DISK_PATH):
+        self.url = url
+        self.local_path = local_path
+        self.width = width
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        # _lock yalnızca yüklü logoyu değiştirirken kısa süre tutulur; _refresh_lock aynı anda
+        # tek bir yüklemenin (ağ isteği dahil) çalışmasını sağlar.
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._png_bytes = None
+        self._b64 = None
+        self._digest = None
+        self._image_reader = None
+        self._etag = None
+        self._last_modified = None
+        self._loaded_at = 0.0
+        self._failed_at = None
+
+    # --- Yükleme ---
+    def load_bytes(self, image_bytes, already_resized=False):
+        """Ham görsel baytlarını önbelleğe yükler (test veya yerel kaynaklar için)."""
+        png_bytes = image_bytes if already_resized else resize_logo_to_png(image_bytes, self.width)
+        self._set_png(png_bytes)
+
+    def load_file(self, path):
+        """Yerel bir görsel dosyasını önbelleğe yükler."""
+        with open(path, 'rb') as f:
+            self.load_bytes(f.read())
+
+    def warm_up(self):
+        """
+        Logoyu senkron olarak yükler (gerekirse ağdan) ve base64 halini döndürür. Uygulama
+        başlangıcında, arka planda veya toplu işlerin başında çağrılır; istek yolunda kullanılmaz.
+        """
+        if self._png_bytes is not None:
+            return self._b64
+        with self._refresh_lock:
+            if self._png_bytes is None and not self._retry_pending():
+                self._load_initial()
+        return self._b64
+
+    def warm_up_async(self):
+        """Logoyu arka planda yükler; başlangıcı bloklamaz."""
+        thread = threading.Thread(target=self.warm_up, name="logo-cache-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    # --- Okuma ---
+    def get_base64(self):
+        """Logonun base64 halini döndürür. Logo hiç yüklenemediyse None döner."""
+        self._ensure_loaded()
+        return self._b64
+
+    def get_png_bytes(self):
+        """Yeniden boyutlandırılmış logonun PNG baytlarını döndürür."""
+        self._ensure_loaded()
+        return self._png_bytes
+
+    def get_image_reader(self):
+        """Çözülmüş reportlab ImageReader nesnesini döndürür (PDF'lerde tekrar çözmeden kullanmak için)."""
+        self._ensure_loaded()
+        return self._image_reader
+
+    def get_digest(self):
+        """Yüklü logonun kısa özetini döndürür (PDF önbellek anahtarları için); logo yoksa None."""
+        self._ensure_loaded()
+        return self._digest
+
+    def snapshot(self):
+        """
+        (base64, özet) çiftini tek seferde, kilit altında döndürür. PDF'e basılan logo ile önbellek
+        anahtarındaki özet arada yenilenen logo nedeniyle birbirinden ayrışmaz.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            return self._b64, self._digest
+
+    def is_stale(self):
+        return self._png_bytes is None or (time.time() - self._loaded_at) > self.ttl_seconds
+
+    # --- İç Yardımcılar ---
+    def _ensure_loaded(self):
+        # İstek yolu ağa çıkmaz: logo henüz yoksa PDF logosuz oluşturulur, yükleme arka planda denenir.
+        if self._png_bytes is None:
+            if not self._retry_pending():
+                self._refresh_in_background()
+        elif self.is_stale() and not self.local_path:
+            self._refresh_in_background()
+
+    def _retry_pending(self):
+        """Logo hiç yüklenemediyse her teklifte tekrar ağa çıkmamak için kısa bir bekleme uygular."""
+        return self._failed_at is not None and (time.time() - self._failed_at) < LOGO_RETRY_INTERVAL_SECONDS
+
+    def _set_png(self, png_bytes, etag=None, last_modified=None, loaded_at=None):
+        """Türetilmiş değerleri kilit dışında hazırlar; yalnızca atamalar kilit altında yapılır."""
+        from reportlab.lib.utils import ImageReader
+        b64 = base64.b64encode(png_bytes).decode()
+        digest = hashlib.sha256(png_bytes).hexdigest()[:16]
+        image_reader = ImageReader(io.BytesIO(png_bytes))
+        with self._lock:
+            self._png_bytes = png_bytes
+            self._b64 = b64
+            self._digest = digest
+            self._image_reader = image_reader
+            self._etag = etag
+            self._last_modified = last_modified
+            self._loaded_at = time.time() if loaded_at is None else loaded_at
+
+    def _load_initial(self):
+        """İlk yüklemeyi yapar (_refresh_lock altında çağrılır)."""
+        if self.local_path:
+            try:
+                with open(self.local_path, 'rb') as f:
+                    self._set_png(resize_logo_to_png(f.read(), self.width))
+            except Exception as e:
+                print(f"UYARI: Yerel logo dosyası okunamadı ({self.local_path}): {e}")
+        if self._png_bytes is None and not (self.url and self._fetch_remote()):
+            self._load_from_disk()
+        self._failed_at = None if self._png_bytes is not None else time.time()
+
+    def _fetch_remote(self):
+        """
+        URL'den logoyu koşullu istekle çeker. Başarılıysa (veya 304 ise) True döner.
+        Ağ isteği kilit tutulmadan yapılır; okuyucular bu sürede mevcut logoyu kullanır.
+        """
+        import requests  # ağ kütüphanesi yalnızca ilk logo isteğinde yüklenir
+        with self._lock:
+            has_logo, etag, last_modified = self._png_bytes is not None, self._etag, self._last_modified
+        headers = {}
+        if has_logo:
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        try:
+            response = requests.get(self.url, headers=headers, timeout=10)
+            if response.status_code == 304:
+                with self._lock:
+                    self._loaded_at = time.time()
+                return True
+            response.raise_for_status()
+            png_bytes = resize_logo_to_png(response.content, self.width)
+        except Exception as e:
+            print(f"Hata: Logo yüklenirken bir sorun oluştu: {e}")
+            return False
+        self._set_png(png_bytes, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        self._save_to_disk()
+        return True
+
+    def _refresh_in_background(self):
+        """Yüklemeyi/yenilemeyi arka planda başlatır; zaten biri sürüyorsa hemen döner (beklemez)."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+
+        def _refresh():
+            try:
+                if self._png_bytes is None:
+                    self._load_initial()
+                elif not self._fetch_remote():
+                    # Ağ hatasında eski logo ile devam et, bir sonraki TTL'de tekrar dene.
+                    with self._lock:
+                        self._loaded_at = time.time()
+            finally:
+                self._refresh_lock.release()
+
+        try:
+            threading.Thread(target=_refresh, name="logo-cache-refresh", daemon=True).start()
+        except RuntimeError:
+            self._refresh_lock.release()
+            raise
+
+    def _meta_path(self):
+        return f"{self.disk_path}.json"
+
+    def _save_to_disk(self):
+        if not self.disk_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.disk_path), exist_ok=True)
+            tmp_path = f"{self.disk_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(self._png_bytes)
+            os.replace(tmp_path, self.disk_path)
+            with open(self._meta_path(), 'w') as f:
+                json.dump({'etag': self._etag, 'last_modified': self._last_modified, 'url': self.url}, f)
+        except OSError as e:
+            print(f"UYARI: Logo disk önbelleğine yazılamadı: {e}")
+
+    def _load_from_disk(self):
+        if not self.disk_path or not os.path.exists(self.disk_path):
+            print("UYARI: Logo yüklenemedi ve disk önbelleği bulunamadı. PDF'ler logosuz oluşturulacak.")
+            return False
+        try:
+            with open(self.disk_path, 'rb') as f:
+                png_bytes = f.read()
+            meta = {}
+            if os.path.exists(self._meta_path()):
+                with open(self._meta_path()) as f:
+                    meta = json.load(f)
+            # Disk kopyası bayat kabul edilir; bir sonraki okumada arka planda yenilenir.
+            self._set_png(png_bytes, meta.get('etag'), meta.get('last_modified'), loaded_at=0.0)
+            print("INFO: Logo disk önbelleğinden yüklendi.")
+            return True
+        except Exception as e:
+            print(f"UYARI: Logo disk önbelleği okunamadı: {e}")
+            return False
+
+
+# Süreç genelinde paylaşılan logo önbelleği
+LOGO_CACHE = LogoCache()
+
+
+def get_logo_base64():
+    """Süreç genelindeki önbellekten logonun base64 halini döndürür."""
+    return LOGO_CACHE.get_base64()
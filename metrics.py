@@ -0,0 +1,221 @@
+# metrics.py
+# Bu dosya, teklif API'si için hafif ölçüm altyapısını içerir: aşama süreleri (histogram),
+# sayaçlar ve anlık değerler bellekte tutulur, /metrics üzerinden Prometheus metin
+# biçiminde sunulur ve her istek için tek satırlık bir JSON günlük kaydı yazılır.
+# Ek bağımlılık gerektirmez; METRICS_ENABLED=0 ile tamamen kapatılabilir.
+
+import json
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+
+from config import METRICS_ENABLED, METRICS_LOG_REQUESTS
+from calculator import InvalidProjectError
+
+# Aşama süreleri için histogram sınırları (saniye)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# İstemci hatası sayılan (400 dönen) istisnalar; aşama hata sayacına eklenmez.
+CLIENT_ERRORS = (InvalidProjectError,)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(label_key, extra=None):
+    items = list(label_key) + (list(extra) if extra else [])
+    if not items:
+        return ""
+    escaped = []
+    for key, value in items:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """İş parçacığı güvenli, bellek içi ölçüm kaydı."""
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._meta = {}          # ad -> (tür, açıklama)
+        self._values = {}        # ad -> {etiket_anahtarı: değer}
+        self._histograms = {}    # ad -> {etiket_anahtarı: [kova_sayıları, toplam, adet]}
+        self._collectors = []
+
+    def describe(self, name, metric_type, help_text):
+        self._meta[name] = (metric_type, help_text)
+        if metric_type == "histogram":
+            self._histograms.setdefault(name, {})
+        else:
+            self._values.setdefault(name, {})
+
+    def inc(self, name, labels=None, amount=1):
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name, value, labels=None):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._values.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name, value, labels=None):
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            entry = series.get(key)
+            if entry is None:
+                entry = series[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = entry[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def add_collector(self, collector):
+        """Her /metrics okumasından önce çağrılır; anlık değerleri (gauge) güncellemek için."""
+        self._collectors.append(collector)
+
+    def render(self):
+        """Tüm ölçümleri Prometheus metin biçiminde döndürür."""
+        for collector in self._collectors:
+            try:
+                collector(self)
+            except Exception as e:
+                print(f"UYARI: Ölçüm toplayıcısı başarısız: {e}")
+        lines = []
+        with self._lock:
+            for name in sorted(set(self._values) | set(self._histograms)):
+                metric_type, help_text = self._meta.get(name, ("untyped", ""))
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                if metric_type == "histogram":
+                    for key, (counts, total, count) in sorted(self._histograms.get(name, {}).items()):
+                        for bound, bucket_count in zip(self.buckets, counts):
+                            lines.append(f"{name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {bucket_count}")
+                        lines.append(f"{name}_bucket{_format_labels(key, [('le', '+Inf')])} {count}")
+                        lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                        lines.append(f"{name}_count{_format_labels(key)} {count}")
+                else:
+                    for key, value in sorted(self._values.get(name, {}).items()):
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def start_request(self, route):
+        if not self.enabled:
+            return NULL_TRACE
+        return RequestTrace(self, route)
+
+
+class RequestTrace:
+    """Tek bir isteğin aşama sürelerini toplar; bitişte sayaçları günceller ve JSON günlük yazar."""
+
+    def __init__(self, registry, route):
+        self.registry = registry
+        self.route = route
+        self.request_id = uuid.uuid4().hex[:12]
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.pdf_bytes = {}
+        self.error_stage = None
+        self.fields = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        except CLIENT_ERRORS:
+            self.error_stage = name
+            raise
+        except Exception:
+            self.error_stage = name
+            self.registry.inc("quote_stage_errors_total", {"stage": name})
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        self.registry.observe("quote_stage_duration_seconds", seconds, {"stage": name})
+
+    def add_pdf_bytes(self, document, size):
+        self.pdf_bytes[document] = size
+        self.registry.inc("quote_pdf_bytes_total", {"document": document}, size)
+        self.registry.inc("quote_pdfs_total", {"document": document})
+
+    def annotate(self, **fields):
+        self.fields.update(fields)
+
+    def finish(self, status_code):
+        duration = time.perf_counter() - self.started
+        self.registry.inc("quote_requests_total", {"route": self.route, "status": status_code})
+        self.registry.observe("quote_request_duration_seconds", duration, {"route": self.route})
+        if METRICS_LOG_REQUESTS:
+            record = {
+                "event": "quote_request",
+                "request_id": self.request_id,
+                "route": self.route,
+                "status": status_code,
+                "duration_ms": round(duration * 1000, 2),
+                "stages_ms": {name: round(seconds * 1000, 2) for name, seconds in self.stages.items()},
+            }
+            if self.pdf_bytes:
+                record["pdf_bytes"] = self.pdf_bytes
+            if self.error_stage:
+                record["error_stage"] = self.error_stage
+            record.update(self.fields)
+            print(json.dumps(record, ensure_ascii=False, default=str))
+
+
+class _NullTrace:
+    """Ölçüm kapalıyken kullanılan, hiçbir şey yapmayan iz nesnesi."""
+
+    request_id = None
+    error_stage = None
+
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    def record(self, name, seconds):
+        pass
+
+    def add_pdf_bytes(self, document, size):
+        pass
+
+    def annotate(self, **fields):
+        pass
+
+    def finish(self, status_code):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+METRICS = MetricsRegistry(METRICS_ENABLED)
+METRICS.describe("quote_requests_total", "counter", "Teklif API istekleri (rota ve HTTP durumuna göre).")
+METRICS.describe("quote_request_duration_seconds", "histogram", "Teklif isteklerinin toplam süresi.")
+METRICS.describe("quote_stage_duration_seconds", "histogram", "Teklif akışındaki aşamaların süresi.")
+METRICS.describe("quote_stage_errors_total", "counter", "Aşama bazında sunucu hatası sayısı (istemci hataları hariç).")
+METRICS.describe("quote_pdfs_total", "counter", "Oluşturulan veya önbellekten dönen PDF sayısı.")
+METRICS.describe("quote_pdf_bytes_total", "counter", "PDF belgelerinin toplam boyutu (bayt).")
+METRICS.describe("quote_emails_total", "counter", "E-posta gönderim sonuçları (mod ve sonuca göre).")
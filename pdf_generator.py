@@ -3,6 +3,8 @@
 
 import io
 import math
+import functools
+import threading
 from datetime import datetime
 import pandas as pd
 import base64
@@ -14,216 +16,357 @@ from reportlab.platypus import Table, TableStyle, Paragraph, Spacer, SimpleDocTe
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.pdfmetrics import stringWidth
-from reportlab.pdfbase.ttfonts import TTFont
 # Göreceli içe aktarma hatasını gidermek için noktalar (.) kaldırıldı.
-from config import FIYATLAR, COMPANY_INFO, MATERIAL_INFO_ITEMS, TRANSLATIONS, VAT_RATE
+from config import FIYATLAR, COMPANY_INFO, MATERIAL_INFO_ITEMS, TRANSLATIONS, VAT_RATE, PDF_DETERMINISTIC
 from utils import clean_invisible_chars, format_currency, calculate_rounded_up_cost, get_company_logo_base64
+from fonts import FONTS
+from spool import spooled_buffer, read_buffer
+
+
+# --- Marka Renkleri ---
+# Tüm PDF oluşturucuları renkleri buradan alır; marka değişikliği tek yerden yapılır.
+BRAND_PRIMARY = colors.HexColor("#3182ce")
+BRAND_ACCENT = colors.HexColor("#c53030")
+BRAND_MUTED = colors.HexColor("#4a5568")
+BRAND_HEADER_TEXT = colors.HexColor('#2C3E50')
+
+# --- Ortak Tablo Stilleri ---
+# TableStyle nesneleri tabloya uygulanırken değiştirilmez; tüm belgeler aynı örnekleri paylaşır.
+INFO_TABLE_STYLE = TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)])
+PAYMENT_TABLE_STYLE = TableStyle([('ALIGN', (0,0), (-1,-1), 'LEFT'), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)])
+APPENDIX_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), BRAND_MUTED),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ('LEFTPADDING', (0,0), (-1,-1), 6),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+])
+PRICE_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,-1), BRAND_PRIMARY),
+    ('TEXTCOLOR', (0,0), (-1,-1), colors.white),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ('LEFTPADDING', (0,0), (-1,-1), 8),
+    ('RIGHTPADDING', (0,0), (-1,-1), 8),
+    ('TOPPADDING', (0,0), (-1,-1), 8),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 8),
+    ('GRID', (0,0), (-1,-1), 0.5, BRAND_MUTED),
+])
+
+# --- Paragraf Stili Kayıt Defteri ---
+# Stil sayfası font ailesi başına bir kez oluşturulur ve tüm PDF oluşturucuları
+# tarafından paylaşılır. Paylaşıldığı için oluşturulduktan sonra değiştirilmemelidir.
+_STYLE_REGISTRY = {}
+_STYLE_REGISTRY_LOCK = threading.Lock()
+
+def _build_style_sheet(font_family):
+    bold_font = f"{font_family}-Bold"
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name='NormalBilingual', parent=styles['Normal'], fontSize=8, leading=10, spaceAfter=2, fontName=font_family))
+    styles.add(ParagraphStyle(name='Heading', parent=styles['Heading2'], fontSize=11, spaceAfter=5, spaceBefore=10, fontName=bold_font, textColor=BRAND_PRIMARY, alignment=TA_LEFT))
+    styles.add(ParagraphStyle(name='PriceTotal', parent=styles['Heading1'], fontSize=21, alignment=TA_CENTER, spaceAfter=10, fontName=bold_font, textColor=BRAND_ACCENT))
+    styles.add(ParagraphStyle(name='SectionSubheading', parent=styles['Heading3'], fontSize=9, spaceAfter=3, spaceBefore=7, fontName=bold_font, textColor=BRAND_MUTED))
+    styles.add(ParagraphStyle(name='ProposalTitle', parent=styles['Heading1'], fontSize=17, alignment=TA_CENTER, spaceAfter=10, fontName=bold_font, textColor=BRAND_PRIMARY))
+    styles.add(ParagraphStyle(name='ProposalSubtitle', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER, spaceAfter=7, fontName=font_family, textColor=BRAND_MUTED))
+    styles.add(ParagraphStyle(name='PaymentHeading', parent=styles['Heading3'], fontSize=9, spaceAfter=3, spaceBefore=7, fontName=bold_font))
+    styles.add(ParagraphStyle(name='ColoredTableHeader', parent=styles['Normal'], fontSize=8, fontName=bold_font, textColor=colors.white, alignment=TA_LEFT))
+    return styles
+
+def get_pdf_styles(font_family):
+    """Verilen font ailesi için paylaşılan stil sayfasını döndürür (ilk çağrıda oluşturulur)."""
+    styles = _STYLE_REGISTRY.get(font_family)
+    if styles is None:
+        with _STYLE_REGISTRY_LOCK:
+            styles = _STYLE_REGISTRY.get(font_family)
+            if styles is None:
+                styles = _build_style_sheet(font_family)
+                _STYLE_REGISTRY[font_family] = styles
+    return styles
+
+
+# --- Statik Paragraf Önbelleği ---
+# Teklife göre değişmeyen metinler (ek tabloları, malzeme listeleri, çevirili etiketler)
+# süreç başına bir kez temizlenir ve ayrıştırılır; sonraki belgeler hazır parçaları (frags)
+# kullanır. reportlab parçaları yalnızca okuduğu için belgeler arasında paylaşılabilir.
+_STATIC_PARAGRAPH_CACHE = {}
+_STATIC_PARAGRAPH_CACHE_MAX = 4096
+
+def static_paragraph(text, style):
+    """
+    Statik bir metin için Paragraph döndürür. Teklife özgü değer (fiyat, kW, ölçü)
+    içeren metinlerde kullanılmamalıdır; onlar için doğrudan Paragraph kullanın.
+    """
+    key = (text, id(style))
+    entry = _STATIC_PARAGRAPH_CACHE.get(key)
+    if entry is None or entry[0] is not style:
+        paragraph = Paragraph(clean_invisible_chars(text), style)
+        if len(_STATIC_PARAGRAPH_CACHE) < _STATIC_PARAGRAPH_CACHE_MAX:
+            _STATIC_PARAGRAPH_CACHE[key] = (style, paragraph.text, paragraph.style, paragraph.frags, paragraph.bulletText)
+        return paragraph
+    _, cleaned_text, parsed_style, frags, bullet_text = entry
+    return Paragraph(cleaned_text, parsed_style, bulletText=bullet_text, frags=frags)
+
+@functools.lru_cache(maxsize=64)
+def _bilingual_block(en_text, gr_text):
+    """İngilizce ve Yunanca malzeme metinlerini temizleyip iki satır boşlukla birleştirir."""
+    return clean_invisible_chars(en_text) + "<br/><br/>" + clean_invisible_chars(gr_text)
+
+
+# --- PDF Kaynaklarının Hazırlanması ---
+_PDF_RESOURCES_READY = False
+
+def initialize_pdf_resources():
+    """
+    Fontları, stil sayfasını ve statik ek paragraflarını süreç başına bir kez hazırlar. Render havuzundaki her çalışan
+    başlangıçta bunu çağırır; aynı süreçte tekrar çağrılması etkisizdir.
+    """
+    global _PDF_RESOURCES_READY
+    if _PDF_RESOURCES_READY:
+        return
+    styles = get_pdf_styles(FONTS.register())
+    try:
+        _warm_static_paragraphs(styles)
+    except Exception as e:
+        # Önbellek yalnızca hızlandırmadır; ısınma başarısız olursa paragraflar ilk kullanımda ayrıştırılır.
+        print(f"UYARI: Statik PDF paragrafları önceden hazırlanamadı: {e}")
+    _PDF_RESOURCES_READY = True
 
 
 # --- Ortak PDF Yardımcı Fonksiyonları ---
+# Belirlenimci kipte (PDF_DETERMINISTIC) oluşturma tarihi sabittir ve belge kimliği içerikten türetilir;
+# böylece aynı girdiler bayt bayt aynı PDF'i verir ve belge deposunda güvenle paylaşılır.
+PDF_INVARIANT = 1 if PDF_DETERMINISTIC else None
+
+def document_date(project_details):
+    """Belgeye basılacak teklif tarihi (gg/aa/yyyy); build_document_jobs tarafından verilir."""
+    return project_details.get('document_date') or datetime.now().strftime('%d/%m/%Y')
+
+LOGO_FORM_NAME = "CompanyLogo"
+LOGO_WIDTH = 40 * mm
+
+@functools.lru_cache(maxsize=4)
+def _decode_logo(logo_data_b64):
+    """Base64 logoyu süreç başına bir kez çözer; (ImageReader, en/boy oranı) döndürür."""
+    reader = ImageReader(io.BytesIO(base64.b64decode(logo_data_b64)))
+    width, height = reader.getSize()
+    return reader, width / height
+
+
+class HeaderFooterRenderer:
+    """
+    Sayfa üst ve alt bilgisini çizer; SimpleDocTemplate'in onFirstPage/onLaterPages
+    geri çağrısı olarak kullanılır. Logo ve şirket metinleri belge başına bir kez
+    hazırlanır; logo PDF'e tek bir form XObject olarak gömülür ve her sayfada bu
+    forma referans verilir.
+    """
+
+    def __init__(self, company_info, logo_data_b64, language_code):
+        self.language_code = language_code
+        self.logo_reader = None
+        self.logo_height = 0
+        if logo_data_b64:
+            try:
+                self.logo_reader, aspect_ratio = _decode_logo(logo_data_b64)
+                self.logo_height = LOGO_WIDTH / aspect_ratio
+            except Exception as e:
+                print(f"UYARI: Logo PDF'e eklenemedi: {e}")
+                self.logo_reader = None
+
+        self.company_lines = [
+            clean_invisible_chars(company_info['name']),
+            clean_invisible_chars(company_info['address']),
+            clean_invisible_chars(f"Email: {company_info['email']}"),
+            clean_invisible_chars(f"Phone: {company_info['phone']}"),
+            clean_invisible_chars(f"Website: {company_info['website']}"),
+        ]
+        self.footer_text = clean_invisible_chars(f"{company_info['name']} - {company_info['website']}")
+
+    def _draw_logo(self, canvas_obj, doc):
+        if not canvas_obj.hasForm(LOGO_FORM_NAME):
+            canvas_obj.beginForm(LOGO_FORM_NAME)
+            canvas_obj.drawImage(self.logo_reader, 0, 0, width=LOGO_WIDTH, height=self.logo_height, mask='auto')
+            canvas_obj.endForm()
+        canvas_obj.saveState()
+        canvas_obj.translate(doc.leftMargin, A4[1] - self.logo_height - 10 * mm)
+        canvas_obj.doForm(LOGO_FORM_NAME)
+        canvas_obj.restoreState()
+
+    def __call__(self, canvas_obj, doc):
+        canvas_obj.saveState()
+        main_font = doc.main_font
+
+        # Header - Sol üstte logo ve Sağ üstte şirket bilgileri
+        if self.logo_reader is not None:
+            self._draw_logo(canvas_obj, doc)
+
+        # Şirket Bilgileri (Sağ üst)
+        canvas_obj.setFont(main_font, 8)
+        canvas_obj.setFillColor(BRAND_HEADER_TEXT)
+        right_x = A4[0] - doc.rightMargin
+        for i, line in enumerate(self.company_lines):
+            canvas_obj.drawRightString(right_x, A4[1] - (25 + 5 * i) * mm, line)
+
+        # Footer
+        canvas_obj.line(doc.leftMargin, 20 * mm, right_x, 20 * mm)
+        canvas_obj.setFont(main_font, 7)
+        canvas_obj.drawString(doc.leftMargin, 15 * mm, self.footer_text)
+        canvas_obj.drawRightString(right_x, 15 * mm, f"Page {doc.page}")
+        canvas_obj.restoreState()
+
+
 def draw_pdf_header_and_footer_common(canvas_obj, doc, customer_info, company_info, logo_data_b64, language_code):
-    canvas_obj.saveState()
-    main_font_bold = f"{doc.main_font}-Bold"
-    main_font = doc.main_font
-    
-    # Header - Sol üstte logo ve Sağ üstte şirket bilgileri
-    if logo_data_b64:
-        try:
-            img_data = base64.b64decode(logo_data_b64)
-            img = Image(io.BytesIO(img_data))
-            logo_width_mm = 40 * mm
-            aspect_ratio = img.drawWidth / img.drawHeight
-            logo_height_mm = logo_width_mm / aspect_ratio
-            canvas_obj.drawImage(img, doc.leftMargin, A4[1] - logo_height_mm - 10 * mm, width=logo_width_mm, height=logo_height_mm, mask='auto')
-        except Exception as e:
-            pass
-
-    # Şirket Bilgileri (Sağ üst)
-    company_name_text = clean_invisible_chars(company_info['name'])
-    company_address_text = clean_invisible_chars(company_info['address'])
-    company_email_text = clean_invisible_chars(f"Email: {company_info['email']}")
-    company_phone_text = clean_invisible_chars(f"Phone: {company_info['phone']}")
-    company_website_text = clean_invisible_chars(f"Website: {company_info['website']}")
-
-    canvas_obj.setFont(main_font, 8)
-    canvas_obj.setFillColor(colors.HexColor('#2C3E50'))
-
-    canvas_obj.drawRightString(A4[0] - doc.rightMargin, A4[1] - 25 * mm, company_name_text)
-    canvas_obj.drawRightString(A4[0] - doc.rightMargin, A4[1] - 30 * mm, company_address_text)
-    canvas_obj.drawRightString(A4[0] - doc.rightMargin, A4[1] - 35 * mm, company_email_text)
-    canvas_obj.drawRightString(A4[0] - doc.rightMargin, A4[1] - 40 * mm, company_phone_text)
-    canvas_obj.drawRightString(A4[0] - doc.rightMargin, A4[1] - 45 * mm, company_website_text)
-
-    # Footer
-    canvas_obj.line(doc.leftMargin, 20 * mm, A4[0] - doc.rightMargin, 20 * mm)
-    canvas_obj.setFont(main_font, 7)
-    canvas_obj.drawString(doc.leftMargin, 15 * mm, clean_invisible_chars(f"{company_info['name']} - {company_info['website']}"))
-    canvas_obj.drawRightString(A4[0] - doc.rightMargin, 15 * mm, clean_invisible_chars(f"Page {doc.page}"))
-    canvas_obj.restoreState()
+    """
+    Eski çağrı biçimi için sarmalayıcı. Renderer belge üzerinde saklanır, böylece
+    logo ve metinler sayfa başına değil belge başına bir kez hazırlanır.
+    """
+    renderer = getattr(doc, '_header_footer_renderer', None)
+    if renderer is None:
+        renderer = HeaderFooterRenderer(company_info, logo_data_b64, language_code)
+        doc._header_footer_renderer = renderer
+    renderer(canvas_obj, doc)
 
 
 # --- Ek PDF Oluşturma Fonksiyonları ---
+# Eklerin statik içerikleri; yalnızca kW ve fiyat gibi değerler teklif başına eklenir.
+APPENDIX_TABLE_HEADER = ("<b>Component / Εξάρτημα</b>", "<b>Description / Περιγραφή</b>")
+
+SOLAR_APPENDIX_HEADING = "APPENDIX B: SOLAR ENERGY SYSTEM / ΠΑΡΑΡΤΗΜΑ Β: ΣΥΣΤΗΜΑ ΗΛΙΑΚΗΣ ΕΝΕΡΓΕΙΑΣ"
+SOLAR_APPENDIX_INTRO = "Below are the details for the included <b>{solar_kw} kW</b> Solar Energy System. The price for this system is handled separately from the main house payment plan.<br/><br/>Ακολουθούν οι λεπτομέρειες για το συμπεριλαμβανόμενο Σύστημα Ηλιακής Ενέργειας <b>{solar_kw} kW</b>. Η τιμή για αυτό το σύστημα διαχειρίζεται ξεχωριστά από το πρόγραμμα πληρωμών του κυρίως σπιτιού."
+SOLAR_PANELS_ROW = ("Solar Panels / Ηλιακοί Συλλέκτες", "{solar_kw} kW High-Efficiency Monocrystalline Panels")
+SOLAR_APPENDIX_ROWS = [
+    ("Inverter / Μετατροπέας", "Hybrid Inverter with Grid-Tie Capability"),
+    ("Batteries / Μπαταρίες", "Lithium-Ion Battery Storage System (optional, priced separately)"),
+    ("Mounting System / Σύστημα Στήριξης", "Certified mounting structure for roof installation"),
+    ("Cabling & Connectors / Καλωδίωση & Συνδέσεις", "All necessary DC/AC cables, MC4 connectors, and safety switches"),
+    ("Installation & Commissioning / Εγκατάσταση & Θέση σε Λειτουργία", "Full professional installation and system commissioning"),
+]
+SOLAR_APPENDIX_TOTAL = "Total Price (Solar System) / Συνολική Τιμή (Ηλιακό Σύστημα)"
+
+HEATING_APPENDIX_HEADING = "APPENDIX C: FLOOR HEATING SYSTEM / ΠΑΡΑΡΤΗΜΑ Γ: ΣΥΣΤΗΜΑ ΕΝΔΟΔΑΠΕΔΙΑΣ ΘΕΡΜΑΝΣΗΣ"
+HEATING_APPENDIX_INTRO = "Below are the standard materials included in the Floor Heating System:<br/><br/>Ακολουθούν τα στάνταρ υλικά που περιλαμβάνονται στο Σύστημα Ενδοδαπέδιας Θέρμανσης:"
+HEATING_APPENDIX_ROWS = [
+    ("Nano Heat Paint", "Νάνο Θερμική Βαφή"),
+    ("48V 2000W Transformer", "Μετασχηματιστής 48V 2000W"),
+    ("Thermostat Control Unit", "Μονάδα Ελέγχου Θερμοστάτη"),
+    ("Wiring and Connection Terminals", "Καλωδίωση και Τερματικά Σύνδεσης"),
+    ("Insulation Layers", "Στρώσεις Μόνωσης"),
+    ("Subfloor Preparation Materials", "Υλικά Προετοιμασίας Υποδαπέδου"),
+]
+HEATING_APPENDIX_NOTE = "Note: Final material selection and detailed specifications will be confirmed during the design phase based on specific project requirements.<br/><br/>Σημείωση: Η τελική επιλογή υλικών και οι λεπτομερείς προδιαγραφές θα επιβεβαιωθούν κατά τη φάση του σχεδιασμού με βάση τις συγκεκριμένες απαιτήσεις του έργου."
+
+AETHER_APPENDIX_HEADING = "APPENDIX D: AETHER PACKAGE / ΠΑΡΑΡΤΗΜΑ Δ: ΠΑΚΕΤΟ AETHER"
+AETHER_APPENDIX_INTRO = "Below are the details for the included Aether Package. This package offers a comprehensive upgrade to the standard features.<br/><br/>Ακολουθούν οι λεπτομέρειες για το συμπεριλαμβανόμενο Πακέτο Aether. Αυτό το πακέτο προσφέρει μια ολοκληρωμένη αναβάθμιση στις στάνταρ λειτουργίες."
+AETHER_APPENDIX_ITEMS = [
+    "smart_home_systems_info", "white_goods_info", "sofa_info", "security_camera_info",
+    "exterior_cladding_info", "bedroom_set_info", "terrace_laminated_wood_flooring_info",
+    "porcelain_tiles_info", "concrete_panel_floor_info", "premium_faucets_info",
+    "designer_furniture_info", "italian_sofa_info", "inclass_chairs_info",
+    "exterior_wood_cladding_lambiri_info", "brushed_grey_granite_countertops_info"
+]
+AETHER_APPENDIX_TOTAL = "Total Price (Aether Package) / Συνολική Τιμή (Πακέτο Aether)"
+
+def _appendix_table(rows, styles, col_widths):
+    style = styles['NormalBilingual']
+    table_data = [[static_paragraph(cell, style) for cell in APPENDIX_TABLE_HEADER]]
+    table_data.extend(rows)
+    return Table(table_data, colWidths=col_widths, style=APPENDIX_TABLE_STYLE)
+
 def _create_solar_appendix_elements_en_gr(styles, project_details):
-    en_key = "SOLAR ENERGY SYSTEM"
-    gr_key = "ΣΥΣΤΗΜΑ ΗΛΙΑΚΗΣ ΕΝΕΡΓΕΙΑΣ"
-    
-    heading_text = f"APPENDIX B: {en_key.upper()} / ΠΑΡΑΡΤΗΜΑ Β: {gr_key}"
+    solar_kw = project_details['solar_kw']
     elements = [
         PageBreak(),
-        Paragraph(clean_invisible_chars(heading_text), styles['Heading']),
+        static_paragraph(SOLAR_APPENDIX_HEADING, styles['Heading']),
         Spacer(1, 8*mm),
-        Paragraph(clean_invisible_chars(f"Below are the details for the included <b>{project_details['solar_kw']} kW</b> Solar Energy System. The price for this system is handled separately from the main house payment plan.<br/><br/>Ακολουθούν οι λεπτομέρειες για το συμπεριλαμβανόμενο Σύστημα Ηλιακής Ενέργειας <b>{project_details['solar_kw']} kW</b>. Η τιμή για αυτό το σύστημα διαχειρίζεται ξεχωριστά από το πρόγραμμα πληρωμών του κυρίως σπιτιού."), styles['NormalBilingual']),
+        Paragraph(clean_invisible_chars(SOLAR_APPENDIX_INTRO.format(solar_kw=solar_kw)), styles['NormalBilingual']),
         Spacer(1, 8*mm),
     ]
 
-    solar_materials = [
-        [clean_invisible_chars("<b>Component / Εξάρτημα</b>"), clean_invisible_chars("<b>Description / Περιγραφή</b>")],
-        [clean_invisible_chars("Solar Panels / Ηλιακοί Συλλέκτες"), clean_invisible_chars(f"{project_details['solar_kw']} kW High-Efficiency Monocrystalline Panels")],
-        [clean_invisible_chars("Inverter / Μετατροπέας"), clean_invisible_chars("Hybrid Inverter with Grid-Tie Capability")],
-        [clean_invisible_chars("Batteries / Μπαταρίες"), clean_invisible_chars("Lithium-Ion Battery Storage System (optional, priced separately)")],
-        [clean_invisible_chars("Mounting System / Σύστημα Στήριξης"), clean_invisible_chars("Certified mounting structure for roof installation")],
-        [clean_invisible_chars("Cabling & Connectors / Καλωδίωση & Συνδέσεις"), clean_invisible_chars("All necessary DC/AC cables, MC4 connectors, and safety switches")],
-        [clean_invisible_chars("Installation & Commissioning / Εγκατάσταση & Θέση σε Λειτουργία"), clean_invisible_chars("Full professional installation and system commissioning")],
-    ]
-    table_data = [[Paragraph(clean_invisible_chars(cell), styles['NormalBilingual']) for cell in row] for row in solar_materials]
-    solar_table = Table(table_data, colWidths=[60*mm, 110*mm], style=TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#4a5568")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('LEFTPADDING', (0,0), (-1,-1), 6),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-    ]))
-    elements.append(solar_table)
-    
+    style = styles['NormalBilingual']
+    rows = [[static_paragraph(SOLAR_PANELS_ROW[0], style), Paragraph(clean_invisible_chars(SOLAR_PANELS_ROW[1].format(solar_kw=solar_kw)), style)]]
+    rows.extend([static_paragraph(component, style), static_paragraph(description, style)] for component, description in SOLAR_APPENDIX_ROWS)
+    elements.append(_appendix_table(rows, styles, [60*mm, 110*mm]))
+
     elements.append(Spacer(1, 12*mm))
-    elements.append(Paragraph(clean_invisible_chars("Total Price (Solar System) / Συνολική Τιμή (Ηλιακό Σύστημα)"), styles['Heading']))
+    elements.append(static_paragraph(SOLAR_APPENDIX_TOTAL, styles['Heading']))
     elements.append(Paragraph(format_currency(project_details['solar_price']), styles['PriceTotal']))
     return elements
 
 def _create_heating_appendix_elements_en_gr(styles, project_details):
-    en_key = "FLOOR HEATING SYSTEM"
-    gr_key = "ΣΥΣΤΗΜΑ ΕΝΔΟΔΑΠΕΔΙΑΣ ΘΕΡΜΑΝΣΗΣ"
-    
-    heading_text = f"APPENDIX C: {en_key.upper()} / ΠΑΡΑΡΤΗΜΑ Γ: {gr_key}"
     elements = [
         PageBreak(),
-        Paragraph(clean_invisible_chars(heading_text), styles['Heading']),
+        static_paragraph(HEATING_APPENDIX_HEADING, styles['Heading']),
         Spacer(1, 8*mm),
-        Paragraph(clean_invisible_chars("Below are the standard materials included in the Floor Heating System:<br/><br/>Ακολουθούν τα στάνταρ υλικά που περιλαμβάνονται στο Σύστημα Ενδοδαπέδιας Θέρμανσης:"), styles['NormalBilingual']),
+        static_paragraph(HEATING_APPENDIX_INTRO, styles['NormalBilingual']),
         Spacer(1, 4*mm),
     ]
-    heating_materials_en_lines = [
-        "Nano Heat Paint", "48V 2000W Transformer", "Thermostat Control Unit",
-        "Wiring and Connection Terminals", "Insulation Layers", "Subfloor Preparation Materials"
-    ]
-    heating_materials_gr_lines = [
-        "Νάνο Θερμική Βαφή", "Μετασχηματιστής 48V 2000W", "Μονάδα Ελέγχου Θερμοστάτη",
-        "Καλωδίωση και Τερματικά Σύνδεσης", "Στρώσεις Μόνωσης", "Υλικά Προετοιμασίας Υποδαπέδου"
-    ]
-    
-    heating_materials = [
-        [clean_invisible_chars("<b>Component / Εξάρτημα</b>"), clean_invisible_chars("<b>Description / Περιγραφή</b>")],
-    ]
-    for en_mat, gr_mat in zip(heating_materials_en_lines, heating_materials_gr_lines):
-        heating_materials.append([
-            Paragraph(clean_invisible_chars(en_mat) + " / " + clean_invisible_chars(gr_mat), styles['NormalBilingual'])
-        ])
 
-    table_data = [[Paragraph(clean_invisible_chars(cell), styles['NormalBilingual']) for cell in row] for row in heating_materials]
-    elements.append(Table(table_data, colWidths=[70*mm, 100*mm], style=TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#4a5568")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('LEFTPADDING', (0,0), (-1,-1), 6),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-    ])))
+    style = styles['NormalBilingual']
+    rows = [[static_paragraph(en_mat, style), static_paragraph(gr_mat, style)] for en_mat, gr_mat in HEATING_APPENDIX_ROWS]
+    elements.append(_appendix_table(rows, styles, [70*mm, 100*mm]))
     elements.append(Spacer(1, 8*mm))
-    elements.append(Paragraph(clean_invisible_chars("Note: Final material selection and detailed specifications will be confirmed during the design phase based on specific project requirements.<br/><br/>Σημείωση: Η τελική επιλογή υλικών και οι λεπτομερείς προδιαγραφές θα επιβεβαιωθούν κατά τη φάση του σχεδιασμού με βάση τις συγκεκριμένες απαιτήσεις του έργου."), styles['NormalBilingual']))
+    elements.append(static_paragraph(HEATING_APPENDIX_NOTE, styles['NormalBilingual']))
     return elements
 
 
 def _create_aether_appendix_elements_en_gr(styles, project_details):
-    en_key = "AETHER PACKAGE"
-    gr_key = "ΠΑΚΕΤΟ AETHER"
-    
-    heading_text = f"APPENDIX D: {en_key.upper()} / ΠΑΡΑΡΤΗΜΑ Δ: {gr_key}"
     elements = [
         PageBreak(),
-        Paragraph(clean_invisible_chars(heading_text), styles['Heading']),
+        static_paragraph(AETHER_APPENDIX_HEADING, styles['Heading']),
         Spacer(1, 8*mm),
-        Paragraph(clean_invisible_chars(f"Below are the details for the included Aether Package. This package offers a comprehensive upgrade to the standard features.<br/><br/>Ακολουθούν οι λεπτομέρειες για το συμπεριλαμβανόμενο Πακέτο Aether. Αυτό το πακέτο προσφέρει μια ολοκληρωμένη αναβάθμιση στις στάνταρ λειτουργίες."), styles['NormalBilingual']),
+        static_paragraph(AETHER_APPENDIX_INTRO, styles['NormalBilingual']),
         Spacer(1, 8*mm),
     ]
 
-    aether_materials = [
-        [clean_invisible_chars("<b>Component / Εξάρτημα</b>"), clean_invisible_chars("<b>Description / Περιγραφή</b>")],
-    ]
-    
-    aether_items = [
-        "smart_home_systems_info", "white_goods_info", "sofa_info", "security_camera_info",
-        "exterior_cladding_info", "bedroom_set_info", "terrace_laminated_wood_flooring_info",
-        "porcelain_tiles_info", "concrete_panel_floor_info", "premium_faucets_info",
-        "designer_furniture_info", "italian_sofa_info", "inclass_chairs_info",
-        "exterior_wood_cladding_lambiri_info", "brushed_grey_granite_countertops_info"
-    ]
-    
-    for item_key in aether_items:
+    style = styles['NormalBilingual']
+    rows = []
+    for item_key in AETHER_APPENDIX_ITEMS:
         en_desc = MATERIAL_INFO_ITEMS.get(item_key)
         gr_desc = TRANSLATIONS.get(en_desc, ["", ""])[1]
-        aether_materials.append([
-            Paragraph(clean_invisible_chars(en_desc), styles['NormalBilingual']),
-            Paragraph(clean_invisible_chars(gr_desc), styles['NormalBilingual'])
-        ])
+        rows.append([static_paragraph(en_desc, style), static_paragraph(gr_desc, style)])
+    elements.append(_appendix_table(rows, styles, [70*mm, 100*mm]))
 
-    table_data = [[Paragraph(clean_invisible_chars(cell), styles['NormalBilingual']) for cell in row] for row in aether_materials]
-    elements.append(Table(table_data, colWidths=[70*mm, 100*mm], style=TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#4a5568")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('LEFTPADDING', (0,0), (-1,-1), 6),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-    ])))
     elements.append(Spacer(1, 12*mm))
-    elements.append(Paragraph(clean_invisible_chars("Total Price (Aether Package) / Συνολική Τιμή (Πακέτο Aether)"), styles['Heading']))
+    elements.append(static_paragraph(AETHER_APPENDIX_TOTAL, styles['Heading']))
     elements.append(Paragraph(format_currency(project_details['aether_package_sales_price']), styles['PriceTotal']))
     return elements
 
+def _warm_static_paragraphs(styles):
+    """Eklerin statik paragraflarını önceden ayrıştırarak önbelleğe alır."""
+    sample = {'solar_kw': 0, 'solar_price': 0, 'aether_package_sales_price': 0}
+    _create_solar_appendix_elements_en_gr(styles, sample)
+    _create_heating_appendix_elements_en_gr(styles, sample)
+    _create_aether_appendix_elements_en_gr(styles, sample)
+
 def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_price, total_price, project_details, customer_info, extra_expenses_info, logo_data_b64):
     """Müşteri için profesyonel bir teklif PDF'i oluşturur (İngilizce ve Yunanca)."""
-    buffer = io.BytesIO()
+    buffer = spooled_buffer()
     doc = SimpleDocTemplate(
         buffer,
         pagesize=A4,
         rightMargin=15*mm,
         leftMargin=15*mm,
         topMargin=40*mm,
-        bottomMargin=25*mm
+        bottomMargin=25*mm,
+        invariant=PDF_INVARIANT
     )
     doc.customer_name = customer_info['name']
     doc.company_name = COMPANY_INFO['name']
-    doc.main_font = "FreeSans"
+    doc.main_font = FONTS.register()
     doc.logo_data_b64 = logo_data_b64
 
-    def _proposal_page_callback(canvas_obj, doc):
-        draw_pdf_header_and_footer_common(canvas_obj, doc, customer_info, COMPANY_INFO, doc.logo_data_b64, 'en_gr')
-    
-    doc.onFirstPage = _proposal_page_callback
-    doc.onLaterPages = _proposal_page_callback
+    page_renderer = HeaderFooterRenderer(COMPANY_INFO, doc.logo_data_b64, 'en_gr')
+    doc.onFirstPage = page_renderer
+    doc.onLaterPages = page_renderer
 
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(name='NormalBilingual', parent=styles['Normal'], fontSize=8, leading=10, spaceAfter=2, fontName=doc.main_font))
-    styles.add(ParagraphStyle(name='Heading', parent=styles['Heading2'], fontSize=11, spaceAfter=5, spaceBefore=10, fontName=f"{doc.main_font}-Bold", textColor=colors.HexColor("#3182ce"), alignment=TA_LEFT))
-    styles.add(ParagraphStyle(name='PriceTotal', parent=styles['Heading1'], fontSize=21, alignment=TA_CENTER, spaceAfter=10, fontName=f"{doc.main_font}-Bold", textColor=colors.HexColor("#c53030")))
-    styles.add(ParagraphStyle(name='SectionSubheading', parent=styles['Heading3'], fontSize=9, spaceAfter=3, spaceBefore=7, fontName=f"{doc.main_font}-Bold", textColor=colors.HexColor("#4a5568")))
-    title_style = ParagraphStyle(name='Title', parent=styles['Heading1'], fontSize=17, alignment=TA_CENTER, spaceAfter=10, fontName=f"{doc.main_font}-Bold", textColor=colors.HexColor("#3182ce"))
-    subtitle_style = ParagraphStyle(name='Subtitle', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER, spaceAfter=7, fontName=doc.main_font, textColor=colors.HexColor("#4a5568"))
-    payment_heading_style = ParagraphStyle(name='PaymentHeading', parent=styles['Heading3'], fontSize=9, spaceAfter=3, spaceBefore=7, fontName=f"{doc.main_font}-Bold")
-    colored_table_header_style = ParagraphStyle(name='ColoredTableHeader', parent=styles['Normal'], fontSize=8, fontName=f"{doc.main_font}-Bold", textColor=colors.white, alignment=TA_LEFT)
+    styles = get_pdf_styles(doc.main_font)
+    title_style = styles['ProposalTitle']
+    subtitle_style = styles['ProposalSubtitle']
+    payment_heading_style = styles['PaymentHeading']
+    colored_table_header_style = styles['ColoredTableHeader']
     
     elements = []
     elements.append(Spacer(1, 40*mm))
@@ -233,7 +376,7 @@ def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_
     if customer_info['company']:
         elements.append(Paragraph(clean_invisible_chars(f"{TRANSLATIONS['Company'][0]} / {TRANSLATIONS['Company'][1]}: {customer_info['company']}"), subtitle_style))
     elements.append(Spacer(1, 8*mm))
-    elements.append(Paragraph(clean_invisible_chars(f"{TRANSLATIONS['Date'][0]} / {TRANSLATIONS['Date'][1]}: {datetime.now().strftime('%d/%m/%Y')}"), subtitle_style))
+    elements.append(Paragraph(clean_invisible_chars(f"{TRANSLATIONS['Date'][0]} / {TRANSLATIONS['Date'][1]}: {document_date(project_details)}"), subtitle_style))
     elements.append(PageBreak())
 
     elements.append(Paragraph(clean_invisible_chars(f"{TRANSLATIONS['CUSTOMER & PROJECT INFORMATION'][0]} / {TRANSLATIONS['CUSTOMER & PROJECT INFORMATION'][1]}"), styles['Heading']))
@@ -242,14 +385,14 @@ def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_
     elements.append(Spacer(1, 8*mm))
 
     customer_info_table_data = [
-        [Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Name'][0]} / {TRANSLATIONS['Name'][1]}:</b>"), styles['NormalBilingual']), Paragraph(clean_invisible_chars(f"{customer_info['name']}"), styles['NormalBilingual'])],
-        [Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Company'][0]} / {TRANSLATIONS['Company'][1]}:</b>"), styles['NormalBilingual']), Paragraph(clean_invisible_chars(f"{customer_info.get('company', '')}"), styles['NormalBilingual'])],
-        [Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Address'][0]} / {TRANSLATIONS['Address'][1]}:</b>"), styles['NormalBilingual']), Paragraph(clean_invisible_chars(f"{customer_info.get('address', '')}"), styles['NormalBilingual'])],
-        [Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Phone'][0]} / {TRANSLATIONS['Phone'][1]}:</b>"), styles['NormalBilingual']), Paragraph(clean_invisible_chars(f"{customer_info.get('phone', '')}"), styles['NormalBilingual'])],
-        [Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['ID/Passport No'][0]} / {TRANSLATIONS['ID/Passport No'][1]}:</b>"), styles['NormalBilingual']), Paragraph(clean_invisible_chars(f"{customer_info.get('id_no', '')}"), styles['NormalBilingual'])],
+        [static_paragraph(f"<b>{TRANSLATIONS['Name'][0]} / {TRANSLATIONS['Name'][1]}:</b>", styles['NormalBilingual']), Paragraph(clean_invisible_chars(f"{customer_info['name']}"), styles['NormalBilingual'])],
+        [static_paragraph(f"<b>{TRANSLATIONS['Company'][0]} / {TRANSLATIONS['Company'][1]}:</b>", styles['NormalBilingual']), Paragraph(clean_invisible_chars(f"{customer_info.get('company', '')}"), styles['NormalBilingual'])],
+        [static_paragraph(f"<b>{TRANSLATIONS['Address'][0]} / {TRANSLATIONS['Address'][1]}:</b>", styles['NormalBilingual']), Paragraph(clean_invisible_chars(f"{customer_info.get('address', '')}"), styles['NormalBilingual'])],
+        [static_paragraph(f"<b>{TRANSLATIONS['Phone'][0]} / {TRANSLATIONS['Phone'][1]}:</b>", styles['NormalBilingual']), Paragraph(clean_invisible_chars(f"{customer_info.get('phone', '')}"), styles['NormalBilingual'])],
+        [static_paragraph(f"<b>{TRANSLATIONS['ID/Passport No'][0]} / {TRANSLATIONS['ID/Passport No'][1]}:</b>", styles['NormalBilingual']), Paragraph(clean_invisible_chars(f"{customer_info.get('id_no', '')}"), styles['NormalBilingual'])],
     ]
     customer_info_table = Table(customer_info_table_data, colWidths=[65*mm, 105*mm])
-    customer_info_table.setStyle(TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)]))
+    customer_info_table.setStyle(INFO_TABLE_STYLE)
     elements.append(customer_info_table)
     elements.append(Spacer(1, 8*mm))
 
@@ -286,14 +429,14 @@ def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_
         Όλες οι εργασίες συγκόλλησης προφίλ μας διαθέτουν πιστοποιητικό EN3834 σύμφωνα με τα ευρωπαϊκά πρότυπα. Όλες οι διαδικασίες κατασκευασίας του κτιρίου υπόκεινται σε ευρωπαϊκά πρότυπα ve επιθεώρηση άδειας κατασκευασίας EN 1090-1 Steel Construction.
         """
     building_structure_table_data = [
-        [Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Construction Type'][0]} / {TRANSLATIONS['Construction Type'][1]}</b>"), styles['NormalBilingual']), Paragraph(project_details['structure_type'], styles['NormalBilingual'])],
-        [Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Steel Structure Details'][0]} / {TRANSLATIONS['Steel Structure Details'][1]}</b>"), styles['NormalBilingual']), Paragraph(clean_invisible_chars(building_structure_details_en_gr), styles['NormalBilingual'])],
-        [Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Interior Walls'][0]} / {TRANSLATIONS['Interior Walls'][1]}</b>"), styles['NormalBilingual']), Paragraph(clean_invisible_chars(INTERIOR_WALLS_DESCRIPTION_EN_GR), styles['NormalBilingual']) if project_details['plasterboard_interior'] or project_details['plasterboard_all'] else Paragraph(clean_invisible_chars("Not Included / Δεν περιλαμβάνεται"), styles['NormalBilingual'])],
-        [Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Roof'][0]} / {TRANSLATIONS['Roof'][1]}</b>"), styles['NormalBilingual']), Paragraph(clean_invisible_chars(ROOF_DESCRIPTION_EN_GR), styles['NormalBilingual'])],
-        [Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Exterior Walls'][0]} / {TRANSLATIONS['Exterior Walls'][1]}</b>"), styles['NormalBilingual']), Paragraph(clean_invisible_chars(EXTERIOR_WALLS_DESCRIPTION_EN_GR), styles['NormalBilingual']) if project_details['facade_sandwich_panel_included'] else Paragraph(clean_invisible_chars("Not Included / Δεν περιλαμβάνεται"), styles['NormalBilingual'])],
+        [static_paragraph(f"<b>{TRANSLATIONS['Construction Type'][0]} / {TRANSLATIONS['Construction Type'][1]}</b>", styles['NormalBilingual']), Paragraph(project_details['structure_type'], styles['NormalBilingual'])],
+        [static_paragraph(f"<b>{TRANSLATIONS['Steel Structure Details'][0]} / {TRANSLATIONS['Steel Structure Details'][1]}</b>", styles['NormalBilingual']), Paragraph(clean_invisible_chars(building_structure_details_en_gr), styles['NormalBilingual'])],
+        [static_paragraph(f"<b>{TRANSLATIONS['Interior Walls'][0]} / {TRANSLATIONS['Interior Walls'][1]}</b>", styles['NormalBilingual']), static_paragraph(INTERIOR_WALLS_DESCRIPTION_EN_GR, styles['NormalBilingual']) if project_details['plasterboard_interior'] or project_details['plasterboard_all'] else static_paragraph("Not Included / Δεν περιλαμβάνεται", styles['NormalBilingual'])],
+        [static_paragraph(f"<b>{TRANSLATIONS['Roof'][0]} / {TRANSLATIONS['Roof'][1]}</b>", styles['NormalBilingual']), static_paragraph(ROOF_DESCRIPTION_EN_GR, styles['NormalBilingual'])],
+        [static_paragraph(f"<b>{TRANSLATIONS['Exterior Walls'][0]} / {TRANSLATIONS['Exterior Walls'][1]}</b>", styles['NormalBilingual']), static_paragraph(EXTERIOR_WALLS_DESCRIPTION_EN_GR, styles['NormalBilingual']) if project_details['facade_sandwich_panel_included'] else static_paragraph("Not Included / Δεν περιλαμβάνεται", styles['NormalBilingual'])],
     ]
     building_materials_table = Table(building_structure_table_data, colWidths=[60*mm, 110*mm])
-    building_materials_table.setStyle(TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)]))
+    building_materials_table.setStyle(INFO_TABLE_STYLE)
     elements.append(building_materials_table)
     elements.append(Spacer(1, 5*mm))
 
@@ -301,13 +444,13 @@ def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_
     
     floor_covering_text = project_details.get('floor_covering_type', 'N/A')
     interior_insulation_table_data.append([
-        Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Interior'][0]} / {TRANSLATIONS['Interior'][1]}</b>"), styles['NormalBilingual']),
+        static_paragraph(f"<b>{TRANSLATIONS['Interior'][0]} / {TRANSLATIONS['Interior'][1]}</b>", styles['NormalBilingual']),
         Paragraph(clean_invisible_chars(f"{TRANSLATIONS['Floor Covering'][0]}: {floor_covering_text}."), styles['NormalBilingual'])
     ])
     
     insulation_text = f"{TRANSLATIONS['Floor Insulation'][0]}: {get_yes_no_empty(project_details['insulation_floor'])}. {TRANSLATIONS['Wall Insulation'][0]}: {get_yes_no_empty(project_details['insulation_wall'])}."
     interior_insulation_table_data.append([
-        Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Insulation'][0]} / {TRANSLATIONS['Insulation'][1]}</b>"), styles['NormalBilingual']),
+        static_paragraph(f"<b>{TRANSLATIONS['Insulation'][0]} / {TRANSLATIONS['Insulation'][1]}</b>", styles['NormalBilingual']),
         Paragraph(clean_invisible_chars(insulation_text), styles['NormalBilingual'])
     ])
     
@@ -326,12 +469,12 @@ def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_
         floor_insulation_details_text.append(clean_invisible_chars("<i>Note: Insulation thickness can be increased. Ceramic coating can be preferred. (without concrete, special floor system)</i>"))
         
         interior_insulation_table_data.append([
-            Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Floor Insulation Materials'][0]} / {TRANSLATIONS['Floor Insulation Materials'][1]}:</b>"), styles['NormalBilingual']),
+            static_paragraph(f"<b>{TRANSLATIONS['Floor Insulation Materials'][0]} / {TRANSLATIONS['Floor Insulation Materials'][1]}:</b>", styles['NormalBilingual']),
             Paragraph("<br/>".join(floor_insulation_details_text), styles['NormalBilingual'])
         ])
 
     interior_insulation_table = Table(interior_insulation_table_data, colWidths=[60*mm, 110*mm])
-    interior_insulation_table.setStyle(TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)]))
+    interior_insulation_table.setStyle(INFO_TABLE_STYLE)
     elements.append(interior_insulation_table)
     elements.append(Spacer(1, 5*mm))
 
@@ -352,10 +495,10 @@ def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_
         openings_text_en_gr_str = "No openings specified / Δεν καθορίστηκαν ανοίγματα"
 
     openings_table_data = [
-        [Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Openings'][0]} / {TRANSLATIONS['Openings'][1]}</b>"), styles['NormalBilingual']), Paragraph(openings_text_en_gr_str, styles['NormalBilingual'])],
+        [static_paragraph(f"<b>{TRANSLATIONS['Openings'][0]} / {TRANSLATIONS['Openings'][1]}</b>", styles['NormalBilingual']), Paragraph(openings_text_en_gr_str, styles['NormalBilingual'])],
     ]
     openings_table = Table(openings_table_data, colWidths=[60*mm, 110*mm])
-    openings_table.setStyle(TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)]))
+    openings_table.setStyle(INFO_TABLE_STYLE)
     elements.append(openings_table)
     elements.append(Spacer(1, 5*mm))
 
@@ -365,43 +508,43 @@ def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_
 
     kitchen_choice = project_details.get('kitchen_choice', 'No Kitchen')
     other_features_table_data.append([
-        Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Kitchen'][0]} / {TRANSLATIONS['Kitchen'][1]}</b>"), styles['NormalBilingual']),
+        static_paragraph(f"<b>{TRANSLATIONS['Kitchen'][0]} / {TRANSLATIONS['Kitchen'][1]}</b>", styles['NormalBilingual']),
         Paragraph(clean_invisible_chars(project_details.get('kitchen_type_display_en_gr', 'No')), styles['NormalBilingual'])
     ])
     if kitchen_choice != 'No Kitchen':
         other_features_table_data.append([
-            Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Kitchen Materials'][0]} / {TRANSLATIONS['Kitchen Materials'][1]}</b>"), styles['NormalBilingual']),
-            Paragraph(clean_invisible_chars(KITCHEN_MATERIALS_EN) + "<br/><br/>" + clean_invisible_chars(KITCHEN_MATERIALS_GR), styles['NormalBilingual'])
+            static_paragraph(f"<b>{TRANSLATIONS['Kitchen Materials'][0]} / {TRANSLATIONS['Kitchen Materials'][1]}</b>", styles['NormalBilingual']),
+            static_paragraph(_bilingual_block(KITCHEN_MATERIALS_EN, KITCHEN_MATERIALS_GR), styles['NormalBilingual'])
         ])
 
     other_features_table_data.append([
-        Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Shower/WC'][0]} / {TRANSLATIONS['Shower/WC'][1]}</b>"), styles['NormalBilingual']),
+        static_paragraph(f"<b>{TRANSLATIONS['Shower/WC'][0]} / {TRANSLATIONS['Shower/WC'][1]}</b>", styles['NormalBilingual']),
         Paragraph(clean_invisible_chars(get_yes_no_empty(project_details['shower_wc'])), styles['NormalBilingual'])
     ])
     if project_details['shower_wc']:
         other_features_table_data.append([
-            Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Shower/WC Materials'][0]} / {TRANSLATIONS['Shower/WC'][1]}:</b>"), styles['NormalBilingual']),
-            Paragraph(clean_invisible_chars(SHOWER_WC_MATERIALS_EN) + "<br/><br/>" + clean_invisible_chars(SHOWER_WC_MATERIALS_GR), styles['NormalBilingual'])
+            static_paragraph(f"<b>{TRANSLATIONS['Shower/WC Materials'][0]} / {TRANSLATIONS['Shower/WC'][1]}:</b>", styles['NormalBilingual']),
+            static_paragraph(_bilingual_block(SHOWER_WC_MATERIALS_EN, SHOWER_WC_MATERIALS_GR), styles['NormalBilingual'])
         ])
 
     other_features_table_data.append([
-        Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Electrical'][0]} / {TRANSLATIONS['Electrical'][1]}</b>"), styles['NormalBilingual']),
+        static_paragraph(f"<b>{TRANSLATIONS['Electrical'][0]} / {TRANSLATIONS['Electrical'][1]}</b>", styles['NormalBilingual']),
         Paragraph(clean_invisible_chars(get_yes_no_empty(project_details['electrical'])), styles['NormalBilingual'])
     ])
     if project_details['electrical']:
         other_features_table_data.append([
             Paragraph('', styles['NormalBilingual']),
-            Paragraph(clean_invisible_chars(ELECTRICAL_MATERIALS_EN.strip()) + "<br/><br/>" + clean_invisible_chars(ELECTRICAL_MATERIALS_GR.strip()), styles['NormalBilingual'])
+            static_paragraph(_bilingual_block(ELECTRICAL_MATERIALS_EN, ELECTRICAL_MATERIALS_GR), styles['NormalBilingual'])
         ])
 
     other_features_table_data.append([
-        Paragraph(clean_invisible_chars(f"<b>{TRANSLATIONS['Plumbing'][0]} / {TRANSLATIONS['Plumbing'][1]}</b>"), styles['NormalBilingual']),
+        static_paragraph(f"<b>{TRANSLATIONS['Plumbing'][0]} / {TRANSLATIONS['Plumbing'][1]}</b>", styles['NormalBilingual']),
         Paragraph(clean_invisible_chars(get_yes_no_empty(project_details['plumbing'])), styles['NormalBilingual'])
     ])
     if project_details['plumbing']:
         other_features_table_data.append([
             Paragraph('', styles['NormalBilingual']),
-            Paragraph(clean_invisible_chars(PLUMBING_MATERIALS_EN.strip()) + "<br/><br/>" + clean_invisible_chars(PLUMBING_MATERIALS_GR.strip()), styles['NormalBilingual'])
+            static_paragraph(_bilingual_block(PLUMBING_MATERIALS_EN, PLUMBING_MATERIALS_GR), styles['NormalBilingual'])
         ])
 
     extra_general_additions_list_en_gr = []
@@ -450,7 +593,7 @@ def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_
         other_features_table_data.append([Paragraph('<b>Extra General Additions / Έξτρα Γενικές Προσθήκες</b>', styles['NormalBilingual']), Paragraph("<br/>".join(extra_general_additions_list_en_gr), styles['NormalBilingual'])])
 
     other_features_table = Table(other_features_table_data, colWidths=[60*mm, 110*mm])
-    other_features_table.setStyle(TableStyle([('VALIGN', (0,0), (-1,-1), 'TOP'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)]))
+    other_features_table.setStyle(INFO_TABLE_STYLE)
     elements.append(other_features_table)
     elements.append(Spacer(1, 5*mm))
 
@@ -484,17 +627,7 @@ def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_
     ])
 
     price_summary_table = Table(price_table_data, colWidths=[120*mm, 50*mm])
-    price_summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,-1), colors.HexColor("#3182ce")),
-        ('TEXTCOLOR', (0,0), (-1,-1), colors.white),
-        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('LEFTPADDING', (0,0), (-1,-1), 8),
-        ('RIGHTPADDING', (0,0), (-1,-1), 8),
-        ('TOPPADDING', (0,0), (-1,-1), 8),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 8),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor("#4a5568")),
-    ]))
+    price_summary_table.setStyle(PRICE_SUMMARY_TABLE_STYLE)
     final_page_elements.append(price_summary_table)
     final_page_elements.append(Spacer(1, 8*mm))
 
@@ -548,7 +681,7 @@ def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_
         payment_data.append([Paragraph("   - Due upon contract signing / Με την υπογραφή της σύμβασης.", styles['NormalBilingual']), ""])
 
     payment_table = Table(payment_data, colWidths=[120*mm, 50*mm])
-    payment_table.setStyle(TableStyle([('ALIGN', (0,0), (-1,-1), 'LEFT'), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('LEFTPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)]))
+    payment_table.setStyle(PAYMENT_TABLE_STYLE)
     final_page_elements.append(payment_table)
     elements.append(KeepTogether(final_page_elements))
 
@@ -556,19 +689,11 @@ def create_customer_proposal_pdf_en_gr(house_price, solar_price, aether_package_
         solar_elements = _create_solar_appendix_elements_en_gr(styles, project_details)
         elements.extend(solar_elements)
     if project_details['heating']:
-        heating_elements = _create_heating_appendix_elements_en_gr(styles)
+        heating_elements = _create_heating_appendix_elements_en_gr(styles, project_details)
         elements.extend(heating_elements)
     if project_details['aether_package_choice'] != 'None':
         aether_elements = _create_aether_appendix_elements_en_gr(styles, project_details)
         elements.extend(aether_elements)
 
     doc.build(elements)
-    buffer.seek(0)
-    return buffer.getvalue()
-```
-
-
-I have selected the `pdf-generator-final` Canvas above and will make edits to it.
-I'll also keep in mind the previous context from our conversation, and will address all parts of your query.
-
-I have updated the `pdf_generator.py` file to fix the `ImportError: attempted relative import with no known parent package` error. The fix involves removing the leading dot from the import statements, so they become `from config import ...` instead of `from .config import ...`. This ensures that Python can find the files correctly in the Render environment. I have also fixed the `SyntaxError` on line 406 by removing the extra closing parenthes
+    return read_buffer(buffer)
@@ -0,0 +1,108 @@
+# pdf_render_pool.py
+# Bu dosya, bir teklifin PDF belgelerini (iç maliyet raporu, müşteri teklifi, satış
+# sözleşmesi) eşzamanlı olarak oluşturan isteğe bağlı render havuzunu içerir.
+# reportlab saf Python olduğundan ve GIL'e takıldığından iş parçacığı yerine süreç havuzu
+# kullanılır. Fontlar ve stiller her çalışan süreçte yalnızca bir kez hazırlanır.
+
+import time
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _init_worker():
+    """Çalışan süreç başlangıcında PDF kaynaklarını (fontlar, stiller) hazırlar."""
+    import pdf_generator
+    pdf_generator.initialize_pdf_resources()
+
+
+def _render(builder_name, args):
+    """pdf_generator içindeki adı verilen oluşturucuyu çalıştırır; (PDF baytları, süre) döndürür."""
+    import pdf_generator
+    pdf_generator.initialize_pdf_resources()
+    start = time.perf_counter()
+    data = getattr(pdf_generator, builder_name)(*args)
+    return data, time.perf_counter() - start
+
+
+class PDFRenderPool:
+    """
+    PDF oluşturucularını paralel çalıştırır.
+    workers <= 0 ise havuz kullanılmaz ve belgeler mevcut süreçte sırayla oluşturulur.
+    """
+
+    def __init__(self, workers=0, start_method="spawn"):
+        self.workers = workers
+        self.start_method = start_method
+        self._executor = None
+        # Eşzamanlı ilk istekler ayrı havuzlar (ve sızan çalışan süreçler) oluşturmasın.
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        executor = self._executor
+        if executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    context = multiprocessing.get_context(self.start_method)
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                                         initializer=_init_worker)
+                executor = self._executor
+        return executor
+
+    def render_all(self, jobs, timings=None):
+        """
+        `jobs`: {belge_adı: (oluşturucu_adı, argüman_demeti)}.
+        Tüm belgeler bittiğinde {belge_adı: pdf_baytları} döndürür. `timings` sözlüğü
+        verilirse her belgenin oluşturma süresi (saniye) bu sözlüğe yazılır.
+        """
+        if self.workers <= 0:
+            rendered = {name: _render(builder_name, args) for name, (builder_name, args) in jobs.items()}
+        else:
+            try:
+                executor = self._get_executor()
+                futures = {name: executor.submit(_render, builder_name, args) for name, (builder_name, args) in jobs.items()}
+                rendered = {name: future.result() for name, future in futures.items()}
+            except BrokenProcessPool as e:
+                # Çöken bir çalışan havuzu kullanılamaz hale getirir; bu istek için sırayla devam et.
+                print(f"UYARI: PDF render havuzu bozuldu, belgeler sırayla oluşturulacak: {e}")
+                self.shutdown(wait=False)
+                rendered = {name: _render(builder_name, args) for name, (builder_name, args) in jobs.items()}
+        if timings is not None:
+            timings.update({name: seconds for name, (_, seconds) in rendered.items()})
+        return {name: data for name, (data, _) in rendered.items()}
+
+    def submit(self, builder_name, args):
+        """
+        Tek bir belgeyi oluşturur; sonucu (PDF baytları, süre) olan bir Future döndürür.
+        workers <= 0 ise belge hemen bu süreçte oluşturulur. Toplu işler sınırlı sayıda
+        Future'ı beklemede tutarak belgeleri akış halinde işler.
+        """
+        if self.workers <= 0:
+            future = Future()
+            try:
+                future.set_result(_render(builder_name, args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        try:
+            return self._get_executor().submit(_render, builder_name, args)
+        except BrokenProcessPool as e:
+            print(f"UYARI: PDF render havuzu bozuldu, yeniden başlatılıyor: {e}")
+            self.shutdown(wait=False)
+            return self._get_executor().submit(_render, builder_name, args)
+
+    def warm_up(self):
+        """Çalışan süreçleri önceden başlatır (ilk teklifte başlatma gecikmesini önlemek için)."""
+        if self.workers <= 0:
+            _init_worker()
+            return
+        executor = self._get_executor()
+        for future in [executor.submit(_init_worker) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self, wait=True):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
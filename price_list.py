@@ -0,0 +1,272 @@
+# price_list.py
+# Bu dosya, fiyat listesinin sürümlenmiş ve değiştirilemez anlık görüntülerini (snapshot) yönetir.
+# Fiyatlar varsayılan olarak config.FIYATLAR'dan, PRICE_LIST_PATH ayarlıysa bir JSON, CSV veya
+# YAML dosyasından okunur. Yeni liste doğrulandıktan sonra tek bir referans atamasıyla devreye
+# alınır; devam eden teklifler başladıkları anlık görüntüyle hesaplanmaya devam eder.
+
+import os
+import csv
+import json
+import math
+import time
+import threading
+from types import MappingProxyType
+
+from config import (
+    FIYATLAR, PRICE_LIST_PATH, PRICE_LIST_WATCH_SECONDS, compute_price_list_version, default_price_rates,
+)
+from pricing_rules import required_price_keys
+
+# Kural tablosunun (calculate_costs_detailed ve calculate_costs_batch) doğrudan okuduğu fiyat
+# anahtarları. Manuel çelik profil fiyatları ve 'aether_package_cost' isteğe bağlıdır (yoksa 0 kabul edilir).
+REQUIRED_PRICE_KEYS = required_price_keys()
+
+# Fiyat listesi dosyasında fiyatlarla birlikte verilebilecek oranlar
+RATE_KEYS = ('fire_rate', 'vat_rate', 'monthly_accounting_expenses', 'monthly_office_rent')
+
+
+class PriceListError(ValueError):
+    """Fiyat listesi okunamadığında veya doğrulamadan geçemediğinde fırlatılır."""
+
+
+class PriceList:
+    """
+    Fiyat listesinin değiştirilemez anlık görüntüsü. `prices` salt okunur bir eşlemedir
+    (O(1) sözlük okuması); `version` içerikten türetilir ve teklif sonuçlarına yazılır.
+    """
+    __slots__ = ('prices', 'fire_rate', 'vat_rate', 'monthly_accounting_expenses', 'monthly_office_rent',
+                 'version', 'source', 'loaded_at')
+
+    def __init__(self, prices, rates=None, source="config"):
+        rates = dict(default_price_rates(), **(rates or {}))
+        validate_price_list(prices, rates)
+        object.__setattr__(self, 'prices', MappingProxyType(dict(prices)))
+        for key in RATE_KEYS:
+            object.__setattr__(self, key, rates[key])
+        object.__setattr__(self, 'version', compute_price_list_version(prices, rates))
+        object.__setattr__(self, 'source', source)
+        object.__setattr__(self, 'loaded_at', time.time())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PriceList değiştirilemez")
+
+    def __reduce__(self):
+        # Süreç havuzlarına gönderilebilmesi için (salt okunur eşleme doğrudan pickle edilemez).
+        return (PriceList, (dict(self.prices), self.rates, self.source))
+
+    @property
+    def rates(self):
+        return {key: getattr(self, key) for key in RATE_KEYS}
+
+    def describe(self):
+        return {
+            "version": self.version,
+            "source": self.source,
+            "loaded_at": self.loaded_at,
+            "price_count": len(self.prices),
+            "rates": self.rates,
+        }
+
+    def __repr__(self):
+        return f"PriceList(version={self.version!r}, source={self.source!r}, prices={len(self.prices)})"
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def validate_price_list(prices, rates):
+    """Zorunlu anahtarların varlığını ve tüm değerlerin negatif olmayan sayılar olduğunu denetler."""
+    missing = [key for key in REQUIRED_PRICE_KEYS if key not in prices]
+    if missing:
+        raise PriceListError(f"Fiyat listesinde eksik anahtarlar: {', '.join(missing)}")
+    invalid = [key for key, value in prices.items() if not _is_number(value) or value < 0]
+    if invalid:
+        raise PriceListError(f"Geçersiz fiyat değerleri: {', '.join(sorted(invalid))}")
+    for key in RATE_KEYS:
+        value = rates.get(key)
+        if not _is_number(value) or value < 0:
+            raise PriceListError(f"Geçersiz oran: {key}={value!r}")
+    for key in ('fire_rate', 'vat_rate'):
+        if rates[key] >= 1:
+            raise PriceListError(f"Oran 1'den küçük olmalıdır: {key}={rates[key]!r}")
+
+
+def _split_rates(data):
+    """{'prices': {...}, 'rates': {...}} veya düz {anahtar: fiyat} biçimini ayırır."""
+    if not isinstance(data, dict):
+        raise PriceListError("Fiyat listesi bir anahtar/değer eşlemesi olmalıdır")
+    if isinstance(data.get('prices'), dict):
+        rates = data.get('rates') or {}
+        if not isinstance(rates, dict):
+            raise PriceListError("'rates' bir anahtar/değer eşlemesi olmalıdır")
+        return dict(data['prices']), dict(rates)
+    prices = dict(data)
+    rates = {key: prices.pop(key) for key in RATE_KEYS if key in prices}
+    return prices, rates
+
+
+def _read_csv(path):
+    """İki sütunlu (key,value) CSV; oran satırları da aynı dosyada olabilir."""
+    data = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or not {'key', 'value'} <= set(reader.fieldnames):
+            raise PriceListError(f"CSV fiyat listesinde 'key' ve 'value' sütunları olmalıdır ({path})")
+        for row in reader:
+            key = (row.get('key') or '').strip()
+            if not key:
+                continue
+            try:
+                data[key] = float(row['value'])
+            except (TypeError, ValueError):
+                raise PriceListError(f"Geçersiz sayı ({key}): {row.get('value')!r}")
+    return data
+
+
+def _read_yaml(path):
+    try:
+        import yaml
+    except ImportError:
+        raise PriceListError("YAML fiyat listeleri için PyYAML kurulu olmalıdır (pip install pyyaml)")
+    with open(path, encoding='utf-8') as f:
+        try:
+            return yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise PriceListError(f"Fiyat listesi YAML hatası ({path}): {e}")
+
+
+def load_price_list(path):
+    """Dosyadan (.json, .csv, .yaml/.yml) doğrulanmış bir PriceList oluşturur."""
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == '.json':
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        elif extension == '.csv':
+            data = _read_csv(path)
+        elif extension in ('.yaml', '.yml'):
+            data = _read_yaml(path)
+        else:
+            raise PriceListError(f"Desteklenmeyen fiyat listesi biçimi: {extension or path}")
+    except OSError as e:
+        raise PriceListError(f"Fiyat listesi okunamadı ({path}): {e}")
+    except json.JSONDecodeError as e:
+        raise PriceListError(f"Fiyat listesi JSON hatası ({path}): {e}")
+    except UnicodeDecodeError as e:
+        raise PriceListError(f"Fiyat listesi UTF-8 değil ({path}): {e}")
+    except csv.Error as e:
+        raise PriceListError(f"Fiyat listesi CSV hatası ({path}): {e}")
+    prices, rates = _split_rates(data)
+    return PriceList(prices, rates, source=path)
+
+
+def price_list_from_mapping(data, source="admin"):
+    """Yönetim uç noktasından gelen eşlemeden doğrulanmış bir PriceList oluşturur."""
+    prices, rates = _split_rates(data)
+    return PriceList(prices, rates, source=source)
+
+
+class PriceListStore:
+    """
+    Geçerli fiyat listesini tutar. current() kilitsiz bir referans okumasıdır; yeni liste
+    yalnızca doğrulamadan geçerse tek atamayla değiştirilir, hatalı dosya eski listeyi bozmaz.
+    """
+
+    def __init__(self, initial, path=None, watch_interval=0):
+        self._current = initial
+        self.path = path
+        self.watch_interval = watch_interval
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._watcher = None
+        self._stop = threading.Event()
+        self._mtime = self._stat_mtime()
+
+    @classmethod
+    def from_config(cls):
+        """PRICE_LIST_PATH ayarlıysa dosyadan, değilse config.FIYATLAR'dan başlatır."""
+        initial = None
+        if PRICE_LIST_PATH:
+            try:
+                initial = load_price_list(PRICE_LIST_PATH)
+            except PriceListError as e:
+                print(f"UYARI: {e}. Varsayılan fiyat listesi kullanılacak.")
+        if initial is None:
+            initial = PriceList(FIYATLAR)
+        return cls(initial, PRICE_LIST_PATH, PRICE_LIST_WATCH_SECONDS)
+
+    def current(self):
+        return self._current
+
+    def add_listener(self, callback):
+        """Yeni fiyat listesi devreye alındığında callback(yeni_liste) çağrılır."""
+        self._listeners.append(callback)
+
+    def swap(self, price_list):
+        """Doğrulanmış yeni listeyi devreye alır ve önceki listeyi döndürür."""
+        with self._lock:
+            previous = self._current
+            self._current = price_list
+        if price_list.version != previous.version:
+            print(f"INFO: Fiyat listesi güncellendi: {previous.version} -> {price_list.version} ({price_list.source})")
+            for callback in self._listeners:
+                try:
+                    callback(price_list)
+                except Exception as e:
+                    print(f"UYARI: Fiyat listesi bildirimi başarısız: {e}")
+        return previous
+
+    def reload(self):
+        """Fiyat listesi dosyasını yeniden okur; dosya ayarlı değilse veya hatalıysa PriceListError."""
+        if not self.path:
+            raise PriceListError("PRICE_LIST_PATH ayarlı değil")
+        self._mtime = self._stat_mtime()
+        price_list = load_price_list(self.path)
+        self.swap(price_list)
+        return price_list
+
+    def _stat_mtime(self):
+        if not self.path:
+            return None
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def start_watching(self):
+        """Dosya değişikliklerini arka planda izler (watch_interval > 0 ve dosya ayarlıysa)."""
+        if not self.path or self.watch_interval <= 0 or self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, name="price-list-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+
+    def reload_if_changed(self):
+        """
+        Dosya son yüklemeden beri değiştiyse yeniden yükler; liste değiştiyse True döndürür.
+        Hatalı dosyada önceki liste kullanılmaya devam eder.
+        """
+        mtime = self._stat_mtime()
+        if mtime is None or mtime == self._mtime:
+            return False
+        previous = self._current
+        try:
+            return self.reload().version != previous.version
+        except PriceListError as e:
+            print(f"UYARI: Fiyat listesi yeniden yüklenemedi, önceki liste kullanılmaya devam ediyor: {e}")
+            return False
+
+    def _watch(self):
+        while not self._stop.wait(self.watch_interval):
+            # Beklenmeyen bir hata izleyiciyi durdurmamalı; sonraki turda yeniden denenir.
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                print(f"UYARI: Fiyat listesi izlenirken hata oluştu, izleme sürüyor: {e}")
+
+
+# Süreç genelindeki fiyat listesi
+PRICE_LISTS = PriceListStore.from_config()
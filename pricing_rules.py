@@ -0,0 +1,863 @@
+# pricing_rules.py
+# Bu dosya, teklif maliyet kalemlerini tanımlayan bildirimsel kural tablosunu içerir.
+# Her kural; bir koşul, bir miktar tabanı (zemin/duvar/panel alanı, adet vb.), bir fiyat ve
+# bir etiketten oluşur. Tablo tek yerde tanımlanır ve iki şekilde çalıştırılır:
+#   - compile_line_item_evaluator(): içe aktarmada bir kez düz Python koduna derlenir (tekil teklif),
+#   - evaluate_rules_batch(): aynı kurallar NumPy sütun işlemleriyle hesaplanır (toplu fiyatlama).
+# Kalemler tablodaki sırayla eklenir ve toplanır; sonuçlar eski if-zinciriyle birebir aynıdır.
+# Aynı fiyat ve miktarla birden çok kez fiyatlanan kalemler audit_double_counting() ile listelenir.
+
+import math
+import linecache
+from functools import lru_cache, reduce
+
+from config import MATERIAL_INFO_ITEMS, OSB_PANEL_AREA_M2, GLASS_WOOL_M2_PER_PACKET
+from utils import calculate_rounded_up_cost
+
+ELITE_PACKAGE = 'Aether Living | Loft Elite (LUXURY)'
+
+# Etiketinde bu sözcükler geçen kalemler ev ara toplamına (kâr ve KDV tabanı) dahil edilmez.
+HOUSE_EXCLUDED_KEYWORDS = ('Solar', 'Aether')
+
+# Manuel çelik profil alanları (profil tipi, project_details alanı)
+MANUAL_PROFILE_FIELDS = (
+    ("100x100x3", 'profile_100x100_count'),
+    ("100x50x3", 'profile_100x50_count'),
+    ("40x60x2", 'profile_40x60_count'),
+    ("50x50x2", 'profile_50x50_count'),
+    ("120x60x5mm", 'profile_120x60x5mm_count'),
+    ("HEA160", 'profile_HEA160_count'),
+)
+
+_REQUIRED = object()
+_SAME = object()
+
+
+# ==============================================================================
+# İFADELER
+# Her ifade source() ile derlenmiş koddaki Python ifadesini, vector(ctx) ile NumPy
+# karşılığını üretir. Derlenmiş kodda kullanılabilen adlar: inp, prices, area_<ad>,
+# d_<ad>, math, round_up. `ctx`, batch_calculator'daki sütun okuyucusunu ve numpy'ı taşır.
+# ==============================================================================
+
+class Expr:
+    __slots__ = ()
+    children = ()
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class Number(Expr):
+    """Sayısal proje alanı; default verilmezse alan zorunludur (inp[ad])."""
+    __slots__ = ('name', 'default')
+
+    def __init__(self, name, default=0):
+        self.name = name
+        self.default = default
+
+    def source(self):
+        if self.default is _REQUIRED:
+            return f"inp[{self.name!r}]"
+        return f"inp.get({self.name!r}, {self.default!r})"
+
+    def vector(self, ctx):
+        return ctx.column('number', self.name, 0 if self.default is _REQUIRED else self.default)
+
+
+class Text(Number):
+    """Metin proje alanı (seçim kutuları)."""
+    __slots__ = ()
+
+    def __init__(self, name, default=_REQUIRED):
+        super().__init__(name, default)
+
+    def vector(self, ctx):
+        if self.default is None:
+            return ctx.column('objects', self.name)
+        return ctx.column('text', self.name, '' if self.default is _REQUIRED else self.default)
+
+
+class Flag(Expr):
+    """Onay kutusu alanı; yoksa False."""
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def source(self):
+        return f"inp.get({self.name!r}, False)"
+
+    def vector(self, ctx):
+        return ctx.column('flag', self.name)
+
+
+class Area(Expr):
+    """utils.calculate_area sonucundaki alan ('floor', 'wall', 'roof')."""
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def source(self):
+        return f"area_{self.name}"
+
+    def vector(self, ctx):
+        return ctx.areas[self.name]
+
+
+class Const(Expr):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def source(self):
+        return repr(self.value)
+
+    def vector(self, ctx):
+        return self.value
+
+
+class Price(Expr):
+    """Fiyat listesi anahtarı; default verilirse anahtar isteğe bağlıdır (prices.get)."""
+    __slots__ = ('key', 'default')
+
+    def __init__(self, key, default=_REQUIRED):
+        self.key = key
+        self.default = default
+
+    def source(self):
+        if self.default is _REQUIRED:
+            return f"prices[{self.key!r}]"
+        return f"prices.get({self.key!r}, {self.default!r})"
+
+    def vector(self, ctx):
+        if self.default is _REQUIRED:
+            return ctx.prices[self.key]
+        return ctx.prices.get(self.key, self.default)
+
+
+class Derived(Expr):
+    """
+    Adı verilmiş türetilmiş değer (alan, adet veya koşul). Derlenmiş kodda fonksiyon başında
+    bir kez `d_<ad>` yerel değişkenine, toplu hesaplamada bir kez ctx.derived'a hesaplanır.
+    """
+    __slots__ = ('name', 'expr', 'children')
+
+    def __init__(self, name, expr):
+        self.name = name
+        self.expr = expr
+        self.children = (expr,)
+
+    def source(self):
+        return f"d_{self.name}"
+
+    def vector(self, ctx):
+        if self.name not in ctx.derived:
+            ctx.derived[self.name] = self.expr.vector(ctx)
+        return ctx.derived[self.name]
+
+
+class _Op(Expr):
+    __slots__ = ('children',)
+
+    def __init__(self, *children):
+        self.children = children
+
+
+class Ceil(_Op):
+    def source(self):
+        return f"math.ceil({self.children[0].source()})"
+
+    def vector(self, ctx):
+        return ctx.np.ceil(self.children[0].vector(ctx))
+
+
+class RoundUp(_Op):
+    """Kuruşa yukarı yuvarlama (calculate_rounded_up_cost)."""
+
+    def source(self):
+        return f"round_up({self.children[0].source()})"
+
+    def vector(self, ctx):
+        return ctx.round_up(self.children[0].vector(ctx))
+
+
+class Add(_Op):
+    def source(self):
+        return "(" + " + ".join(child.source() for child in self.children) + ")"
+
+    def vector(self, ctx):
+        return reduce(lambda a, b: a + b, (child.vector(ctx) for child in self.children))
+
+
+class Mul(_Op):
+    def source(self):
+        return f"({self.children[0].source()} * {self.children[1].source()})"
+
+    def vector(self, ctx):
+        return self.children[0].vector(ctx) * self.children[1].vector(ctx)
+
+
+class Div(_Op):
+    def source(self):
+        return f"({self.children[0].source()} / {self.children[1].source()})"
+
+    def vector(self, ctx):
+        return self.children[0].vector(ctx) / self.children[1].vector(ctx)
+
+
+class Select(_Op):
+    """Koşul doğruysa ilk, değilse ikinci değer."""
+
+    def source(self):
+        condition, if_true, if_false = self.children
+        return f"({if_true.source()} if {condition.source()} else {if_false.source()})"
+
+    def vector(self, ctx):
+        condition, if_true, if_false = self.children
+        return ctx.np.where(condition.vector(ctx), if_true.vector(ctx), if_false.vector(ctx))
+
+
+class _Compare(Expr):
+    __slots__ = ('children', 'value')
+    operator = None
+
+    def __init__(self, expr, value):
+        self.children = (expr,)
+        self.value = value
+
+    def source(self):
+        return f"({self.children[0].source()} {self.operator} {self.value!r})"
+
+
+class Eq(_Compare):
+    operator = "=="
+
+    def vector(self, ctx):
+        return self.children[0].vector(ctx) == self.value
+
+
+class Ne(_Compare):
+    operator = "!="
+
+    def vector(self, ctx):
+        return self.children[0].vector(ctx) != self.value
+
+
+class Gt(_Compare):
+    operator = ">"
+
+    def vector(self, ctx):
+        return self.children[0].vector(ctx) > self.value
+
+
+class Contains(_Compare):
+    """Metin alanı verilen parçayı içeriyor mu?"""
+
+    def source(self):
+        return f"({self.value!r} in {self.children[0].source()})"
+
+    def vector(self, ctx):
+        return ctx.np.array([self.value in text for text in self.children[0].vector(ctx)], dtype=bool)
+
+
+class All(_Op):
+    def source(self):
+        return "(" + " and ".join(child.source() for child in self.children) + ")"
+
+    def vector(self, ctx):
+        return reduce(lambda a, b: a & b, (child.vector(ctx) for child in self.children))
+
+
+class Not(_Op):
+    def source(self):
+        return f"(not {self.children[0].source()})"
+
+    def vector(self, ctx):
+        return ~self.children[0].vector(ctx)
+
+
+class FirstWord(_Op):
+    def source(self):
+        return f"{self.children[0].source()}.split(' ')[0]"
+
+    def vector(self, ctx):
+        return [text.split(' ')[0] for text in self.children[0].vector(ctx)]
+
+
+class Template(_Op):
+    """Girdilere bağlı etiket: Template('Window ({})', Text('window_size_val', 'N/A'))."""
+    __slots__ = ('fmt',)
+
+    def __init__(self, fmt, *args):
+        super().__init__(*args)
+        self.fmt = fmt
+
+    def source(self):
+        return f"{self.fmt!r}.format(" + ", ".join(child.source() for child in self.children) + ")"
+
+    def rows(self, ctx):
+        """Satır başına girdi değerleri demetleri (sabit değerler her satıra yayılır)."""
+        columns = [child.vector(ctx) for child in self.children]
+        columns = [column if hasattr(column, '__len__') and not isinstance(column, str) else [column] * ctx.size
+                   for column in columns]
+        return zip(*columns)
+
+    def vector(self, ctx):
+        return [self.fmt.format(*values) for values in self.rows(ctx)]
+
+
+# ==============================================================================
+# KURAL
+# ==============================================================================
+
+class Rule:
+    """
+    Tek bir maliyet kalemi kuralı.
+    key: kuralın adı ve toplu sonuçtaki 'cost_<column>' sütunu (column verilmezse key).
+    price None ise kalem yalnızca bilgi satırıdır (0 maliyet). quantity None ise toplam
+    doğrudan fiyattır (round_total ile yuvarlanarak). display, gösterilen miktarı ayrıca belirler.
+    profile: (etiket, birim) verilirse kalem profil analizine de eklenir.
+    result: 'solar' veya 'aether_package' ise toplam ayrı satış fiyatı olarak da döndürülür.
+    """
+    __slots__ = ('key', 'label', 'price', 'quantity', 'when', 'unit', 'display', 'round_total',
+                 'profile', 'column', 'result')
+
+    def __init__(self, key, label, price=None, quantity=None, when=None, unit=None, display=_SAME,
+                 round_total=True, profile=None, column=None, result=None):
+        self.key = key
+        self.label = label
+        self.price = price
+        self.quantity = quantity
+        self.when = when
+        self.unit = unit
+        self.display = display
+        self.round_total = round_total
+        self.profile = profile
+        self.column = column or key
+        self.result = result
+
+    @property
+    def is_info(self):
+        return self.price is None
+
+    def expressions(self):
+        for expr in (self.when, self.quantity, self.price, self.label):
+            if isinstance(expr, Expr):
+                yield expr
+
+    def inputs(self):
+        """Kuralın okuduğu project_details alanları."""
+        return {node.name for expr in self.expressions() for node in expr.walk()
+                if isinstance(node, (Number, Flag))}
+
+    def areas(self):
+        """Kuralın kullandığı alanlar ('floor', 'wall', 'roof')."""
+        return {node.name for expr in self.expressions() for node in expr.walk() if isinstance(node, Area)}
+
+    def price_keys(self):
+        return {node.key: node.default is _REQUIRED for expr in self.expressions() for node in expr.walk()
+                if isinstance(node, Price)}
+
+    def _label_source(self):
+        return self.label.source() if isinstance(self.label, Expr) else repr(self.label)
+
+    def scalar_lines(self):
+        """Derlenmiş değerlendiricideki gövde satırları."""
+        label = self._label_source()
+        if self.is_info:
+            return [f"add(LineItem({label}, None, None, 0.0, 0.0))"]
+        lines = []
+        if self.quantity is not None:
+            lines.append(f"quantity = {self.quantity.source()}")
+        lines.append(f"price = {self.price.source()}")
+        if self.quantity is not None:
+            lines.append("total = round_up(quantity * price)" if self.round_total else "total = quantity * price")
+        else:
+            lines.append("total = round_up(price)" if self.round_total else "total = price")
+        if self.display is _SAME:
+            display = "quantity" if self.quantity is not None else "None"
+        else:
+            display = repr(self.display)
+        lines.append(f"add(LineItem({label}, {display}, {self.unit!r}, price, total))")
+        if self.profile:
+            profile_label, profile_unit = self.profile
+            lines.append(f"add_profile(LineItem({profile_label!r}, {display}, {profile_unit!r}, price, total))")
+        if self.result:
+            lines.append(f"results[{self.result!r}] = total")
+        return lines
+
+    def house_excluded(self, ctx=None):
+        """
+        Kalem ev ara toplamından düşülüyor mu? Sabit etiketler için bool; etiketi girdilere bağlı
+        kurallarda toplu hesaplama için satır bazında dizi döndürür.
+        """
+        label = self.label
+        static = label.fmt if isinstance(label, Template) else label
+        if any(keyword in static for keyword in HOUSE_EXCLUDED_KEYWORDS):
+            return True
+        if not isinstance(label, Template):
+            return False
+        # Etiket yalnızca girdi değerlerine bağlıdır; her farklı değer kombinasyonu bir kez biçimlendirilir.
+        cache_key = ('house_excluded', id(label))
+        if cache_key not in ctx.derived:
+            excluded = {}
+            mask = []
+            for values in label.rows(ctx):
+                if values not in excluded:
+                    text = label.fmt.format(*values)
+                    excluded[values] = any(keyword in text for keyword in HOUSE_EXCLUDED_KEYWORDS)
+                mask.append(excluded[values])
+            ctx.derived[cache_key] = ctx.np.array(mask, dtype=bool)
+        return ctx.derived[cache_key]
+
+    def __repr__(self):
+        return f"Rule({self.key!r})"
+
+
+# ==============================================================================
+# KURAL TABLOSU (kalemler bu sırayla eklenir ve toplanır)
+# ==============================================================================
+
+STRUCTURE_TYPE = Text('structure_type')
+IS_LIGHT_STEEL = Derived('is_light_steel', Eq(STRUCTURE_TYPE, 'Light Steel'))
+HAS_MANUAL_PROFILES = Derived('has_manual_profiles', Gt(Add(*(Number(field) for _, field in MANUAL_PROFILE_FIELDS)), 0))
+AUTO_100X100 = Derived('auto_100x100', Ceil(Mul(Area('floor'), Const(12 / 27.0))))
+AUTO_50X50 = Derived('auto_50x50', Ceil(Mul(Area('floor'), Const(6 / 27.0))))
+WELDING_TYPE = Text('welding_type')
+IS_STANDARD_WELDING = Derived('is_standard_welding', Contains(WELDING_TYPE, 'Standard'))
+WELDING_LABEL = Template("Steel Welding Labor ({})", FirstWord(WELDING_TYPE))
+AETHER_CHOICE = Text('aether_package_choice', None)
+IS_ELITE = Derived('is_elite', Eq(AETHER_CHOICE, ELITE_PACKAGE))
+HAS_AETHER = Derived('has_aether', Ne(AETHER_CHOICE, 'None'))
+PANEL_AREA = Derived('panel_area', Add(Area('wall'), Area('roof')))
+PLASTERBOARD_AREA = Derived('plasterboard_area', Select(
+    Flag('plasterboard_interior_option'), Area('wall'),
+    Select(Flag('plasterboard_all_option'), Mul(Area('wall'), Const(2)), Const(0)),
+))
+HAS_PLASTERBOARD = Derived('has_plasterboard', Gt(PLASTERBOARD_AREA, 0))
+INSULATION_TYPE = Text('insulation_material_type', '')
+WALL_INSULATION = Derived('wall_insulation', All(Flag('insulation_wall'), Ne(INSULATION_TYPE, 'Yalıtım Yapılmayacak')))
+CLADDING_M2 = Number('exterior_cladding_m2_val')
+HAS_CLADDING = Derived('has_cladding', All(Flag('exterior_cladding_m2_option'), Gt(CLADDING_M2, 0)))
+CERAMIC_M2_PRICE = Derived('ceramic_m2_price', Add(Price('wc_ceramic_m2_material'), Price('wc_ceramic_m2_labor')))
+FLOOR_COVERING = Text('floor_covering', '')
+IS_LAMINATE = Derived('is_laminate', Eq(FLOOR_COVERING, 'Laminate Parquet'))
+CONCRETE_M2 = Number('concrete_panel_floor_m2_val')
+HAS_CONCRETE = Derived('has_concrete', All(Flag('concrete_panel_floor_option'), Gt(CONCRETE_M2, 0)))
+PORCELAIN_M2 = Number('porcelain_tiles_m2_val')
+HAS_PORCELAIN = Derived('has_porcelain', All(Flag('porcelain_tiles_option'), Gt(PORCELAIN_M2, 0)))
+KITCHEN_CHOICE = Text('kitchen_choice', 'No Kitchen')
+
+# (anahtar, adet alanı, ölçü alanı, etiket, fiyat anahtarı)
+OPENING_FIELDS = (
+    ('windows', 'window_count', 'window_size_val', 'Window', 'aluminum_window_piece'),
+    ('sliding_doors', 'sliding_door_count', 'sliding_door_size_val', 'Sliding Glass Door', 'sliding_glass_door_piece'),
+    ('wc_windows', 'wc_window_count', 'wc_window_size_val', 'WC Window', 'wc_window_piece'),
+    ('wc_sliding_doors', 'wc_sliding_door_count', 'wc_sliding_door_size_val', 'WC Sliding Door', 'wc_sliding_door_piece'),
+    ('doors', 'door_count', 'door_size_val', 'Door', 'door_piece'),
+)
+OPENINGS_TOTAL = Derived('openings_total', Add(*(Number(field) for _, field, _, _, _ in OPENING_FIELDS)))
+
+# Laminat parke seçildiğinde girilen miktarlara göre eklenen kalemler
+# (anahtar, miktar alanı, etiket, birim, fiyat anahtarı)
+LAMINATE_FIELDS = (
+    ('skirting', 'skirting_length_val', 'Skirting', 'm', 'skirting_meter_price'),
+    ('laminate_flooring', 'laminate_flooring_m2_val', 'Laminate Flooring 12mm', 'm²', 'laminate_flooring_m2_price'),
+    ('under_parquet_mat', 'under_parquet_mat_m2_val', 'Under Parquet Mat 4mm', 'm²', 'under_parquet_mat_m2_price'),
+    ('osb2_18mm', 'osb2_18mm_count_val', 'OSB2 18mm Panel', 'adet', 'osb2_18mm_piece_price'),
+    ('galvanized_sheet', 'galvanized_sheet_m2_val', '5mm Galvanized Sheet', 'm²', 'galvanized_sheet_m2_price'),
+)
+
+LINE_ITEM_RULES = (
+    # --- 1. Yapısal Maliyetler (Çelik, Kaynak, Bağlantı Elemanları) ---
+    Rule('protective_paint', MATERIAL_INFO_ITEMS['protective_automotive_paint_info']),
+    # Not: manuel profillerin fiyat anahtarı ('steel_profile_100_100_3' gibi) fiyat listesinde
+    # yoksa 0 kabul edilir; audit_price_keys() bu anahtarları raporlar.
+    *(Rule(f"steel_profile_{p_type}", f"{MATERIAL_INFO_ITEMS['steel_skeleton_info']} ({p_type})",
+           price=Price(f"steel_profile_{p_type.replace('x', '_').lower()}", 0.0), quantity=Number(field),
+           unit='adet', when=All(IS_LIGHT_STEEL, HAS_MANUAL_PROFILES, Gt(Number(field), 0)), profile=(p_type, None))
+      for p_type, field in MANUAL_PROFILE_FIELDS),
+    Rule('steel_profile_100x100x3_auto', MATERIAL_INFO_ITEMS['steel_skeleton_info'] + ' (100x100x3) (Auto)',
+         price=Price('steel_profile_100x100x3'), quantity=AUTO_100X100, unit='adet',
+         when=All(IS_LIGHT_STEEL, Not(HAS_MANUAL_PROFILES), Gt(AUTO_100X100, 0)), profile=('100x100x3 (Auto)', None)),
+    Rule('steel_profile_50x50x2_auto', MATERIAL_INFO_ITEMS['steel_skeleton_info'] + ' (50x50x2) (Auto)',
+         price=Price('steel_profile_50x50x2'), quantity=AUTO_50X50, unit='adet',
+         when=All(IS_LIGHT_STEEL, Not(HAS_MANUAL_PROFILES), Gt(AUTO_50X50, 0)), profile=('50x50x2 (Auto)', None)),
+    Rule('heavy_steel_structure', 'Heavy Steel Structure', price=Price('heavy_steel_m2'), quantity=Area('floor'),
+         unit='m²', when=Not(IS_LIGHT_STEEL), profile=('Heavy Steel Structure', 'm²')),
+    Rule('welding_labor_standard', WELDING_LABEL, price=Price('welding_labor_m2_standard'), quantity=Area('floor'),
+         unit='m²', when=IS_STANDARD_WELDING, column='welding_labor'),
+    Rule('welding_labor_trmontaj', WELDING_LABEL, price=Price('welding_labor_m2_trmontaj'), quantity=Area('floor'),
+         unit='m²', when=Not(IS_STANDARD_WELDING), column='welding_labor'),
+    Rule('connection_elements', 'Connection Elements', price=Price('connection_element_m2'), quantity=Area('floor'), unit='m²'),
+
+    # --- 2. Duvar ve Çatı Maliyetleri (Panel, Alçıpan, Yalıtım) ---
+    Rule('wall_roof_panels_elite', MATERIAL_INFO_ITEMS['100mm_eps_isothermal_panel_info'],
+         price=Price('100mm_eps_isothermal_panel_unit_price'), quantity=PANEL_AREA, unit='m²', when=IS_ELITE,
+         column='wall_roof_panels'),
+    Rule('wall_roof_panels_standard', MATERIAL_INFO_ITEMS['60mm_eps_sandwich_panel_info'],
+         price=Price('sandwich_panel_m2'), quantity=PANEL_AREA, unit='m²', when=Not(IS_ELITE),
+         column='wall_roof_panels'),
+    Rule('panel_assembly_labor', 'Panel Assembly Labor', price=Price('panel_assembly_labor_m2'), quantity=PANEL_AREA, unit='m²'),
+    Rule('facade_sandwich_panel', 'Facade (Sandwich Panel)', price=Price('sandwich_panel_m2'), quantity=Area('wall'),
+         unit='m²', when=All(Flag('facade_sandwich_panel_option'), Eq(STRUCTURE_TYPE, 'Heavy Steel'))),
+    Rule('satin_plaster_paint', MATERIAL_INFO_ITEMS['satin_plaster_paint_info'], when=HAS_PLASTERBOARD),
+    Rule('plasterboard_material', 'Plasterboard Material', price=Price('plasterboard_material_m2'),
+         quantity=PLASTERBOARD_AREA, unit='m²', when=HAS_PLASTERBOARD),
+    Rule('plasterboard_labor', 'Plasterboard Labor', price=Price('plasterboard_labor_m2_avg'),
+         quantity=PLASTERBOARD_AREA, unit='m²', when=HAS_PLASTERBOARD),
+    Rule('cdx400_profile', 'CDX400 Profil', price=Price('cdx400_material_price'),
+         quantity=Ceil(Div(PLASTERBOARD_AREA, Const(3))), unit='adet', when=HAS_PLASTERBOARD),
+    Rule('ud_profile', 'UD Profil', price=Price('ud_material_price'),
+         quantity=Ceil(Div(PLASTERBOARD_AREA, Const(5))), unit='adet', when=HAS_PLASTERBOARD),
+    Rule('tn25_screws', 'TN25 Screws', price=Price('tn25_screws_price_per_unit'),
+         quantity=Ceil(Mul(PLASTERBOARD_AREA, Const(10))), unit='adet', when=HAS_PLASTERBOARD),
+    Rule('inner_wall_osb', 'Inner Wall OSB Material', price=Price('osb_piece'),
+         quantity=Ceil(Div(Area('wall'), Const(OSB_PANEL_AREA_M2))), unit='adet', when=Flag('osb_inner_wall_option')),
+    Rule('wall_insulation_stone_wool', 'Wall Insulation (Stone Wool)', price=Price('otb_stone_wool_price'),
+         quantity=Area('wall'), unit='m²', when=All(WALL_INSULATION, Eq(INSULATION_TYPE, 'Stone Wool'))),
+    Rule('wall_insulation_glass_wool', 'Wall Insulation (Glass Wool)', price=Price('glass_wool_5cm_packet_price'),
+         quantity=Ceil(Div(Area('wall'), Const(GLASS_WOOL_M2_PER_PACKET))), unit='paket',
+         when=All(WALL_INSULATION, Eq(INSULATION_TYPE, 'Glass Wool'))),
+    Rule('exterior_cladding', MATERIAL_INFO_ITEMS['knauf_aquapanel_gypsum_board_info'] + ' (Cladding)',
+         price=Price('exterior_cladding_price_per_m2'), quantity=CLADDING_M2, unit='m²', when=HAS_CLADDING),
+    Rule('eps_styrofoam', MATERIAL_INFO_ITEMS['eps_styrofoam_info'], when=HAS_CLADDING),
+    Rule('knauf_mineralplus_insulation', MATERIAL_INFO_ITEMS['knauf_mineralplus_insulation_info'], when=HAS_CLADDING),
+    Rule('exterior_wood_cladding', MATERIAL_INFO_ITEMS['exterior_wood_cladding_lambiri_info'],
+         price=Price('exterior_wood_cladding_m2_price'), quantity=Number('exterior_wood_cladding_m2_val'), unit='m²',
+         when=All(Flag('exterior_wood_cladding_m2_option'), Gt(Number('exterior_wood_cladding_m2_val'), 0))),
+
+    # --- 3. Zemin Maliyetleri (Yalıtım ve Kaplama) ---
+    Rule('floor_insulation', 'Floor Insulation', price=Price('insulation_per_m2'), quantity=Area('floor'), unit='m²',
+         when=Flag('insulation_floor')),
+    *(Rule(key, label, price=Price(price_key), quantity=Number(field), unit=unit,
+           when=All(IS_LAMINATE, Gt(Number(field), 0)))
+      for key, field, label, unit, price_key in LAMINATE_FIELDS),
+    Rule('plywood_flooring_labor', 'Plywood Flooring Labor', price=Price('plywood_flooring_labor_m2'),
+         quantity=Area('floor'), unit='m²', when=IS_LAMINATE),
+    Rule('ceramic_floor', 'Seramik Zemin Kaplaması', price=CERAMIC_M2_PRICE, quantity=Area('floor'), unit='m²',
+         when=Eq(FLOOR_COVERING, 'Ceramic')),
+    Rule('concrete_panel_floor', MATERIAL_INFO_ITEMS['concrete_panel_floor_info'],
+         price=Price('concrete_panel_floor_price_per_m2'), quantity=CONCRETE_M2, unit='m²', when=HAS_CONCRETE),
+    Rule('terrace_flooring', MATERIAL_INFO_ITEMS['treated_pine_floor_info'],
+         price=Price('terrace_laminated_wood_flooring_price_per_m2'),
+         quantity=Number('terrace_laminated_wood_flooring_m2_val'), unit='m²',
+         when=All(Flag('terrace_laminated_wood_flooring_option'), Gt(Number('terrace_laminated_wood_flooring_m2_val'), 0))),
+    Rule('porcelain_tiles', MATERIAL_INFO_ITEMS['porcelain_tiles_info'], price=CERAMIC_M2_PRICE, quantity=PORCELAIN_M2,
+         unit='m²', when=HAS_PORCELAIN),
+
+    # --- 4. Doğramalar (Pencere ve Kapılar) ---
+    *(Rule(key, Template(label + " ({})", Text(size_field, 'N/A')), price=Price(price_key), quantity=Number(field),
+           when=Gt(Number(field), 0))
+      for key, field, size_field, label, price_key in OPENING_FIELDS),
+    Rule('door_window_assembly_labor', 'Door/Window Assembly Labor', price=Price('door_window_assembly_labor_piece'),
+         quantity=OPENINGS_TOTAL, unit='adet', when=Gt(OPENINGS_TOTAL, 0)),
+
+    # --- 5. Mutfak, Banyo ve Tesisatlar ---
+    Rule('standard_kitchen', 'Standard Kitchen Installation', price=Price('kitchen_installation_standard_piece'),
+         display='1', when=Eq(KITCHEN_CHOICE, 'Standard Kitchen')),
+    Rule('special_kitchen', 'Special Design Kitchen Installation', price=Price('kitchen_installation_special_piece'),
+         display='1', when=Eq(KITCHEN_CHOICE, 'Special Design Kitchen')),
+    Rule('shower_wc', 'Shower/WC Installation', price=Price('shower_wc_installation_piece'), display='1',
+         when=Flag('shower_wc')),
+    Rule('wc_ceramic', 'WC Ceramic Material & Labor', price=CERAMIC_M2_PRICE, quantity=Number('wc_ceramic_area'),
+         unit='m²', when=All(Flag('shower_wc'), Flag('wc_ceramic'), Gt(Number('wc_ceramic_area'), 0))),
+    Rule('electrical', 'Electrical Installation', price=Price('electrical_per_m2'), quantity=Area('floor'), unit='m²',
+         when=Flag('electrical')),
+    Rule('plumbing', 'Plumbing Installation', price=Price('plumbing_per_m2'), quantity=Area('floor'), unit='m²',
+         when=Flag('plumbing')),
+    Rule('transportation', 'Transportation', price=Price('transportation'), display='1', when=Flag('transportation')),
+    Rule('floor_heating', 'Floor Heating System', price=Price('floor_heating_m2'), quantity=Area('floor'), unit='m²',
+         when=Flag('heating')),
+    Rule('solar_system', Template('Solar Energy System ({} kW)', Number('solar_kw', _REQUIRED)),
+         price=Price('solar_per_kw'), quantity=Number('solar_kw', _REQUIRED), display=1, when=Flag('solar'),
+         result='solar'),
+    Rule('wheeled_trailer', 'Wheeled Trailer', price=RoundUp(Number('wheeled_trailer_price')), display='1',
+         round_total=False, when=All(Flag('wheeled_trailer'), Gt(Number('wheeled_trailer_price'), 0))),
+    # İki katlı yapı için merdiven maliyeti
+    Rule('internal_staircase', 'Internal Staircase', price=Price('staircase_cost'), display='1',
+         when=Flag('is_two_story')),
+
+    # --- 6. Aether Living Ek Opsiyonları ---
+    # Paket fiyatı tek kalem olarak eklenir; paket içi kalemler ayrıca fiyatlanır.
+    Rule('aether_package', Template('Aether Package ({})', Text('aether_package_choice')),
+         price=Price('aether_package_cost', 0.0), display='1', round_total=False, when=HAS_AETHER,
+         result='aether_package'),
+    Rule('aether_bedroom_set', MATERIAL_INFO_ITEMS['supportive_headboard_furniture_info'],
+         price=Price('bedroom_set_total_price'), display=1, when=All(HAS_AETHER, Flag('bedroom_set_option'))),
+    Rule('aether_granite_countertops', MATERIAL_INFO_ITEMS['brushed_grey_granite_countertops_info'],
+         price=Price('brushed_grey_granite_countertops_price_m2_avg'),
+         quantity=Number('brushed_granite_countertops_m2_val'), unit='m²',
+         when=All(HAS_AETHER, Flag('brushed_granite_countertops_option'), Gt(Number('brushed_granite_countertops_m2_val'), 0))),
+    # Aşağıdaki üç kalem, seçenek işaretliyse yukarıda da fiyatlanır (bkz. audit_double_counting).
+    Rule('aether_exterior_cladding', MATERIAL_INFO_ITEMS['knauf_aquapanel_gypsum_board_info'],
+         price=Price('exterior_cladding_price_per_m2'), quantity=CLADDING_M2, unit='m²', when=All(HAS_AETHER, HAS_CLADDING)),
+    Rule('aether_porcelain_tiles', MATERIAL_INFO_ITEMS['porcelain_tiles_info'], price=CERAMIC_M2_PRICE,
+         quantity=PORCELAIN_M2, unit='m²', when=All(HAS_AETHER, HAS_PORCELAIN)),
+    Rule('aether_concrete_panel_floor', MATERIAL_INFO_ITEMS['concrete_panel_floor_info'],
+         price=Price('concrete_panel_floor_price_per_m2'), quantity=CONCRETE_M2, unit='m²',
+         when=All(HAS_AETHER, HAS_CONCRETE)),
+)
+
+
+# ==============================================================================
+# DERLEME VE DEĞERLENDİRME
+# ==============================================================================
+
+_evaluator_count = 0
+
+
+def _derived_values(rules):
+    """Kuralların kullandığı Derived değerleri, bağımlılıklar önce gelecek şekilde ilk kullanım sırasıyla."""
+    ordered = []
+    seen = set()
+
+    def visit(node):
+        for child in node.children:
+            visit(child)
+        if isinstance(node, Derived) and node.name not in seen:
+            seen.add(node.name)
+            ordered.append(node)
+
+    for rule in rules:
+        for expr in rule.expressions():
+            visit(expr)
+    return ordered
+
+
+def compile_line_item_evaluator(rules, line_item_class):
+    """
+    Kural tablosunu tek bir Python fonksiyonuna derler:
+    evaluate(inp, areas, prices, items, profile_items) -> {'solar': ..., 'aether_package': ...}
+    Kalemler `items` (ve gerekiyorsa `profile_items`) listesine tablo sırasıyla eklenir.
+    Üretilen kaynak kod fonksiyonun `source` niteliğindedir.
+    """
+    lines = [
+        "def evaluate(inp, areas, prices, items, profile_items):",
+        "    area_floor = areas['floor']",
+        "    area_wall = areas['wall']",
+        "    area_roof = areas['roof']",
+        "    add = items.append",
+        "    add_profile = profile_items.append",
+        "    results = {}",
+    ]
+    for derived in _derived_values(rules):
+        lines.append(f"    d_{derived.name} = {derived.expr.source()}")
+    for rule in rules:
+        lines.append(f"    # {rule.key}")
+        if rule.when is None:
+            lines.extend("    " + line for line in rule.scalar_lines())
+        else:
+            lines.append(f"    if {rule.when.source()}:")
+            lines.extend("        " + line for line in rule.scalar_lines())
+    lines.append("    return results")
+    return _exec_function("evaluate", lines, LineItem=line_item_class)
+
+
+def compile_condition(expr):
+    """İfadeyi condition(inp, areas, prices) -> bool fonksiyonuna derler (ör. kural koşulları)."""
+    lines = [
+        "def condition(inp, areas, prices):",
+        "    area_floor = areas['floor']",
+        "    area_wall = areas['wall']",
+        "    area_roof = areas['roof']",
+    ]
+    for derived in _derived_values((Rule('condition', '', when=expr),)):
+        lines.append(f"    d_{derived.name} = {derived.expr.source()}")
+    lines.append(f"    return bool({expr.source()})")
+    return _exec_function("condition", lines)
+
+
+def _exec_function(name, lines, **namespace):
+    global _evaluator_count
+    source = "\n".join(lines) + "\n"
+    _evaluator_count += 1
+    filename = f"<pricing_rules:{_evaluator_count}>"
+    # Hata izlerinde üretilen satırların görünmesi için
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    namespace.update(math=math, round_up=calculate_rounded_up_cost)
+    exec(compile(source, filename, 'exec'), namespace)
+    function = namespace[name]
+    function.source = source
+    return function
+
+
+def compile_rule_evaluators(rules, line_item_class):
+    """
+    Her kuralı ayrı bir değerlendiriciye derler (aynı imza, tek kural). Artımlı yeniden
+    hesaplamada (quote_session) yalnızca girdisi değişen kurallar yeniden çalıştırılır.
+    """
+    return tuple(compile_line_item_evaluator((rule,), line_item_class) for rule in rules)
+
+
+def rule_dependencies(rules):
+    """
+    Girdi alanlarından kurallara bağımlılık grafiği: ({alan_adı: {kural_sırası}}, {alan: {kural_sırası}}).
+    İlk sözlük project_details alanlarını, ikincisi 'floor'/'wall'/'roof' alanlarını kapsar.
+    """
+    by_field = {}
+    by_area = {}
+    for index, rule in enumerate(rules):
+        for name in rule.inputs():
+            by_field.setdefault(name, set()).add(index)
+        for name in rule.areas():
+            by_area.setdefault(name, set()).add(index)
+    return by_field, by_area
+
+
+def _input_vector(expr, ctx):
+    """
+    Fiyat okumayan ifadeler (koşullar, miktarlar) yalnızca girdilere bağlıdır; sonuçları
+    ctx.derived'da ('input', id) anahtarıyla tutulur. Aynı girdiler farklı fiyat listeleriyle
+    hesaplanırken (senaryolar) bu değerler taşınır ve yeniden hesaplanmaz.
+    """
+    key = ('input', id(expr))
+    if key not in ctx.derived:
+        ctx.derived[key] = expr.vector(ctx)
+    return ctx.derived[key]
+
+
+@lru_cache(maxsize=None)
+def _reads_prices(expr):
+    return any(isinstance(node, Price) for node in expr.walk())
+
+
+def evaluate_rules_batch(rules, ctx):
+    """
+    Kuralları sütun işlemleriyle değerlendirir. Tablo sırasıyla [(sütun, toplam, ev_payı)]
+    ve {'solar': dizi, 'aether_package': dizi} döndürür. Aynı sütunu paylaşan kurallar
+    (birbirini dışlayan koşullarla) tek sütunda toplanır; bilgi satırları atlanır.
+    `ctx`: np, size, cols, areas, prices, derived ve round_up sağlayan bağlam.
+    """
+    np = ctx.np
+    columns = {}
+    results = {}
+    for rule in rules:
+        if rule.is_info:
+            continue
+        price = rule.price.vector(ctx)
+        if rule.quantity is not None:
+            quantity = rule.quantity.vector(ctx) if _reads_prices(rule.quantity) else _input_vector(rule.quantity, ctx)
+            amount = quantity * price
+            total = ctx.round_up(amount) if rule.round_total else amount
+        elif rule.round_total:
+            total = ctx.round_up(np.full(ctx.size, price))
+        else:
+            total = price
+        if rule.when is None:
+            when = True
+        else:
+            when = rule.when.vector(ctx) if _reads_prices(rule.when) else _input_vector(rule.when, ctx)
+        total = np.where(when, total, 0.0)
+
+        excluded = rule.house_excluded(ctx)
+        if excluded is True:
+            house = np.zeros(ctx.size)
+        elif excluded is False:
+            house = total
+        else:
+            house = np.where(excluded, 0.0, total)
+
+        if rule.column in columns:
+            previous_total, previous_house = columns[rule.column]
+            columns[rule.column] = (previous_total + total, previous_house + house)
+        else:
+            columns[rule.column] = (total, house)
+        if rule.result:
+            results[rule.result] = total
+    return [(column, total, house) for column, (total, house) in columns.items()], results
+
+
+# ==============================================================================
+# DENETİM
+# ==============================================================================
+
+def required_price_keys(rules=LINE_ITEM_RULES):
+    """Kuralların varsayılan değer olmadan okuduğu fiyat anahtarları (sıralı)."""
+    keys = set()
+    for rule in rules:
+        keys.update(key for key, required in rule.price_keys().items() if required)
+    return tuple(sorted(keys))
+
+
+def input_fields(rules=LINE_ITEM_RULES):
+    """Kuralların okuduğu project_details alanları ve türleri: {ad: 'number' | 'text' | 'flag'}."""
+    fields = {}
+    for rule in rules:
+        for expr in rule.expressions():
+            for node in expr.walk():
+                if isinstance(node, Text):
+                    fields[node.name] = 'text'
+                elif isinstance(node, Number):
+                    fields[node.name] = 'number'
+                elif isinstance(node, Flag):
+                    fields[node.name] = 'flag'
+    return fields
+
+
+def required_inputs(rule):
+    """
+    Kuralın varsayılan değeri olmadan okuduğu alanlar: (her_zaman, yalnızca_koşul_doğruysa).
+    Koşuldaki ve Derived değerlerdeki alanlar her zaman okunur (Derived değerler derlenmiş
+    kodda fonksiyon başında hesaplanır); etiket, miktar ve fiyattakiler koşul doğruysa okunur.
+    """
+    always = set()
+    conditional = set()
+
+    def visit(node, target):
+        if isinstance(node, Derived):
+            target = always
+        if isinstance(node, Number) and node.default is _REQUIRED:
+            target.add(node.name)
+        for child in node.children:
+            visit(child, target)
+
+    if rule.when is not None:
+        visit(rule.when, always)
+    for expr in (rule.quantity, rule.price, rule.label):
+        if isinstance(expr, Expr):
+            visit(expr, conditional if rule.when is not None else always)
+    return always, conditional - always
+
+
+def audit_double_counting(rules=LINE_ITEM_RULES):
+    """
+    Aynı fiyat ve aynı miktar tabanıyla birden fazla sütunda fiyatlanan kuralları bulur.
+    [(fiyat_kaynağı, miktar_kaynağı, [kural_anahtarları])] döndürür. Koşulları aynı anda
+    doğru olabilen kurallar aynı kalemi iki kez fiyatlar.
+    """
+    groups = {}
+    for rule in rules:
+        if rule.is_info:
+            continue
+        signature = (rule.price.source(), rule.quantity.source() if rule.quantity is not None else None)
+        group = groups.setdefault(signature, {})
+        group.setdefault(rule.column, rule.key)
+    return [(price, quantity, list(group.values()))
+            for (price, quantity), group in groups.items() if len(group) > 1]
+
+
+def audit_price_keys(prices, rules=LINE_ITEM_RULES):
+    """İsteğe bağlı olup fiyat listesinde bulunmayan (0 kabul edilen) fiyat anahtarlarını döndürür."""
+    missing = {}
+    for rule in rules:
+        for key, required in rule.price_keys().items():
+            if not required and key not in prices:
+                missing.setdefault(key, []).append(rule.key)
+    return missing
+
+
+if __name__ == '__main__':
+    from config import FIYATLAR
+    print(f"{len(LINE_ITEM_RULES)} kural, {len(required_price_keys())} zorunlu fiyat anahtarı")
+    print("\nBirden fazla kez fiyatlanabilen kalemler:")
+    for price, quantity, keys in audit_double_counting():
+        print(f"  {', '.join(keys)}: fiyat={price} miktar={quantity}")
+    print("\nFiyat listesinde bulunmayan (0 kabul edilen) fiyat anahtarları:")
+    for key, rule_keys in audit_price_keys(FIYATLAR).items():
+        print(f"  {key}: {', '.join(rule_keys)}")
@@ -0,0 +1,317 @@
+# quote_archive.py
+# Bu dosya, oluşturulan tekliflerin kalıcı arşivini içerir. Her teklif (müşteri ve proje
+# bilgileri, fiyat listesi sürümü, maliyet kalemleri, finansal özet ve isteğe bağlı olarak
+# sıkıştırılmış PDF'ler) yerel bir SQLite veritabanına yazılır. Kayıtlar istek sırasında
+# yalnızca bellekteki bir kuyruğa eklenir; serileştirme, sıkıştırma ve yazma arka plandaki
+# tek bir iş parçacığında toplu işlemlerle (transaction) yapılır, böylece /calculate'e gecikme
+# eklenmez. Müşteri e-postası/adı, tarih aralığı, toplam fiyat bandı ve yapılandırma için
+# indeksler vardır; listeleme imleç (cursor) ile sayfalanır.
+
+import os
+import json
+import time
+import zlib
+import queue
+import atexit
+import sqlite3
+import hashlib
+import threading
+
+from config import (
+    QUOTE_ARCHIVE_ENABLED, QUOTE_ARCHIVE_PATH, QUOTE_ARCHIVE_STORE_PDFS, QUOTE_ARCHIVE_BATCH_SIZE,
+    QUOTE_ARCHIVE_FLUSH_SECONDS, QUOTE_ARCHIVE_MAX_QUEUE,
+)
+from calculator import PROJECT_FIELD_TYPES
+from metrics import METRICS
+from utils import calculate_project_areas
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    quote_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    source TEXT,
+    customer_name TEXT COLLATE NOCASE,
+    customer_email TEXT COLLATE NOCASE,
+    config_hash TEXT NOT NULL,
+    structure_type TEXT,
+    floor_area REAL,
+    price_list_version TEXT,
+    house_sales_price REAL,
+    total_sales_price REAL,
+    customer_info TEXT NOT NULL,
+    project_details TEXT NOT NULL,
+    line_items TEXT NOT NULL,
+    financial_summary TEXT NOT NULL
+);
+-- Tek sütunlu indeksler kimliği (rowid) de içerdiğinden eşitlik filtreleri "ORDER BY id DESC"
+-- sıralamasını ek sıralama yapmadan indeksten okur.
+CREATE INDEX IF NOT EXISTS quotes_email ON quotes (customer_email);
+CREATE INDEX IF NOT EXISTS quotes_name ON quotes (customer_name);
+CREATE INDEX IF NOT EXISTS quotes_created ON quotes (created_at);
+CREATE INDEX IF NOT EXISTS quotes_total ON quotes (total_sales_price);
+CREATE INDEX IF NOT EXISTS quotes_config ON quotes (config_hash);
+CREATE INDEX IF NOT EXISTS quotes_quote_id ON quotes (quote_id);
+CREATE TABLE IF NOT EXISTS quote_documents (
+    quote_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    data BLOB,
+    PRIMARY KEY (quote_id, name)
+);
+"""
+
+# Listeleme yanıtlarındaki sütunlar (büyük JSON alanları yalnızca tekil kayıtta döner)
+_LIST_COLUMNS = ("id", "quote_id", "created_at", "source", "customer_name", "customer_email", "config_hash",
+                 "structure_type", "floor_area", "price_list_version", "house_sales_price", "total_sales_price")
+_JSON_COLUMNS = ("customer_info", "project_details", "line_items", "financial_summary")
+MAX_PAGE_SIZE = 200
+
+METRICS.describe("quote_archive_written_total", "counter", "Teklif arşivine yazılan kayıtlar.")
+METRICS.describe("quote_archive_dropped_total", "counter", "Kuyruk dolu veya yazma hatası nedeniyle arşivlenemeyen kayıtlar.")
+
+
+def configuration_key(project_details):
+    """
+    Fiyatı belirleyen proje alanlarının özeti. Müşteri, dil vb. alanlardan bağımsızdır;
+    aynı yapılandırmanın eski tekliflerini bulmak için kullanılır.
+    """
+    fields = {name: project_details[name] for name in sorted(PROJECT_FIELD_TYPES) if name in project_details}
+    if 'profit_rate' in project_details:
+        fields['profit_rate'] = project_details['profit_rate']
+    encoded = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class QuoteArchive:
+    """
+    SQLite tabanlı teklif arşivi. record() yalnızca kuyruğa ekler; yazıcı iş parçacığı kayıtları
+    `batch_size` adetlik veya `flush_seconds` aralıklı tek işlemlerle yazar. Okumalar her iş
+    parçacığının kendi bağlantısıyla yapılır (WAL sayesinde yazmayı beklemez).
+    """
+
+    def __init__(self, path, enabled=True, store_pdfs=False, batch_size=100, flush_seconds=1.0,
+                 max_queue=10000, busy_timeout=30.0):
+        self.path = path
+        self.enabled = enabled
+        self.store_pdfs = store_pdfs
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.busy_timeout = busy_timeout
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._initialized = False
+
+    @classmethod
+    def from_config(cls):
+        return cls(QUOTE_ARCHIVE_PATH, enabled=QUOTE_ARCHIVE_ENABLED, store_pdfs=QUOTE_ARCHIVE_STORE_PDFS,
+                   batch_size=QUOTE_ARCHIVE_BATCH_SIZE, flush_seconds=QUOTE_ARCHIVE_FLUSH_SECONDS,
+                   max_queue=QUOTE_ARCHIVE_MAX_QUEUE)
+
+    # --- Yazma ---
+    def record(self, quote_id, customer_info, project_details, results, documents=None, source=None):
+        """
+        Teklifi arşiv kuyruğuna ekler ve hemen döner. `results`: calculate_costs_detailed
+        sözlüğü; `documents`: {belge_adı: pdf_baytları}. Kuyruk doluysa kayıt atılır.
+        """
+        if not self.enabled:
+            return False
+        self._start()
+        # Kuyrukta PDF baytları yalnızca saklanacaklarsa tutulur; aksi halde boyut ve özet yeter.
+        documents = [
+            (name, len(data), hashlib.sha256(data).hexdigest(), data if self.store_pdfs else None)
+            for name, data in (documents or {}).items()
+        ]
+        entry = (time.time(), quote_id, source, customer_info, project_details, results, documents)
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+            METRICS.inc("quote_archive_dropped_total", {"reason": "queue_full"})
+            return False
+        return True
+
+    def flush(self):
+        """Kuyruktaki tüm kayıtlar yazılana kadar bekler."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._writer, name="quote-archive", daemon=True)
+                    self._thread.start()
+                    # Süreç kapanırken kuyrukta kalan kayıtlar yazılır.
+                    atexit.register(self.flush)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if not self._initialized:
+                with self._lock:
+                    if not self._initialized:
+                        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                        init = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+                        init.execute("PRAGMA journal_mode=WAL")
+                        init.executescript(_SCHEMA)
+                        init.close()
+                        self._initialized = True
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _writer(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+                self.written += len(batch)
+                METRICS.inc("quote_archive_written_total", amount=len(batch))
+            except Exception as e:
+                print(f"UYARI: Teklif arşivine yazılamadı ({len(batch)} kayıt): {e}")
+                self.dropped += len(batch)
+                METRICS.inc("quote_archive_dropped_total", {"reason": "error"}, amount=len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _rows(self, batch):
+        quotes, documents = [], []
+        for created_at, quote_id, source, customer_info, project_details, results, pdfs in batch:
+            costs_df = results['costs_df']
+            line_items = costs_df.to_dict('records') if hasattr(costs_df, 'to_dict') else list(costs_df)
+            floor_area = calculate_project_areas(project_details)['floor']
+            quotes.append((
+                quote_id, created_at, source,
+                customer_info.get('name'), (customer_info.get('email') or '').strip().lower() or None,
+                configuration_key(project_details), project_details.get('structure_type'), floor_area,
+                results.get('price_list_version'), results['house_sales_price'], results['total_sales_price'],
+                _dumps(customer_info), _dumps(project_details), _dumps(line_items), _dumps(results['financial_summary']),
+            ))
+            for name, size, sha256, data in pdfs:
+                documents.append((quote_id, name, size, sha256, zlib.compress(data, 6) if data is not None else None))
+        return quotes, documents
+
+    def _write(self, batch):
+        quotes, documents = self._rows(batch)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO quotes (quote_id, created_at, source, customer_name, customer_email, config_hash,"
+                " structure_type, floor_area, price_list_version, house_sales_price, total_sales_price,"
+                " customer_info, project_details, line_items, financial_summary)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                quotes,
+            )
+            # Aynı teklif kimliği aynı PDF'leri ifade eder; belgeler bir kez saklanır.
+            conn.executemany(
+                "INSERT OR IGNORE INTO quote_documents (quote_id, name, size, sha256, data)"
+                " VALUES (?, ?, ?, ?, ?)",
+                documents,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # --- Okuma ---
+    def search(self, email=None, name=None, created_from=None, created_to=None, min_total=None, max_total=None,
+               config_hash=None, structure_type=None, limit=50, cursor=None):
+        """
+        Filtrelere uyan teklifleri en yeniden eskiye listeler. `name` ad başlangıcıyla (büyük/küçük
+        harf duyarsız), `email` tam eşleşir. `cursor` bir önceki sayfanın next_cursor değeridir.
+        {"items": [...], "next_cursor": kimlik veya None} döndürür.
+        """
+        clauses, params = [], []
+        if email:
+            clauses.append("customer_email = ?")
+            params.append(email.strip().lower())
+        if name:
+            escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("customer_name LIKE ? ESCAPE '\\'")
+            params.append(f"{escaped}%")
+        if created_from is not None:
+            clauses.append("created_at >= ?")
+            params.append(created_from)
+        if created_to is not None:
+            clauses.append("created_at < ?")
+            params.append(created_to)
+        if min_total is not None:
+            clauses.append("total_sales_price >= ?")
+            params.append(min_total)
+        if max_total is not None:
+            clauses.append("total_sales_price <= ?")
+            params.append(max_total)
+        if config_hash:
+            clauses.append("config_hash = ?")
+            params.append(config_hash)
+        if structure_type:
+            clauses.append("structure_type = ?")
+            params.append(structure_type)
+        if cursor is not None:
+            clauses.append("id < ?")
+            params.append(cursor)
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            f"SELECT {', '.join(_LIST_COLUMNS)} FROM quotes {where} ORDER BY id DESC LIMIT ?",
+            params + [limit + 1],
+        ).fetchall()
+        items = [dict(row) for row in rows[:limit]]
+        return {"items": items, "next_cursor": items[-1]["id"] if len(rows) > limit else None}
+
+    def get(self, archive_id):
+        """Tek bir arşiv kaydını tüm ayrıntılarıyla (kalemler, belgeler) döndürür; yoksa None."""
+        row = self._conn().execute("SELECT * FROM quotes WHERE id = ?", (archive_id,)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        for column in _JSON_COLUMNS:
+            record[column] = json.loads(record[column])
+        record["documents"] = {
+            doc["name"]: {"size": doc["size"], "sha256": doc["sha256"], "stored": bool(doc["stored"])}
+            for doc in self._conn().execute(
+                "SELECT name, size, sha256, data IS NOT NULL AS stored"
+                " FROM quote_documents WHERE quote_id = ?", (record["quote_id"],)
+            )
+        }
+        return record
+
+    def document(self, quote_id, name):
+        """Arşivlenmiş PDF baytlarını döndürür; saklanmamışsa None."""
+        row = self._conn().execute(
+            "SELECT data FROM quote_documents WHERE quote_id = ? AND name = ?", (quote_id, name)
+        ).fetchone()
+        if row is None or row["data"] is None:
+            return None
+        return zlib.decompress(row["data"])
+
+    def stats(self):
+        return {"enabled": self.enabled, "pending": self.pending(), "written": self.written, "dropped": self.dropped}
+
+
+QUOTE_ARCHIVE = QuoteArchive.from_config()
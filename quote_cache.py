@@ -0,0 +1,269 @@
+# quote_cache.py
+# Bu dosya, teklif sonuçları için iki katmanlı (bellek + isteğe bağlı disk) önbelleği içerir.
+# Fiyat sonuçları yalnızca proje bilgileri ve fiyat listesi sürümüyle anahtarlanır; müşteri
+# bilgisi içeren PDF'ler ise isteğin tamamıyla anahtarlanır. Anahtarlar, sözlük sırasından
+# bağımsız olan kanonik bir JSON gösteriminin SHA-256 özetidir.
+
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+from config import (
+    PRICE_LIST_VERSION, QUOTE_CACHE_ENABLED, QUOTE_CACHE_MAX_ENTRIES, QUOTE_CACHE_MAX_BYTES,
+    QUOTE_CACHE_DIR, QUOTE_CACHE_DISK_MAX_BYTES,
+)
+
+_MISSING = object()
+
+
+def canonical_hash(*parts):
+    """Verilen değerlerin anahtar sırasından bağımsız SHA-256 özetini döndürür."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _value_size(value):
+    """Bellek sınırı için yaklaşık boyut; yalnızca bayt içerikleri (PDF'ler) sayılır."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(v) for v in value.values() if isinstance(v, (bytes, bytearray)))
+    return 0
+
+
+class LRUCache:
+    """Kayıt sayısı ve toplam bayt boyutuyla sınırlı, iş parçacığı güvenli LRU bellek önbelleği."""
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        size = _value_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._total_bytes -= self._sizes.pop(key)
+                del self._data[key]
+            self._data[key] = value
+            self._sizes[key] = size
+            self._total_bytes += size
+            while len(self._data) > self.max_entries or self._total_bytes > self.max_bytes:
+                old_key, _ = self._data.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(old_key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+
+class DiskCache:
+    """
+    Her kaydı ayrı bir pickle dosyası olarak saklayan disk önbelleği. Yazmalar geçici dosya
+    ve os.replace ile atomiktir; toplam boyut aşılınca en eski dosyalar silinir.
+    Yalnızca uygulamanın kendi yazdığı dizin için kullanılmalıdır (pickle güvenilir veri ister).
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return default
+        except Exception as e:
+            print(f"UYARI: Bozuk önbellek dosyası siliniyor ({path}): {e}")
+            self._remove(path)
+            return default
+        try:
+            os.utime(path)  # Son kullanım zamanını güncelle (LRU temizliği için)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"UYARI: Önbellek diske yazılamadı: {e}")
+            return
+        self._evict()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".pkl"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+            if total <= self.max_bytes:
+                return
+            for _, size, path in sorted(entries):
+                self._remove(path)
+                total -= size
+                if total <= self.max_bytes:
+                    return
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                self._remove(entry.path)
+
+
+class TieredCache:
+    """Önce bellek, sonra (varsa) disk katmanına bakar; diskte bulunan kayıt belleğe alınır."""
+
+    def __init__(self, memory, disk=None):
+        self.memory = memory
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        value = self.memory.get(key, _MISSING)
+        if value is _MISSING and self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self.memory.put(key, value)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+class QuoteCache:
+    """
+    Teklif önbelleği. Fiyat sonuçları proje bilgileriyle, PDF belgeleri ise isteğin tamamı
+    (müşteri bilgisi, proje, logo) ile anahtarlanır. Döndürülen sonuçlar paylaşılır;
+    çağıranlar içlerindeki DataFrame'leri değiştirmemelidir.
+    """
+
+    def __init__(self, enabled=True, max_entries=1024, max_bytes=64 * 1024 * 1024,
+                 directory=None, disk_max_bytes=512 * 1024 * 1024, price_list_version=PRICE_LIST_VERSION):
+        self.enabled = enabled
+        self.price_list_version = price_list_version
+        pricing_disk = documents_disk = None
+        if directory:
+            pricing_disk = DiskCache(os.path.join(directory, "pricing"), disk_max_bytes // 8)
+            documents_disk = DiskCache(os.path.join(directory, "documents"), disk_max_bytes)
+        self.pricing = TieredCache(LRUCache(max_entries, max_bytes), pricing_disk)
+        self.documents = TieredCache(LRUCache(max_entries, max_bytes), documents_disk)
+
+    @classmethod
+    def from_config(cls):
+        return cls(QUOTE_CACHE_ENABLED, QUOTE_CACHE_MAX_ENTRIES, QUOTE_CACHE_MAX_BYTES,
+                   QUOTE_CACHE_DIR, QUOTE_CACHE_DISK_MAX_BYTES)
+
+    def pricing_key(self, project_details, price_list_version=None):
+        return canonical_hash("pricing", price_list_version or self.price_list_version, project_details)
+
+    def documents_key(self, payload, price_list_version=None):
+        return canonical_hash("documents", price_list_version or self.price_list_version, payload)
+
+    def get_pricing(self, project_details, compute, price_list_version=None):
+        """
+        Aynı proje bilgileri için hesaplamayı atlar; yoksa compute() sonucunu saklar.
+        `price_list_version`, compute() içinde kullanılan fiyat listesinin sürümü olmalıdır.
+        """
+        if not self.enabled:
+            return compute()
+        key = self.pricing_key(project_details, price_list_version)
+        results = self.pricing.get(key)
+        if results is None:
+            results = compute()
+            self.pricing.put(key, results)
+        return dict(results)
+
+    def get_documents(self, payload, render, price_list_version=None):
+        """Aynı istek için PDF'leri yeniden oluşturmaz; yoksa render() sonucunu saklar."""
+        if not self.enabled:
+            return render()
+        key = self.documents_key(payload, price_list_version)
+        documents = self.documents.get(key)
+        if documents is None:
+            documents = render()
+            self.documents.put(key, documents)
+        return dict(documents)
+
+    def lookup_documents(self, quote_id):
+        """documents_key() ile üretilmiş teklif kimliğine ait PDF'leri döndürür; yoksa None."""
+        if not self.enabled:
+            return None
+        documents = self.documents.get(quote_id)
+        return dict(documents) if documents is not None else None
+
+    def clear(self):
+        self.pricing.clear()
+        self.documents.clear()
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "price_list_version": self.price_list_version,
+            "pricing": {"entries": len(self.pricing.memory), "hits": self.pricing.hits, "misses": self.pricing.misses},
+            "documents": {
+                "entries": len(self.documents.memory), "bytes": self.documents.memory.total_bytes,
+                "hits": self.documents.hits, "misses": self.documents.misses,
+            },
+        }
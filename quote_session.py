@@ -0,0 +1,160 @@
+# quote_session.py
+# Bu dosya, form alanları tek tek değiştikçe fiyatı artımlı olarak güncelleyen teklif
+# oturumlarını içerir. Oturum tam 'project_details' ile açılır; sonraki değişikliklerde
+# (ör. window_count=4, heating=true) yalnızca değişen alanlara bağlı maliyet kalemleri
+# yeniden hesaplanır. Bağımlılık grafiği kural tablosundan (pricing_rules) türetilir;
+# finansal özet (fire, genel gider, kâr, KDV, toplamlar) her değişiklikte yeniden toplanır.
+# Sonuçlar calculator.price_project ile birebir aynıdır; PDF oluşturulmaz.
+
+import time
+import uuid
+import threading
+from itertools import chain
+from collections import OrderedDict
+
+from config import QUOTE_SESSION_MAX_SESSIONS, QUOTE_SESSION_TTL_SECONDS
+from calculator import LineItem, build_quote_result, validate_project_details
+from price_list import PRICE_LISTS
+from pricing_rules import LINE_ITEM_RULES, compile_rule_evaluators, rule_dependencies
+from utils import calculate_project_areas
+
+# Alan (m²) hesabını etkileyen ölçü alanları
+AREA_FIELDS = frozenset(('width', 'length', 'height', 'is_two_story', 'height_2nd_floor'))
+
+_RULE_EVALUATORS = compile_rule_evaluators(LINE_ITEM_RULES, LineItem)
+_FIELD_DEPENDENTS, _AREA_DEPENDENTS = rule_dependencies(LINE_ITEM_RULES)
+# Ayrı satış fiyatı (solar, Aether paketi) üreten kurallar
+_SEPARATE_SALES_RULES = tuple(index for index, rule in enumerate(LINE_ITEM_RULES) if rule.result)
+
+
+class QuoteSession:
+    """
+    Tek bir form oturumunun fiyat durumu. Her kuralın ürettiği kalemler ayrı saklanır;
+    apply() yalnızca değişen alanlara bağlı kuralları yeniden çalıştırır.
+    Fiyat listesi değişmişse bir sonraki güncellemede tüm kalemler yeni listeyle hesaplanır.
+    """
+
+    def __init__(self, project_details, price_list=None, session_id=None):
+        self.id = session_id or uuid.uuid4().hex
+        self.project_details = dict(project_details)
+        self.price_list = price_list or PRICE_LISTS.current()
+        validate_project_details(self.project_details, self.price_list)
+        self.areas = calculate_project_areas(self.project_details)
+        self.created_at = self.last_used_at = time.time()
+        self._lock = threading.Lock()
+        # Kural sırasıyla her kuralın kalemleri, profil kalemleri ve ayrı satış fiyatları
+        self._items = [None] * len(LINE_ITEM_RULES)
+        self._profile_items = [None] * len(LINE_ITEM_RULES)
+        self._separate_sales = [None] * len(LINE_ITEM_RULES)
+        for index in range(len(LINE_ITEM_RULES)):
+            self._store(index, self._evaluate(index, self.project_details, self.areas, self.price_list))
+        self.result = self._summarize()
+
+    @staticmethod
+    def _evaluate(index, project_details, areas, price_list):
+        items = []
+        profile_items = []
+        separate_sales = _RULE_EVALUATORS[index](project_details, areas, price_list.prices, items, profile_items)
+        return items, profile_items, separate_sales
+
+    def _store(self, index, output):
+        self._items[index], self._profile_items[index], self._separate_sales[index] = output
+
+    def _summarize(self):
+        separate_sales = {}
+        for index in _SEPARATE_SALES_RULES:
+            separate_sales.update(self._separate_sales[index])
+        return build_quote_result(self.project_details, self.areas, self.price_list,
+                                  list(chain.from_iterable(self._items)),
+                                  list(chain.from_iterable(self._profile_items)), separate_sales)
+
+    def apply(self, changes):
+        """
+        Değişiklikleri uygular ve yeniden hesaplanan kuralların anahtarlarını döndürür.
+        None değeri alanı siler (varsayılan değer kullanılır). Değişiklik sonrası proje
+        bilgileri /calculate ile aynı şekilde doğrulanır; InvalidProjectError veya hesaplama
+        hatasında oturum değişmeden kalır.
+        """
+        with self._lock:
+            project_details = dict(self.project_details)
+            changed = set()
+            for name, value in changes.items():
+                if value is None:
+                    if name in project_details:
+                        del project_details[name]
+                        changed.add(name)
+                elif name not in project_details or project_details[name] != value:
+                    project_details[name] = value
+                    changed.add(name)
+
+            price_list = PRICE_LISTS.current()
+            validate_project_details(project_details, price_list)
+            areas = self.areas
+            if price_list.version != self.price_list.version:
+                dirty = set(range(len(LINE_ITEM_RULES)))
+                areas = calculate_project_areas(project_details)
+            else:
+                dirty = set()
+                if changed & AREA_FIELDS:
+                    areas = calculate_project_areas(project_details)
+                    for name, value in areas.items():
+                        if value != self.areas[name]:
+                            dirty.update(_AREA_DEPENDENTS.get(name, ()))
+                for name in changed:
+                    dirty.update(_FIELD_DEPENDENTS.get(name, ()))
+
+            outputs = {index: self._evaluate(index, project_details, areas, price_list) for index in sorted(dirty)}
+            for index, output in outputs.items():
+                self._store(index, output)
+            self.project_details = project_details
+            self.areas = areas
+            self.price_list = price_list
+            self.result = self._summarize()
+            return [LINE_ITEM_RULES[index].key for index in sorted(dirty)]
+
+    def preview(self, include_items=False):
+        """JSON'a uygun fiyat özeti; include_items ile maliyet kalemleri de eklenir."""
+        return dict(session_id=self.id, **self.result.summary_dict(include_items))
+
+
+class QuoteSessionStore:
+    """Bellekteki teklif oturumları: sayıyla sınırlı (en eski kullanılan atılır) ve süreli."""
+
+    def __init__(self, max_sessions=1000, ttl_seconds=30 * 60):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls):
+        return cls(QUOTE_SESSION_MAX_SESSIONS, QUOTE_SESSION_TTL_SECONDS)
+
+    def create(self, project_details):
+        """Yeni oturum açar (ilk hesaplama burada yapılır) ve döndürür."""
+        session = QuoteSession(project_details)
+        with self._lock:
+            self._expire()
+            self._sessions[session.id] = session
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id):
+        """Oturumu döndürür; bilinmeyen veya süresi dolmuş kimlik için None."""
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used_at = time.time()
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _expire(self):
+        # Oturumlar son kullanım sırasıyla tutulduğundan süresi dolanlar baştadır.
+        deadline = time.time() - self.ttl_seconds
+        while self._sessions and next(iter(self._sessions.values())).last_used_at < deadline:
+            self._sessions.popitem(last=False)
@@ -0,0 +1,320 @@
+# scenarios.py
+# Bu dosya, fiyat değişikliklerinin (ör. "tüm steel_profile_* fiyatlarına +%12") kayıtlı
+# standart yapılandırmaların satış fiyatlarını nasıl etkilediğini hesaplayan senaryo motorunu
+# içerir. Her senaryo geçerli fiyat listesinden türetilmiş yeni bir PriceList anlık
+# görüntüsüdür (FIYATLAR anahtarları ve fire/KDV/genel gider oranları değiştirilebilir).
+# Katalogdaki tüm yapılandırmalar her senaryoda batch_calculator ile sütun işlemleriyle
+# fiyatlanır; girdi sütunları ve alanlar yalnızca bir kez hazırlanır. Sonuç, yapılandırma ×
+# senaryo fark (delta) tablosudur. Çok sayıda senaryoda isteğe bağlı olarak süreç havuzu
+# kullanılır. Komut satırından da çalıştırılabilir:
+#     python scenarios.py katalog.json senaryolar.json --metric total_sales_price --out deltalar.csv
+
+import os
+import re
+import json
+import argparse
+import fnmatch
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from bulk_quotes import BulkQuoteError, iter_rows, parse_row
+from calculator import InvalidProjectError, validate_project_details
+from price_list import PRICE_LISTS, RATE_KEYS, PriceList, PriceListError
+
+# Birden çok orana tek adla uygulanabilen gruplar
+RATE_GROUPS = {
+    'overhead': ('monthly_accounting_expenses', 'monthly_office_rent'),
+}
+DEFAULT_METRICS = ('total_sales_price',)
+# Karşılaştırılabilen sonuç sütunları (batch_calculator.calculate_costs_batch çıktısı)
+METRIC_COLUMNS = (
+    'material_subtotal', 'waste_cost', 'overhead_cost', 'total_cost_before_profit', 'profit',
+    'price_before_vat', 'vat_amount', 'house_sales_price', 'solar_sales_price',
+    'aether_package_sales_price', 'total_sales_price',
+)
+BASE_SCENARIO = 'base'
+
+# "<hedef> <işlem>" biçimi; ':' veya '=' ayırıcıdır. İşlemler: +12%, -5%, x1.1 (*1.1), +500, -20, =0.07
+_SPEC_PATTERN = re.compile(
+    r'^\s*(?P<target>[^:=\s]+)\s*(?P<sep>[:=])\s*(?P<op>[+\-*x]?)\s*(?P<value>\d+(?:[.,]\d+)?)\s*(?P<percent>%?)\s*$'
+)
+
+
+class ScenarioError(ValueError):
+    """Senaryo tanımı ayrıştırılamadığında veya hiçbir fiyatla eşleşmediğinde fırlatılır."""
+
+
+class Perturbation:
+    """
+    Tek bir fiyat değişikliği. `target` FIYATLAR anahtarı için glob deseni (ör. 'steel_profile_*'),
+    oran adı (fire_rate, vat_rate, monthly_*) veya oran grubudur ('overhead').
+    `op`: 'percent' (yüzde değişim), 'factor' (çarpan), 'add' (mutlak ekleme) veya 'set' (yeni değer).
+    """
+    __slots__ = ('target', 'op', 'value')
+
+    def __init__(self, target, op, value):
+        if op not in ('percent', 'factor', 'add', 'set'):
+            raise ScenarioError(f"Bilinmeyen işlem: {op}")
+        self.target = target
+        self.op = op
+        self.value = float(value)
+
+    @classmethod
+    def parse(cls, spec):
+        """'steel_profile_*: +12%', 'fire_rate = 0.07', 'overhead: +100', 'sandwich_panel_m2: x1.1' biçimlerini okur."""
+        match = _SPEC_PATTERN.match(spec)
+        if match is None:
+            raise ScenarioError(f"Senaryo değişikliği okunamadı: {spec!r} (ör. 'steel_profile_*: +12%')")
+        sign, value = match['op'], float(match['value'].replace(',', '.'))
+        if match['percent']:
+            if sign not in ('+', '-'):
+                raise ScenarioError(f"Yüzde değişim işaretli olmalıdır (ör. +12% veya -5%): {spec!r}")
+            return cls(match['target'], 'percent', -value if sign == '-' else value)
+        if sign in ('*', 'x'):
+            return cls(match['target'], 'factor', value)
+        if sign in ('+', '-'):
+            return cls(match['target'], 'add', -value if sign == '-' else value)
+        return cls(match['target'], 'set', value)
+
+    def apply_to(self, value):
+        if self.op == 'percent':
+            return value * (1 + self.value / 100.0)
+        if self.op == 'factor':
+            return value * self.value
+        if self.op == 'add':
+            return value + self.value
+        return self.value
+
+    def matching_keys(self, prices):
+        """Değişikliğin uygulandığı (fiyatlar, oranlar) anahtar listeleri."""
+        if self.target in RATE_GROUPS:
+            return [], list(RATE_GROUPS[self.target])
+        if self.target in RATE_KEYS:
+            return [], [self.target]
+        return [key for key in prices if fnmatch.fnmatchcase(key, self.target)], []
+
+    def __repr__(self):
+        return f"Perturbation({self.target!r}, {self.op!r}, {self.value!r})"
+
+
+class Scenario:
+    """Adlandırılmış değişiklik listesi; apply() ile yeni bir fiyat listesi üretir."""
+
+    def __init__(self, name, perturbations):
+        self.name = name
+        self.perturbations = list(perturbations)
+
+    @classmethod
+    def from_spec(cls, name, spec):
+        """`spec`: değişiklik metinleri listesi veya ';' ile ayrılmış tek metin."""
+        if isinstance(spec, str):
+            spec = [part for part in spec.split(';') if part.strip()]
+        return cls(name, [change if isinstance(change, Perturbation) else Perturbation.parse(change) for change in spec])
+
+    def apply(self, price_list):
+        """Değişiklikleri sırayla uygular; doğrulanmış yeni bir PriceList döndürür."""
+        prices = dict(price_list.prices)
+        rates = price_list.rates
+        for change in self.perturbations:
+            price_keys, rate_keys = change.matching_keys(prices)
+            if not price_keys and not rate_keys:
+                raise ScenarioError(f"{self.name}: '{change.target}' hiçbir fiyatla eşleşmedi")
+            for key in price_keys:
+                prices[key] = change.apply_to(prices[key])
+            for key in rate_keys:
+                rates[key] = change.apply_to(rates[key])
+        try:
+            return PriceList(prices, rates, source=f"scenario:{self.name}")
+        except PriceListError as e:
+            raise ScenarioError(f"{self.name}: {e}")
+
+    def __repr__(self):
+        return f"Scenario({self.name!r}, {self.perturbations!r})"
+
+
+def load_scenarios(path):
+    """
+    JSON senaryo dosyasını okur: {"çelik +12%": ["steel_profile_*: +12%"], ...} veya
+    [{"name": ..., "changes": [...]}, ...].
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except OSError as e:
+        raise ScenarioError(f"Senaryo dosyası okunamadı ({path}): {e}")
+    except json.JSONDecodeError as e:
+        raise ScenarioError(f"Senaryo dosyası JSON hatası ({path}): {e}")
+    if isinstance(data, dict):
+        return [Scenario.from_spec(name, spec) for name, spec in data.items()]
+    return [Scenario.from_spec(entry['name'], entry['changes']) for entry in data]
+
+
+def load_catalog(path):
+    """
+    Kayıtlı yapılandırmaları {ad: project_details} olarak okur. JSON dosyası bir sözlük veya
+    liste olabilir; CSV/XLSX tabloları bulk_quotes ile aynı sütun kurallarıyla okunur
+    ('name' sütunu varsa yapılandırma adı olarak kullanılır).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ScenarioError(f"Katalog okunamadı ({path}): {e}")
+        if isinstance(data, dict):
+            return dict(data)
+        return {str(entry.pop('name', index)) if isinstance(entry, dict) else str(index): entry
+                for index, entry in enumerate(data, start=1)}
+    catalog = {}
+    for index, row in enumerate(iter_rows(path), start=1):
+        name = str(row.pop('name', None) or index)
+        catalog[name] = parse_row(row)[1]
+    return catalog
+
+
+class ScenarioSweep:
+    """
+    Senaryo taraması sonucu. `values[metrik]`: yapılandırma × (base + senaryolar) fiyat tablosu;
+    deltas() ve percent() temel fiyat listesine göre farkları döndürür.
+    """
+
+    def __init__(self, values, base_version, versions):
+        self.values = values
+        self.base_version = base_version
+        self.versions = versions
+
+    def deltas(self, metric=DEFAULT_METRICS[0]):
+        """Senaryo fiyatı - temel fiyat (yapılandırma × senaryo)."""
+        table = self.values[metric]
+        return table.drop(columns=BASE_SCENARIO).sub(table[BASE_SCENARIO], axis=0)
+
+    def percent(self, metric=DEFAULT_METRICS[0]):
+        """Temel fiyata göre yüzde değişim; temel fiyatı 0 olan hücreler NaN'dır."""
+        table = self.values[metric]
+        base = table[BASE_SCENARIO].where(table[BASE_SCENARIO] != 0)
+        return self.deltas(metric).div(base, axis=0) * 100.0
+
+    def summary(self, metric=DEFAULT_METRICS[0]):
+        """Senaryo başına ortalama/en küçük/en büyük fark (yönetim özeti)."""
+        deltas = self.deltas(metric)
+        percent = self.percent(metric)
+        return {
+            name: {
+                'price_list_version': self.versions[name],
+                'mean_delta': float(deltas[name].mean()),
+                'min_delta': float(deltas[name].min()),
+                'max_delta': float(deltas[name].max()),
+                'mean_percent': float(percent[name].mean()),
+            }
+            for name in deltas.columns
+        }
+
+
+# --- Süreç havuzu çalışanı ---
+_WORKER_INPUTS = None
+
+
+def _init_worker(frame):
+    global _WORKER_INPUTS
+    from batch_calculator import BatchInputs
+    _WORKER_INPUTS = BatchInputs(frame)
+
+
+def _price_scenarios(price_lists, metrics, inputs=None):
+    """Her fiyat listesi için {metrik: dizi} listesi (girdiler bir kez hazırlanmıştır)."""
+    from batch_calculator import calculate_costs_batch
+    inputs = inputs if inputs is not None else _WORKER_INPUTS
+    results = []
+    for price_list in price_lists:
+        frame = calculate_costs_batch(inputs, price_list)
+        results.append({metric: frame[metric].to_numpy() for metric in metrics})
+    return results
+
+
+def run_scenarios(catalog, scenarios, price_list=None, metrics=DEFAULT_METRICS, workers=0):
+    """
+    Katalogdaki yapılandırmaları temel fiyat listesiyle ve her senaryoyla fiyatlar.
+    `catalog`: {ad: project_details}, project_details listesi veya (doğrulanmış) DataFrame.
+    `workers` > 1 ise senaryolar süreç havuzunda parçalar halinde fiyatlanır (her çalışan
+    girdileri bir kez hazırlar). ScenarioSweep döndürür.
+    """
+    import pandas as pd
+    from batch_calculator import BatchInputs
+
+    if price_list is None:
+        price_list = PRICE_LISTS.current()
+    unknown = [metric for metric in metrics if metric not in METRIC_COLUMNS]
+    if unknown:
+        raise ScenarioError(f"Bilinmeyen sonuç sütunu: {', '.join(unknown)} ({', '.join(METRIC_COLUMNS)})")
+    names = [scenario.name for scenario in scenarios]
+    if BASE_SCENARIO in names or len(set(names)) != len(names):
+        raise ScenarioError(f"Senaryo adları benzersiz olmalı ve '{BASE_SCENARIO}' olmamalıdır")
+    if isinstance(catalog, pd.DataFrame):
+        frame = catalog
+    else:
+        if not isinstance(catalog, dict):
+            catalog = dict(enumerate(catalog, start=1))
+        # Toplu hesaplama geçerli girdiler bekler; geçersiz yapılandırmalar adlarıyla bildirilir.
+        invalid = []
+        for name, project_details in catalog.items():
+            try:
+                validate_project_details(project_details, price_list)
+            except InvalidProjectError as e:
+                invalid.append(f"{name}: {'; '.join(e.errors)}")
+        if invalid:
+            raise ScenarioError(f"Katalogda {len(invalid)} geçersiz yapılandırma var: " + " | ".join(invalid[:5]))
+        frame = pd.DataFrame(list(catalog.values()), index=pd.Index(list(catalog), name='configuration'))
+
+    price_lists = [price_list] + [scenario.apply(price_list) for scenario in scenarios]
+    if workers > 1 and len(price_lists) > 1:
+        chunk_size = -(-len(price_lists) // workers)
+        chunks = [price_lists[start:start + chunk_size] for start in range(0, len(price_lists), chunk_size)]
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(frame,)) as executor:
+            futures = [executor.submit(_price_scenarios, chunk, tuple(metrics)) for chunk in chunks]
+            results = [result for future in futures for result in future.result()]
+    else:
+        results = _price_scenarios(price_lists, metrics, BatchInputs(frame))
+
+    columns = [BASE_SCENARIO] + names
+    values = {
+        metric: pd.DataFrame({name: result[metric] for name, result in zip(columns, results)}, index=frame.index)
+        for metric in metrics
+    }
+    versions = {name: pl.version for name, pl in zip(columns, price_lists)}
+    return ScenarioSweep(values, price_list.version, versions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fiyat senaryolarının kayıtlı yapılandırmaların fiyatlarına etkisini hesaplar.")
+    parser.add_argument("catalog", help="Yapılandırma kataloğu (.json, .csv veya .xlsx)")
+    parser.add_argument("scenarios", help="Senaryo dosyası (.json)")
+    parser.add_argument("--metric", default=DEFAULT_METRICS[0], help="Karşılaştırılacak sonuç sütunu")
+    parser.add_argument("--percent", action="store_true", help="Mutlak fark yerine yüzde değişim yaz")
+    parser.add_argument("--workers", type=int, default=0, help="Süreç sayısı (0: tek süreç)")
+    parser.add_argument("--out", help="Fark tablosunun yazılacağı CSV (varsayılan: ekrana özet)")
+    args = parser.parse_args(argv)
+
+    try:
+        catalog = load_catalog(args.catalog)
+        scenarios = load_scenarios(args.scenarios)
+        sweep = run_scenarios(catalog, scenarios, metrics=(args.metric,), workers=args.workers)
+    except (ScenarioError, BulkQuoteError) as e:
+        print(f"Hata: {e}")
+        return 2
+    print(f"INFO: {len(catalog)} yapılandırma × {len(scenarios)} senaryo fiyatlandı "
+          f"(temel fiyat listesi {sweep.base_version}).")
+    table = sweep.percent(args.metric) if args.percent else sweep.deltas(args.metric)
+    if args.out:
+        table.round(2).to_csv(args.out)
+        print(f"INFO: Fark tablosu yazıldı: {args.out}")
+    for name, stats in sweep.summary(args.metric).items():
+        print(f"{name}: ortalama {stats['mean_delta']:+.2f} ({stats['mean_percent']:+.2f}%), "
+              f"en az {stats['min_delta']:+.2f}, en çok {stats['max_delta']:+.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
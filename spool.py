@@ -0,0 +1,56 @@
+# spool.py
+# Bu dosya, PDF'ler ve e-posta ekleri gibi büyük ikili içerikler için bellek sınırlı geçici
+# tamponları içerir. Tamponlar PDF_SPOOL_MAX_BYTES boyutuna kadar bellekte tutulur, üzerinde
+# otomatik olarak diske taşar (tempfile.SpooledTemporaryFile). İçerik parça parça okunur;
+# böylece eşzamanlı isteklerde aynı belgenin birden çok tam kopyası bellekte tutulmaz.
+
+import tempfile
+
+from config import PDF_SPOOL_MAX_BYTES, PDF_SPOOL_DIR
+
+# Parça parça okuma/yazma boyutu (bayt)
+CHUNK_SIZE = 64 * 1024
+
+
+def spooled_buffer(max_size=None):
+    """Eşik aşılınca diske taşan boş bir ikili tampon döndürür."""
+    return tempfile.SpooledTemporaryFile(
+        max_size=PDF_SPOOL_MAX_BYTES if max_size is None else max_size, mode="w+b", dir=PDF_SPOOL_DIR
+    )
+
+
+def spool_bytes(data):
+    """Baytları yeni bir tampona yazar ve başa sarılmış tamponu döndürür."""
+    buffer = spooled_buffer()
+    buffer.write(data)
+    buffer.seek(0)
+    return buffer
+
+
+def read_buffer(buffer, close=True):
+    """Tamponun tüm içeriğini bayt olarak döndürür (varsayılan olarak tamponu kapatır)."""
+    try:
+        buffer.seek(0)
+        return buffer.read()
+    finally:
+        if close:
+            buffer.close()
+
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE):
+    """
+    Bayt dizisini veya ikili dosya nesnesini baştan sona `chunk_size` parçalar halinde okur.
+    Bayt dizilerinde parçalar kopyalanmadan (memoryview) döndürülür.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+        return
+    source.seek(0)
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
@@ -0,0 +1,29 @@
+# tests/conftest.py
+# Bu dosya, testlerin ortak hazırlığını içerir: modüller depo kökünden içe aktarılır ve
+# fiyatlar ortamdaki PRICE_LIST_PATH'ten bağımsız olarak config.FIYATLAR ile hesaplanır.
+# baseline_quotes.json, ilk sürümdeki (baseline) calculate_costs_detailed'in ürettiği
+# kalemleri ve toplamları içerir; fiyatlama motoru bu sonuçları birebir üretmelidir.
+
+import os
+import sys
+import json
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@pytest.fixture(scope="session")
+def price_list():
+    from config import FIYATLAR
+    from price_list import PriceList
+    return PriceList(FIYATLAR)
+
+
+@pytest.fixture(scope="session")
+def baseline_quotes():
+    with open(os.path.join(FIXTURES_DIR, "baseline_quotes.json"), encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,52 @@
+# tests/test_batch_calculator.py
+# Vektörel toplu fiyatlamanın (batch_calculator) tekil motorla (calculator.price_project) ve
+# ilk sürümün sonuçlarıyla (baseline_quotes.json) birebir aynı olduğunu doğrular.
+
+import pandas as pd
+
+from batch_calculator import calculate_costs_batch
+from calculator import price_project
+from utils import calculate_project_areas
+
+# Toplu sonuçta da bulunan finansal alanlar
+FINANCIAL_FIELDS = (
+    'material_subtotal', 'waste_cost', 'overhead_cost', 'total_cost_before_profit', 'profit',
+    'price_before_vat', 'vat_amount', 'house_sales_price', 'solar_sales_price',
+    'aether_package_sales_price', 'total_sales_price', 'delivery_duration_business_days',
+)
+BASELINE_FIELDS = ('house_sales_price', 'solar_sales_price', 'aether_package_sales_price',
+                   'total_sales_price', 'delivery_duration_business_days')
+
+
+def test_batch_matches_scalar(baseline_quotes, price_list):
+    projects = [quote['project_details'] for quote in baseline_quotes]
+    batch = calculate_costs_batch(projects, price_list)
+    assert len(batch) == len(projects)
+    for i, project in enumerate(projects):
+        areas = calculate_project_areas(project)
+        scalar = price_project(project, areas, price_list)
+        row = batch.iloc[i]
+        for field in FINANCIAL_FIELDS:
+            assert row[field] == getattr(scalar, field), (i, field)
+        assert row['floor_area'] == areas['floor']
+        assert row['wall_area'] == areas['wall']
+        assert row['roof_area'] == areas['roof']
+
+
+def test_batch_matches_baseline(baseline_quotes, price_list):
+    batch = calculate_costs_batch([quote['project_details'] for quote in baseline_quotes], price_list)
+    for i, quote in enumerate(baseline_quotes):
+        row = batch.iloc[i]
+        for field in BASELINE_FIELDS:
+            assert row[field] == quote[field], (i, field)
+        assert row['material_subtotal'] == quote['financial_summary']['Total Material and Labor Cost'], i
+
+
+def test_batch_input_forms_agree(baseline_quotes, price_list):
+    # Sözlük listesi, DataFrame ve sütun sözlüğü aynı sonucu vermelidir.
+    projects = [quote['project_details'] for quote in baseline_quotes]
+    from_records = calculate_costs_batch(projects, price_list)
+    frame = pd.DataFrame(projects)
+    pd.testing.assert_frame_equal(calculate_costs_batch(frame, price_list), from_records)
+    columns = {name: frame[name].tolist() for name in frame.columns}
+    pd.testing.assert_frame_equal(calculate_costs_batch(columns, price_list), from_records)
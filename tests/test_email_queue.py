@@ -0,0 +1,156 @@
+# tests/test_email_queue.py
+# Akışlı e-posta gönderiminin (iter_email_message/send_streaming) yerel bir SMTP sunucusuna
+# eki bayt bayt aynı ulaştırdığını ve satır başındaki noktaları SMTP kuralına göre ikilediğini
+# doğrular. Sunucu, DATA içeriğini kablodaki haliyle (nokta ikilemesi geri alınmadan) saklar.
+
+import os
+import re
+import email
+import threading
+import socketserver
+
+import pytest
+
+from email_queue import (
+    STATUS_SENT, EmailDeliveryQueue, SMTPSession, SMTPSettings, build_email_message, iter_email_message,
+)
+from spool import spool_bytes
+
+SENDER = "teklif@example.com"
+RECIPIENT = "musteri@example.com"
+# Satır başında nokta, iki nokta ve tek başına nokta içeren gövde; ikilenmezse "." satırı DATA'yı bitirirdi.
+BODY = "<p>Teklifiniz ektedir.</p>\n.gizli satir\n..iki nokta\n.\n<p>Son</p>"
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line + b"\r\n")
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply(b"220 localhost ESMTP test")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in (b"EHLO", b"HELO"):
+                self.reply(b"250 localhost")
+            elif command == b"DATA":
+                self.reply(b"354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if data_line in (b".\r\n", b""):
+                        break
+                    lines.append(data_line)
+                self.server.messages.append(b"".join(lines))
+                self.reply(b"250 OK")
+            elif command == b"QUIT":
+                self.reply(b"221 Bye")
+                return
+            else:  # MAIL, RCPT, NOOP, RSET
+                self.reply(b"250 OK")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.messages = []
+        self.connections = 0
+
+
+@pytest.fixture
+def smtp_server():
+    server = _SMTPServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def settings(smtp_server):
+    return SMTPSettings("127.0.0.1", smtp_server.server_address[1], sender=SENDER, use_tls=False, timeout=5)
+
+
+def unstuff(wire):
+    return re.sub(rb"(?m)^\.", b"", wire)
+
+
+def attachment_of(message_bytes):
+    message = email.message_from_bytes(message_bytes)
+    parts = [part for part in message.walk() if part.get_content_maintype() != "multipart"]
+    return message, parts
+
+
+# Boyut 57'nin katı değil ve bir base64 parçasından (57 KiB) büyük: son satır ve parça sınırları da denenir.
+@pytest.mark.parametrize("size", [0, 1, 57 * 1024, 200_003])
+@pytest.mark.parametrize("spooled", [False, True])
+def test_streamed_attachment_is_byte_exact(smtp_server, settings, size, spooled):
+    pdf_data = os.urandom(size)
+    attachment = spool_bytes(pdf_data) if spooled else pdf_data
+    session = SMTPSession(settings)
+    try:
+        session.send(RECIPIENT, "Teklif", BODY, attachment, "teklif.pdf")
+    finally:
+        session.close()
+
+    assert len(smtp_server.messages) == 1
+    message, parts = attachment_of(unstuff(smtp_server.messages[0]))
+    assert message["From"] == SENDER and message["To"] == RECIPIENT and message["Subject"] == "Teklif"
+    body_part, pdf_part = parts
+    # Gövde satırları kabloda CRLF ile biter.
+    assert body_part.get_payload(decode=True).decode() == BODY.replace("\n", "\r\n")
+    assert pdf_part.get_payload(decode=True) == pdf_data
+    assert pdf_part.get_filename() == "teklif.pdf"
+
+    # Bellekte oluşturulan mesajla aynı parça başlıkları ve aynı ek
+    reference = build_email_message(SENDER, RECIPIENT, "Teklif", BODY, pdf_data, "teklif.pdf")
+    reference_parts = [part for part in reference.walk() if part.get_content_maintype() != "multipart"]
+    assert [part.items() for part in parts] == [part.items() for part in reference_parts]
+    assert pdf_part.get_payload(decode=True) == reference_parts[1].get_payload(decode=True)
+
+
+def test_dots_at_line_start_are_stuffed_on_the_wire(smtp_server, settings):
+    session = SMTPSession(settings)
+    try:
+        session.send(RECIPIENT, "Teklif", BODY, b"%PDF-1.4", "teklif.pdf")
+    finally:
+        session.close()
+
+    wire = smtp_server.messages[0]
+    assert b"\r\n..gizli satir\r\n" in wire
+    assert b"\r\n...iki nokta\r\n" in wire
+    assert b"\r\n..\r\n" in wire
+    # Nokta ile başlayan her satır ikilenmiştir.
+    assert all(line.startswith(b"..") for line in wire.split(b"\r\n") if line.startswith(b"."))
+
+
+def test_chunks_end_at_line_boundaries():
+    # send_streaming nokta ikilemesini parça parça yapar; her parça satır sonunda bitmelidir.
+    chunks = list(iter_email_message(SENDER, RECIPIENT, "Teklif", BODY, os.urandom(200_003), "teklif.pdf"))
+    assert len(chunks) > 3
+    assert all(bytes(chunk).endswith(b"\r\n") for chunk in chunks)
+    assert all(b"\n" not in bytes(chunk).replace(b"\r\n", b"") for chunk in chunks)
+
+
+def test_queue_reuses_one_connection(smtp_server, settings):
+    deliveries = EmailDeliveryQueue(settings, workers=1, idle_timeout=0.5)
+    try:
+        payloads = [os.urandom(1000 + i) for i in range(3)]
+        ids = [deliveries.submit(RECIPIENT, f"Teklif {i}", BODY, data, f"teklif_{i}.pdf")
+               for i, data in enumerate(payloads)]
+        statuses = deliveries.wait(ids, timeout=10)
+    finally:
+        deliveries.shutdown()
+
+    assert [status["status"] for status in statuses] == [STATUS_SENT] * 3
+    assert smtp_server.connections == 1
+    received = sorted((attachment_of(unstuff(wire))[1][1].get_payload(decode=True) for wire in smtp_server.messages),
+                      key=len)
+    assert received == payloads
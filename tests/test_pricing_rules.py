@@ -0,0 +1,26 @@
+# tests/test_pricing_rules.py
+# Kural tablosundan (pricing_rules.LINE_ITEM_RULES) derlenen fiyatlama motorunun ilk sürümdeki
+# if-zinciriyle aynı kalemleri, profil analizini ve finansal özeti ürettiğini doğrular.
+
+from calculator import calculate_costs_detailed
+from config import FIYATLAR
+from pricing_rules import required_price_keys
+from utils import calculate_project_areas
+
+
+def test_line_items_match_baseline(baseline_quotes, price_list):
+    for i, quote in enumerate(baseline_quotes):
+        project = quote['project_details']
+        results = calculate_costs_detailed(project, calculate_project_areas(project), price_list)
+        assert results['costs_df'].to_dict('records') == quote['line_items'], i
+        assert results['profile_analysis_df'].to_dict('records') == quote['profile_items'], i
+        # Etiketler (ör. "Profit (20%)") ve sıra da aynı olmalıdır.
+        assert list(results['financial_summary'].items()) == list(quote['financial_summary'].items()), i
+        for field in ('house_sales_price', 'solar_sales_price', 'aether_package_sales_price',
+                      'total_sales_price', 'delivery_duration_business_days'):
+            assert results[field] == quote[field], (i, field)
+
+
+def test_required_price_keys_are_in_default_price_list():
+    assert set(required_price_keys()) <= set(FIYATLAR)
+
@@ -0,0 +1,69 @@
+# tests/test_quote_session.py
+# Artımlı teklif oturumlarının (QuoteSession.apply) her değişiklikten sonra aynı proje
+# bilgileriyle yapılan tam hesaplamayla (calculate_costs_detailed) birebir aynı sonucu verdiğini
+# ve yalnızca etkilenen kuralları yeniden hesapladığını doğrular.
+
+import pytest
+
+from calculator import InvalidProjectError, calculate_costs_detailed
+from pricing_rules import LINE_ITEM_RULES
+from quote_session import QuoteSession
+from utils import calculate_project_areas
+
+# Sırayla uygulanan form değişiklikleri: adet, seçenek, ölçü (alan), kat, paket, kâr oranı, silme
+CHANGES = (
+    {'window_count': 4},
+    {'heating': True, 'electrical': True},
+    {'width': 9.5},
+    {'is_two_story': True},
+    {'length': 6, 'height': 3.0},
+    {'solar': True, 'solar_kw': 7.5},
+    {'aether_package_choice': 'Aether Living | Loft Elite (LUXURY)'},
+    {'structure_type': 'Light Steel', 'profile_100x100_count': 6, 'profile_50x50_count': 2},
+    {'profile_100x100_count': 0, 'profile_50x50_count': 0},
+    {'insulation_material_type': 'Glass Wool', 'insulation_wall': True, 'insulation_floor': True},
+    {'profit_rate': ['15%', 0.15]},
+    {'floor_covering': 'Ceramic', 'kitchen_choice': 'Special Design Kitchen'},
+    {'extra_expenses_amount': 750},
+    {'solar': False, 'solar_kw': None, 'wheeled_trailer': True, 'wheeled_trailer_price': 900.5},
+    {'is_two_story': False, 'aether_package_choice': 'None'},
+)
+
+
+def assert_matches_full(session):
+    project = session.project_details
+    full = calculate_costs_detailed(project, calculate_project_areas(project), session.price_list)
+    result = session.result.to_dict()
+    assert result['costs_df'].to_dict('records') == full['costs_df'].to_dict('records')
+    assert result['profile_analysis_df'].to_dict('records') == full['profile_analysis_df'].to_dict('records')
+    assert list(result['financial_summary'].items()) == list(full['financial_summary'].items())
+    for field in ('house_sales_price', 'solar_sales_price', 'aether_package_sales_price',
+                  'total_sales_price', 'delivery_duration_business_days', 'extra_expenses_info'):
+        assert result[field] == full[field], field
+
+
+@pytest.mark.parametrize("index", range(0, 24, 4))
+def test_apply_matches_full_calculation(baseline_quotes, index):
+    session = QuoteSession(baseline_quotes[index]['project_details'])
+    assert_matches_full(session)
+    for changes in CHANGES:
+        session.apply(changes)
+        assert_matches_full(session)
+
+
+def test_apply_recomputes_only_dependent_rules(baseline_quotes):
+    session = QuoteSession(baseline_quotes[0]['project_details'])
+    recomputed = session.apply({'window_count': session.project_details['window_count'] + 1})
+    assert recomputed
+    assert len(recomputed) < len(LINE_ITEM_RULES)
+    # Değişmeyen değer hiçbir kuralı yeniden hesaplatmaz.
+    assert session.apply({'window_count': session.project_details['window_count']}) == []
+
+
+def test_invalid_change_leaves_session_unchanged(baseline_quotes):
+    session = QuoteSession(baseline_quotes[0]['project_details'])
+    before = session.preview(include_items=True)
+    with pytest.raises(InvalidProjectError):
+        session.apply({'window_count': -1})
+    assert session.preview(include_items=True) == before
+    assert_matches_full(session)
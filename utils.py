@@ -5,9 +5,7 @@ import math
 import re
 import base64
 import io
-import requests
 from datetime import datetime
-from PIL import Image as PILImage
 
 # --- Görünmez Karakter Temizleme Fonksiyonu ---
 # Metinlerdeki görünmez karakterleri ve gereksiz boşlukları temizler.
@@ -40,6 +38,20 @@ def calculate_area(width, length, height, is_two_story, height_2nd_floor=0):
 
     return {"floor": floor_area, "wall": wall_area, "roof": roof_area}
 
+# Proje bilgilerindeki ölçülerden alanları hesaplar.
+def calculate_project_areas(project_details):
+    """
+    'project_details' sözlüğündeki ölçülerle calculate_area'yı çağırır.
+    Eksik ölçüler 0, 'is_two_story' eksikse tek katlı kabul edilir.
+    """
+    return calculate_area(
+        project_details.get('width', 0),
+        project_details.get('length', 0),
+        project_details.get('height', 0),
+        project_details.get('is_two_story', False),
+        project_details.get('height_2nd_floor', 0)
+    )
+
 # Parasal değeri formatlar.
 def format_currency(value):
     """
@@ -62,49 +74,33 @@ def calculate_rounded_up_cost(value):
     return math.ceil(value * 100) / 100.0
 
 # --- PDF İçin Gerekli Yardımcılar ---
+# Ham logo baytlarını istenen genişliğe ölçekleyip PNG olarak döndürür.
+def resize_logo_to_png(image_bytes, width=180):
+    """Logo görselini en-boy oranını koruyarak yeniden boyutlandırır ve PNG baytları döndürür."""
+    from PIL import Image as PILImage  # PIL yalnızca logo işlenirken yüklenir
+    img = PILImage.open(io.BytesIO(image_bytes))
+    w_percent = (width / float(img.size[0]))
+    h_size = int((float(img.size[1]) * float(w_percent)))
+    img = img.resize((width, h_size), PILImage.LANCZOS)
+    buffered = io.BytesIO()
+    img.save(buffered, format="PNG")
+    return buffered.getvalue()
+
 # Logoyu URL'den çeker ve base64 olarak döndürür.
 def get_company_logo_base64(url, width=180):
-    """Şirket logosunu URL'den çeker ve base64 string olarak döndürür."""
+    """
+    Şirket logosunu URL'den çeker ve base64 string olarak döndürür.
+    Not: Her çağrıda ağ isteği yapar; teklif akışında logo_cache.LOGO_CACHE kullanılmalıdır.
+    """
+    import requests
     try:
         response = requests.get(url, timeout=10)
         response.raise_for_status() # HTTP hatalarını yakala
-        img = PILImage.open(io.BytesIO(response.content))
-        w_percent = (width / float(img.size[0]))
-        h_size = int((float(img.size[1]) * float(w_percent)))
-        img = img.resize((width, h_size), PILImage.LANCZOS)
-        buffered = io.BytesIO()
-        img.save(buffered, format="PNG")
-        return base64.b64encode(buffered.getvalue()).decode()
+        return base64.b64encode(resize_logo_to_png(response.content, width)).decode()
     except Exception as e:
         print(f"Hata: Logo yüklenirken bir sorun oluştu: {e}")
         return None
     
-# PDF için gerekli fontları kaydeder.
-def register_fonts_for_pdf():
-    """
-    PDF için gerekli fontları kaydeder. Yerel 'fonts' klasörünü kontrol eder.
-    Aksi takdirde varsayılan Helvetica'yı kullanır.
-    """
-    global MAIN_FONT
-    try:
-        font_path = "fonts/FreeSans.ttf"
-        font_bold_path = "fonts/FreeSansBold.ttf"
-
-        if os.path.exists(font_path) and os.path.exists(font_bold_path):
-            from reportlab.pdfbase import pdfmetrics
-            from reportlab.pdfbase.ttfonts import TTFont
-            pdfmetrics.registerFont(TTFont("FreeSans", font_path))
-            pdfmetrics.registerFont(TTFont("FreeSans-Bold", font_bold_path))
-            pdfmetrics.registerFontFamily('FreeSans', normal='FreeSans', bold='FreeSans-Bold')
-            MAIN_FONT = "FreeSans"
-            print("INFO: FreeSans fontları başarıyla yüklendi.")
-        else:
-            print("UYARI: FreeSans font dosyaları bulunamadı. Helvetica kullanılacak.")
-            MAIN_FONT = "Helvetica"
-    except Exception as e:
-        print(f"UYARI: Font yükleme hatası: {e}. Helvetica kullanılacak.")
-        MAIN_FONT = "Helvetica"
-
 # PDF indirme linki oluşturur (Sadece Colab/Jupyter ortamları için)
 def create_pdf_download_link(pdf_bytes, filename):
     """PDF içeriği için HTML indirme linki oluşturur."""
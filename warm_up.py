@@ -0,0 +1,84 @@
+# warm_up.py
+# Bu dosya, sunucu başladıktan sonra ağır kaynakları (PDF fontları ve stilleri, pandas vb.)
+# arka planda önceden yükleyen ısınma yardımcısını içerir. calculator_api bu modülleri
+# içe aktarma sırasında yüklemez; böylece süreç hızlı açılır ve sağlık kontrolüne hemen
+# yanıt verir. Isınma ilk istekte (veya sunucu kancasından) bir kez başlatılır ve ilk
+# tekliflerin soğuk başlangıç gecikmesini trafiği bloklamadan ortadan kaldırır.
+
+import time
+import threading
+
+WARM_UP_PENDING = "pending"
+WARM_UP_RUNNING = "running"
+WARM_UP_DONE = "done"
+WARM_UP_FAILED = "failed"
+
+
+class WarmUp:
+    """
+    Adlandırılmış ısınma adımlarını sırayla, tek bir arka plan iş parçacığında çalıştırır.
+    Bir adımın hatası diğerlerini durdurmaz; hata yalnızca kaydedilir (kaynak ilk kullanımda
+    yine yüklenir). start_async() birden çok kez çağrılsa da adımlar bir kez çalışır.
+    """
+
+    def __init__(self, steps, enabled=True):
+        self.steps = list(steps)
+        self.enabled = enabled
+        self.state = WARM_UP_PENDING
+        self.started_at = None
+        self.finished_at = None
+        self.step_seconds = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start_async(self):
+        """Isınmayı arka planda başlatır; zaten başlatılmışsa veya kapalıysa hiçbir şey yapmaz."""
+        if not self.enabled or self._thread is not None:
+            return self._thread
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name="app-warmup", daemon=True)
+                self._thread.start()
+        return self._thread
+
+    def run(self):
+        """Adımları mevcut iş parçacığında çalıştırır (sunucu kancaları ve ölçümler için)."""
+        self.state = WARM_UP_RUNNING
+        self.started_at = time.time()
+        for name, step in self.steps:
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                self.errors[name] = str(e)
+                print(f"UYARI: Başlangıç ısınması adımı başarısız ({name}): {e}")
+            self.step_seconds[name] = time.perf_counter() - start
+        self.finished_at = time.time()
+        self.state = WARM_UP_FAILED if self.errors else WARM_UP_DONE
+        print(f"INFO: Başlangıç ısınması tamamlandı ({self.duration():.2f} sn): "
+              + ", ".join(f"{name}={seconds:.2f}s" for name, seconds in self.step_seconds.items()))
+
+    def wait(self, timeout=None):
+        """Isınma bitene kadar bekler; bittiyse True döndürür."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.is_ready()
+
+    def is_ready(self):
+        """Isınma bittiyse (başarısız adımlar olsa da) veya kapalıysa True."""
+        return not self.enabled or self.state in (WARM_UP_DONE, WARM_UP_FAILED)
+
+    def duration(self):
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def describe(self):
+        """/health yanıtı için JSON'a uygun durum özeti."""
+        return {
+            "state": self.state if self.enabled else "disabled",
+            "seconds": None if self.duration() is None else round(self.duration(), 3),
+            "steps": {name: round(seconds, 3) for name, seconds in self.step_seconds.items()},
+            "errors": dict(self.errors),
+        }
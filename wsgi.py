@@ -0,0 +1,12 @@
+# wsgi.py
+# Bu dosya, üretim sunucuları için WSGI giriş noktasını içerir. Geliştirme sunucusu
+# (python calculator_api.py) tek süreçlidir; üretimde gunicorn ile çalıştırılır:
+#
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Sunucu ayarları (çalışan/iş parçacığı sayısı, zaman aşımları, preload) gunicorn.conf.py'dedir.
+
+from calculator_api import app
+
+# Bazı WSGI sunucuları varsayılan olarak 'application' adını arar.
+application = app